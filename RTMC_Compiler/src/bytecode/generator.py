@@ -3,13 +3,109 @@ Bytecode Generator for RT-Micro-C Language
 Converts AST to bytecode instructions.
 """
 
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Callable, NamedTuple
 from RTMC_Compiler.src.parser.ast_nodes import *
 from RTMC_Compiler.src.bytecode.instructions import *
 from RTMC_Compiler.src.semantic.struct_layout import StructLayoutTable
+from collections import defaultdict
 from dataclasses import dataclass
 from enum import Enum, auto
 
+# Primitive type sizes in bytes
+_PRIMITIVE_SIZES: Dict[str, int] = {'char': 1, 'int': 4, 'float': 4, 'bool': 1, 'void': 0}
+
+# Primitive type names; anything else in a type string names a struct or union
+_PRIMITIVE_TYPE_NAMES = frozenset(_PRIMITIVE_SIZES)
+
+class TypeInfo(NamedTuple):
+    """Parsed variable type, built once per declaration instead of re-parsing type strings"""
+    name: str                        # Display name, e.g. 'Point', 'Point*', 'int[4]'
+    base: str                        # Innermost named type, e.g. 'Point' for 'Point*[4]'
+    is_pointer: bool
+    is_array: bool
+    element: Optional['TypeInfo']    # Pointed-to / element type for pointers and arrays
+    is_struct: bool                  # Named type is a struct or union
+
+class FieldAccessor(NamedTuple):
+    """Precomputed access for one struct field; bit_width > 0 marks a bit-field"""
+    offset: int                      # Byte offset of the field (or of the bit-field's storage unit)
+    bit_offset: int = -1
+    bit_width: int = 0
+
+# Accessor used for fields the layout tables do not know about
+_UNKNOWN_FIELD = FieldAccessor(0)
+
+# Type-node tags, bound once so type dispatch is a global load and an identity test
+_PRIMITIVE_TYPE = NodeType.PRIMITIVE_TYPE
+_STRUCT_TYPE = NodeType.STRUCT_TYPE
+_UNION_TYPE = NodeType.UNION_TYPE
+_ARRAY_TYPE = NodeType.ARRAY_TYPE
+_POINTER_TYPE = NodeType.POINTER_TYPE
+
+# Literal types that can be negated when folding a global initializer
+_NUMERIC_LITERAL_TYPES = ('int', 'float')
+
+def _count_ast_nodes(root: ASTNode) -> int:
+    """Count the nodes reachable from root (used as an instruction capacity hint)"""
+    count = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(child_nodes(node))
+    return count
+
+# Built-in call emitters: function name -> builder taking the argument count.
+# Arguments are already on the stack, so the VM pops them; a builder may return
+# None when nothing should be emitted.
+_BUILTIN_EMITTERS: Dict[str, Callable[[int], Optional[Instruction]]] = {
+    # RTOS functions
+    # RTOS_CREATE_TASK(func_ptr, name, stack_size, priority, core)
+    'RTOS_CREATE_TASK': lambda argc: InstructionBuilder.rtos_create_task(0, 0, 0, 0, 0) if argc >= 5 else None,
+    'RTOS_DELETE_TASK': lambda argc: InstructionBuilder.rtos_delete_task(0),
+    'delay_ms': lambda argc: InstructionBuilder.rtos_delay_ms(0),
+    'RTOS_SEMAPHORE_CREATE': lambda argc: InstructionBuilder.rtos_semaphore_create(),
+    'RTOS_SEMAPHORE_TAKE': lambda argc: InstructionBuilder.rtos_semaphore_take(0, 0),
+    'RTOS_SEMAPHORE_GIVE': lambda argc: InstructionBuilder.rtos_semaphore_give(0),
+    'RTOS_YIELD': lambda argc: InstructionBuilder.rtos_yield(),
+    'RTOS_SUSPEND_TASK': lambda argc: InstructionBuilder.rtos_suspend_task(0),
+    'RTOS_RESUME_TASK': lambda argc: InstructionBuilder.rtos_resume_task(0),
+    
+    # Hardware GPIO functions
+    'HW_GPIO_INIT': lambda argc: InstructionBuilder.hw_gpio_init(0, 0),
+    'HW_GPIO_SET': lambda argc: InstructionBuilder.hw_gpio_set(0, 0),
+    'HW_GPIO_GET': lambda argc: InstructionBuilder.hw_gpio_get(0),
+    
+    # Hardware Timer functions
+    'HW_TIMER_INIT': lambda argc: InstructionBuilder.hw_timer_init(0, 0, 0),
+    'HW_TIMER_START': lambda argc: InstructionBuilder.hw_timer_start(0),
+    'HW_TIMER_STOP': lambda argc: InstructionBuilder.hw_timer_stop(0),
+    'HW_TIMER_SET_PWM_DUTY': lambda argc: InstructionBuilder.hw_timer_set_pwm_duty(0, 0),
+    
+    # Hardware ADC functions
+    'HW_ADC_INIT': lambda argc: InstructionBuilder.hw_adc_init(0),
+    'HW_ADC_READ': lambda argc: InstructionBuilder.hw_adc_read(0),
+    
+    # Hardware Communication functions
+    'HW_UART_WRITE': lambda argc: InstructionBuilder.hw_uart_write(0, 0),
+    'HW_UART_READ': lambda argc: InstructionBuilder.hw_uart_read(0, 0, 0),
+    'HW_SPI_TRANSFER': lambda argc: InstructionBuilder.hw_spi_transfer(0, 0, 0),
+    'HW_I2C_WRITE': lambda argc: InstructionBuilder.hw_i2c_write(0, 0),
+    'HW_I2C_READ': lambda argc: InstructionBuilder.hw_i2c_read(0, 0),
+    
+    # Debug functions (string IDs are taken from the stack by the VM)
+    'print': lambda argc: InstructionBuilder.dbg_print(0),
+    'DBG_BREAKPOINT': lambda argc: InstructionBuilder.dbg_breakpoint(),
+    # printf: the first argument is the format string, the rest are formatted
+    'printf': lambda argc: InstructionBuilder.dbg_printf(0, max(argc - 1, 0)),
+    
+    # StartTask(stack_size, core, priority, task_id, function_pointer)
+    'StartTask': lambda argc: InstructionBuilder.rtos_create_task(0, 0, 0, 0, 0) if argc >= 5 else None,
+}
+
+# Names routed to generate_builtin_call instead of a regular CALL
+_BUILTIN_NAMES = frozenset(_BUILTIN_EMITTERS)
+
 class CompileMode(Enum):
     """Compilation modes"""
     DEBUG = auto()
@@ -34,7 +130,22 @@ class BytecodeProgram:
 class BytecodeGenerator(ASTVisitor):
     """Generates bytecode from AST"""
     
+    __slots__ = (
+        'instructions', 'constants', 'strings', 'functions', 'symbol_table',
+        'struct_layouts', 'mode', 'debug_info',
+        'current_address', 'global_variable_counter', 'local_variable_counter',
+        'labels', 'label_counter',
+        'current_function', 'local_variables', '_visible_variables', 'parameter_count', 'function_frame_size',
+        'break_labels', 'continue_labels',
+        'struct_layout_table', '_slt_get_var_type', 'variable_types', 'local_variable_types', '_parsed_type_cache',
+        'current_line', 'current_column',
+        '_const_index', '_const_run_index', '_int_const_cache', '_field_to_structs', '_field_accessors', '_struct_size_cache', '_elem_size_cache',
+        '_struct_name_cache', '_base_var_cache', '_nested_accessor_cache', '_member_templates',
+        '_type_size_cache', '_type_name_cache', '_member_emitters',
+    )
+    
     def __init__(self, mode: CompileMode = CompileMode.DEBUG):
+        super().__init__()
         self.instructions: List[Instruction] = []
         self.constants: List[Any] = []
         self.strings: List[str] = []
@@ -48,13 +159,15 @@ class BytecodeGenerator(ASTVisitor):
         self.current_address = 0
         self.global_variable_counter = 0  # Separate counter for global variables
         self.local_variable_counter = 0   # Counter for local variables in current function
-        self.temp_counter = 0  # Counter for temporary variables
         self.labels: Dict[str, int] = {}
         self.label_counter = 0
         
         # Function context
         self.current_function = None
         self.local_variables: Dict[str, int] = {}
+        # Every name visible in the current scope: the symbol table itself at
+        # top level, globals overlaid with locals inside a function
+        self._visible_variables: Dict[str, int] = self.symbol_table
         self.parameter_count = 0
         self.function_frame_size = 0  # Track current function's frame size
         
@@ -64,18 +177,59 @@ class BytecodeGenerator(ASTVisitor):
         
         # NEW: Struct layout management
         self.struct_layout_table = StructLayoutTable()
+        # Bound once; the layout table's variable-type lookup is hit for every unresolved name
+        self._slt_get_var_type: Optional[Callable[[str], Optional[str]]] = getattr(
+            self.struct_layout_table, 'get_variable_type', None)
         
         # NEW: Variable type tracking for dynamic type resolution
-        self.variable_types: Dict[str, str] = {}  # variable_name -> type_name
-        self.local_variable_types: Dict[str, str] = {}  # local variables in current function
+        self.variable_types: Dict[str, TypeInfo] = {}  # variable_name -> parsed type
+        self.local_variable_types: Dict[str, TypeInfo] = {}  # local variables in current function
+        self._parsed_type_cache: Dict[str, TypeInfo] = {}  # type string -> parsed type
         
         # NEW: Current line tracking for debug info
         self.current_line = 0
         self.current_column = 0
+        
+        # Constant pool index keyed by (type, value)
+        self._const_index: Dict[Tuple[type, Any], int] = {}
+        self._const_run_index: Dict[Tuple[Tuple[type, Any], ...], int] = {}
+        self._int_const_cache: Dict[int, int] = {}
+        
+        # Inverted index: field name -> structs declaring a field with that name
+        self._field_to_structs: Dict[str, List[str]] = defaultdict(list)
+        
+        # Per-struct field accessors, filled as layouts are stored
+        self._field_accessors: Dict[str, Dict[str, FieldAccessor]] = {}
+        self._struct_size_cache: Dict[str, int] = {}
+        self._elem_size_cache: Dict[str, int] = {}  # element type name -> indexing stride
+        
+        # Per-function memos for member expressions, keyed by id() of the MemberExprNode
+        self._struct_name_cache: Dict[int, str] = {}
+        self._base_var_cache: Dict[int, str] = {}
+        self._nested_accessor_cache: Dict[int, FieldAccessor] = {}
+        # (base address, accessor) -> (load opcode, store opcode, operands) for direct member access
+        self._member_templates: Dict[Tuple[int, FieldAccessor], Tuple[Opcode, Opcode, Tuple[int, ...]]] = {}
+        
+        # Per-function memos for composite type nodes, keyed by id() of the TypeNode
+        self._type_size_cache: Dict[int, int] = {}
+        self._type_name_cache: Dict[int, str] = {}
+        
+        # Non-computed member loads, dispatched on type(node.object)
+        self._member_emitters: Dict[type, Callable] = {
+            IdentifierExprNode: self._emit_member_from_ident,
+            MemberExprNode: self._emit_member_from_member,
+            ArrayAccessNode: self._emit_member_from_array,
+            DereferenceNode: self._emit_member_from_deref,
+        }
     
     def generate(self, ast: ProgramNode) -> BytecodeProgram:
         """Generate bytecode from AST"""
-        ast.accept(self)
+        # Roughly two instructions per AST node; emit() grows the buffer past the hint
+        self.hint_capacity(2 * _count_ast_nodes(ast))
+        self._visit(ast)
+        
+        # Drop the unused tail of the pre-sized buffer
+        del self.instructions[self.current_address:]
         
         return BytecodeProgram(
             constants=self.constants,
@@ -90,6 +244,14 @@ class BytecodeGenerator(ASTVisitor):
     
     def emit(self, instruction: Instruction):
         """Emit an instruction with proper line tracking"""
+        self._write(instruction)
+    
+    def emit_op(self, opcode: Opcode, *operands):
+        """Emit an instruction built straight from its opcode and operands"""
+        self._write(Instruction(opcode, list(operands)))
+    
+    def _write(self, instruction: Instruction):
+        """Stamp the source position on an instruction and store it at the write cursor"""
         if self.mode == CompileMode.DEBUG:
             instruction.line = self.current_line
             instruction.column = self.current_column
@@ -99,9 +261,18 @@ class BytecodeGenerator(ASTVisitor):
             instruction.line = 0
             instruction.column = 0
         
-        self.instructions.append(instruction)
+        # current_address doubles as the write cursor into the pre-sized buffer
+        if self.current_address < len(self.instructions):
+            self.instructions[self.current_address] = instruction
+        else:
+            self.instructions.append(instruction)
         self.current_address += 1
     
+    def hint_capacity(self, count: int):
+        """Pre-size the instruction buffer so emit() writes by index instead of growing the list"""
+        if count > len(self.instructions):
+            self.instructions.extend([None] * (count - len(self.instructions)))
+    
     def set_current_position(self, line: int, column: int = 0):
         """Set current source position for debug info"""
         self.current_line = line
@@ -109,11 +280,49 @@ class BytecodeGenerator(ASTVisitor):
     
     def add_constant(self, value: Any) -> int:
         """Add constant to constant pool"""
-        if value in self.constants:
-            return self.constants.index(value)
-        
-        self.constants.append(value)
-        return len(self.constants) - 1
+        # Keyed by type as well so 1, 1.0 and True get separate pool entries
+        key = (type(value), value)
+        const_idx = self._const_index.get(key)
+        if const_idx is None:
+            const_idx = len(self.constants)
+            self.constants.append(value)
+            self._const_index[key] = const_idx
+        return const_idx
+    
+    def _add_int_const(self, value: int) -> int:
+        """add_constant for ints the generator itself produces (offsets, indices, sizes, flags)"""
+        # Plain int key: skips building the (type, value) key on repeat hits
+        const_idx = self._int_const_cache.get(value)
+        if const_idx is None:
+            const_idx = self.add_constant(value)
+            self._int_const_cache[value] = const_idx
+        return const_idx
+    
+    def add_constant_run(self, values: List[Any]) -> int:
+        """Add values as one contiguous run in the constant pool, returning its first index"""
+        run_key = tuple((type(value), value) for value in values)
+        first_idx = self._const_run_index.get(run_key)
+        if first_idx is None:
+            first_idx = len(self.constants)
+            self.constants.extend(values)
+            self._const_run_index[run_key] = first_idx
+            # Single-value lookups can reuse the run's entries
+            for offset, key in enumerate(run_key):
+                self._const_index.setdefault(key, first_idx + offset)
+        return first_idx
+    
+    def _emit_load_deref(self, offset: int):
+        """Load the value at the address on top of the stack plus a constant offset"""
+        if offset:
+            self.emit(InstructionBuilder.load_deref_offset(offset))
+        else:
+            self.emit(InstructionBuilder.load_deref())
+    
+    def _emit_add_offset(self, offset: int):
+        """Add a constant byte offset to the address on top of the stack"""
+        if offset:
+            self.emit(InstructionBuilder.load_const(self._add_int_const(offset)))
+            self.emit(InstructionBuilder.add())
     
     def add_string(self, string: str) -> int:
         """Add string to string pool"""
@@ -131,6 +340,7 @@ class BytecodeGenerator(ASTVisitor):
             base_local_address = 20000
             address = base_local_address + self.local_variable_counter
             self.local_variables[name] = address
+            self._visible_variables[name] = address
             self.local_variable_counter += 1
             self.function_frame_size = max(self.function_frame_size, self.local_variable_counter)
             return address
@@ -143,12 +353,11 @@ class BytecodeGenerator(ASTVisitor):
     
     def get_variable_address(self, name: str) -> int:
         """Get variable address"""
-        if self.current_function and name in self.local_variables:
-            return self.local_variables[name]
-        elif name in self.symbol_table:
-            return self.symbol_table[name]
-        else:
+        # Locals already shadow globals in the merged scope, so one probe suffices
+        address = self._visible_variables.get(name)
+        if address is None:
             raise CodeGenError(f"Undefined variable: {name}")
+        return address
     
     def create_label(self) -> str:
         """Create a unique label"""
@@ -162,7 +371,8 @@ class BytecodeGenerator(ASTVisitor):
     
     def patch_jumps(self):
         """Patch jump addresses after all instructions are generated"""
-        for instruction in self.instructions:
+        for index in range(self.current_address):
+            instruction = self.instructions[index]
             if instruction.opcode in [Opcode.JUMP, Opcode.JUMPIF_TRUE, Opcode.JUMPIF_FALSE]:
                 # Check if operand is a label
                 if len(instruction.operands) > 0 and isinstance(instruction.operands[0], str):
@@ -184,13 +394,13 @@ class BytecodeGenerator(ASTVisitor):
             self.current_line = decl.line
             # Only generate code for non-function declarations during initialization
             if not isinstance(decl, FunctionDeclNode):
-                decl.accept(self)
+                self._visit(decl)
         
         # Generate function code
         for decl in node.declarations:
             self.current_line = decl.line
             if isinstance(decl, FunctionDeclNode):
-                decl.accept(self)
+                self._visit(decl)
         
         # Patch jump addresses
         self.patch_jumps()
@@ -206,6 +416,7 @@ class BytecodeGenerator(ASTVisitor):
         # Enter function context
         old_function = self.current_function
         old_locals = self.local_variables.copy()
+        old_visible = self._visible_variables
         old_local_types = self.local_variable_types.copy()
         old_param_count = self.parameter_count
         old_local_counter = self.local_variable_counter
@@ -213,10 +424,17 @@ class BytecodeGenerator(ASTVisitor):
         
         self.current_function = node.name
         self.local_variables = {}
+        # All globals are allocated before any function body is generated
+        self._visible_variables = dict(self.symbol_table)
         self.local_variable_types = {}
         self.parameter_count = len(node.parameters)
         self.local_variable_counter = 0  # Reset local variable counter for this function
         self.function_frame_size = 0
+        self._struct_name_cache.clear()
+        self._base_var_cache.clear()
+        self._nested_accessor_cache.clear()
+        self._type_size_cache.clear()
+        self._type_name_cache.clear()
         
         # Parameters use the special parameter address space (10000 + param_index)
         # This is handled by the VM's parameter passing mechanism
@@ -224,16 +442,16 @@ class BytecodeGenerator(ASTVisitor):
         for i, param in enumerate(node.parameters):
             param_address = param_base_address + i
             self.local_variables[param.name] = param_address
+            self._visible_variables[param.name] = param_address
             # Store parameter type information
-            param_type = self._get_type_name(param.type)
-            self.local_variable_types[param.name] = param_type
+            self.local_variable_types[param.name] = self._get_type_info(param.type)
         
         # Generate function prologue - allocate frame space
         if self.mode == CompileMode.DEBUG:
             self.emit(InstructionBuilder.comment(f"Function {node.name} prologue"))
         
         # Generate function body
-        node.body.accept(self)
+        self._visit(node.body)
         
         # Generate function epilogue - cleanup and ensure return
         if self.mode == CompileMode.DEBUG:
@@ -251,11 +469,54 @@ class BytecodeGenerator(ASTVisitor):
         # Restore context
         self.current_function = old_function
         self.local_variables = old_locals
+        self._visible_variables = old_visible
         self.local_variable_types = old_local_types
         self.parameter_count = old_param_count
         self.local_variable_counter = old_local_counter
         self.function_frame_size = old_frame_size
     
+    def _store_struct_layout(self, name: str, layout):
+        """Record a struct's field offsets and index its fields by name"""
+        previous = self.struct_layouts.get(name)
+        if previous is not None:
+            for field_name in previous:
+                self._field_to_structs[field_name].remove(name)
+        
+        fields = {field_name: field.offset for field_name, field in layout.fields.items()}
+        self.struct_layouts[name] = fields
+        for field_name in fields:
+            self._field_to_structs[field_name].append(name)
+        
+        # A (re)declared struct can change the size of any struct embedding it
+        self._struct_size_cache.clear()
+        self._elem_size_cache.clear()
+        self._type_size_cache.clear()
+        
+        # Flat per-struct accessors used by the member load/store emitters
+        accessors = {
+            field_name: (FieldAccessor(field.offset, field.bit_offset, field.bit_width)
+                         if field.bit_width > 0 else FieldAccessor(field.offset))
+            for field_name, field in layout.fields.items()
+        }
+        
+        # Flatten embedded structs/unions into dotted paths ('inner.x') with additive
+        # offsets; inner accessors are already flattened, so one level covers any depth
+        decl = self.struct_layout_table.struct_decls.get(name)
+        for field in (decl.fields if decl is not None else ()):
+            if isinstance(field.type, StructTypeNode):
+                inner_accessors = self._field_accessors.get(field.type.struct_name)
+            elif isinstance(field.type, UnionTypeNode):
+                inner_accessors = self._field_accessors.get(field.type.union_name)
+            else:
+                continue
+            outer = accessors.get(field.name)
+            if not inner_accessors or outer is None:
+                continue
+            for path, inner in inner_accessors.items():
+                accessors[f"{field.name}.{path}"] = inner._replace(offset=outer.offset + inner.offset)
+        
+        self._field_accessors[name] = accessors
+    
     def visit_struct_decl(self, node: StructDeclNode):
         """Generate code for struct declaration"""
         # Set current position for debug info
@@ -284,7 +545,7 @@ class BytecodeGenerator(ASTVisitor):
         layout = self.struct_layout_table.calculate_layout(node.name)
         
         # Store layout information for backwards compatibility
-        self.struct_layouts[node.name] = {name: field.offset for name, field in layout.fields.items()}
+        self._store_struct_layout(node.name, layout)
         
         # In debug mode, emit struct metadata
         if self.mode == CompileMode.DEBUG:
@@ -307,7 +568,7 @@ class BytecodeGenerator(ASTVisitor):
         layout = self.struct_layout_table.calculate_layout(node.name)
         
         # Store layout information for backwards compatibility
-        self.struct_layouts[node.name] = {name: field.offset for name, field in layout.fields.items()}
+        self._store_struct_layout(node.name, layout)
         
         # In debug mode, emit union metadata
         if self.mode == CompileMode.DEBUG:
@@ -324,34 +585,40 @@ class BytecodeGenerator(ASTVisitor):
         address = self.allocate_variable(node.name)
         
         # Extract and store the variable's type information
-        type_name = self._get_type_name(node.type)
+        type_info = self._get_type_info(node.type)
         if self.current_function:
             # Local variable
-            self.local_variable_types[node.name] = type_name
+            self.local_variable_types[node.name] = type_info
         else:
             # Global variable
-            self.variable_types[node.name] = type_name
+            self.variable_types[node.name] = type_info
         
         # Initialize if needed
         if node.initializer:
             if self.current_function:
                 # Local variable - generate code and store immediately
-                node.initializer.accept(self)
+                self._visit(node.initializer)
                 self.emit(InstructionBuilder.store_var(address))
             else:
                 # Global variable - get initial value and emit declaration
                 # For now, we'll handle simple constant initializers
-                if hasattr(node.initializer, 'value'):
+                initializer = node.initializer
+                if isinstance(initializer, LiteralExprNode):
                     # Simple literal value
-                    const_idx = self.add_constant(node.initializer.value)
+                    const_idx = self.add_constant(initializer.value)
+                elif (isinstance(initializer, UnaryExprNode) and initializer.operator == '-'
+                      and isinstance(initializer.operand, LiteralExprNode)
+                      and initializer.operand.literal_type in _NUMERIC_LITERAL_TYPES):
+                    # Negative literal, e.g. int x = -5;
+                    const_idx = self.add_constant(-initializer.operand.value)
                 else:
                     # Complex expression - evaluate at runtime for now
                     # TODO: Implement constant expression evaluation
-                    const_idx = self.add_constant(0)
+                    const_idx = self._add_int_const(0)
                 self.emit(InstructionBuilder.global_var_declare(address, const_idx, node.is_const))
         else:
             # Initialize to zero
-            const_idx = self.add_constant(0)
+            const_idx = self._add_int_const(0)
             if self.current_function:
                 # Local variable
                 self.emit(InstructionBuilder.load_const(const_idx))
@@ -376,31 +643,75 @@ class BytecodeGenerator(ASTVisitor):
         """Type nodes don't generate code"""
         pass
     
+    def _get_type_info(self, type_node: TypeNode) -> TypeInfo:
+        """Build the parsed type record for a declared type"""
+        if isinstance(type_node, ArrayTypeNode):
+            return self._array_type_info(self._get_type_info(type_node.element_type), type_node.size)
+        elif isinstance(type_node, PointerTypeNode):
+            type_info = self._get_type_info(type_node.base_type)
+            for _ in range(type_node.pointer_level):
+                type_info = TypeInfo(type_info.name + '*', type_info.base, True, False, type_info, False)
+            return type_info
+        else:
+            name = self._get_type_name(type_node)
+            return TypeInfo(name, name, False, False, None,
+                            isinstance(type_node, (StructTypeNode, UnionTypeNode)))
+    
+    def _array_type_info(self, element: TypeInfo, size: Any) -> TypeInfo:
+        """Build the type record for an array of element"""
+        return TypeInfo(f"{element.name}[{size}]", element.base, False, True, element, False)
+    
+    def _parse_type_info(self, type_str: str) -> TypeInfo:
+        """Parse a type string such as 'struct Point*' or 'int[4]' into a type record"""
+        type_info = self._parsed_type_cache.get(type_str)
+        if type_info is not None:
+            return type_info
+        
+        if type_str.endswith('*'):
+            element = self._parse_type_info(type_str[:-1])
+            type_info = TypeInfo(element.name + '*', element.base, True, False, element, False)
+        elif type_str.endswith(']'):
+            element_str, _, size = type_str[:-1].rpartition('[')
+            type_info = self._array_type_info(self._parse_type_info(element_str), size)
+        else:
+            is_struct = type_str.startswith(('struct ', 'union '))
+            name = type_str.split(' ', 1)[1] if is_struct else type_str
+            is_struct = is_struct or name not in _PRIMITIVE_TYPE_NAMES
+            type_info = TypeInfo(name, name, False, False, None, is_struct)
+        
+        self._parsed_type_cache[type_str] = type_info
+        return type_info
+    
     def _get_type_name(self, type_node: TypeNode) -> str:
         """Extract type name from a type node"""
-        if isinstance(type_node, PrimitiveTypeNode):
+        kind = getattr(type_node, 'node_type', None)
+        if kind is _PRIMITIVE_TYPE:
             return type_node.type_name
-        elif isinstance(type_node, StructTypeNode):
+        elif kind is _STRUCT_TYPE:
             return type_node.struct_name
-        elif isinstance(type_node, UnionTypeNode):
+        elif kind is _UNION_TYPE:
             return type_node.union_name
-        elif isinstance(type_node, ArrayTypeNode):
-            element_name = self._get_type_name(type_node.element_type)
-            return f"{element_name}[{type_node.size}]"
-        elif isinstance(type_node, PointerTypeNode):
-            base_name = self._get_type_name(type_node.base_type)
-            return base_name + '*' * type_node.pointer_level
+        elif kind is _ARRAY_TYPE or kind is _POINTER_TYPE:
+            # Composite names are built by string formatting; build each one once
+            name = self._type_name_cache.get(id(type_node))
+            if name is None:
+                if kind is _ARRAY_TYPE:
+                    name = f"{self._get_type_name(type_node.element_type)}[{type_node.size}]"
+                else:
+                    name = self._get_type_name(type_node.base_type) + '*' * type_node.pointer_level
+                self._type_name_cache[id(type_node)] = name
+            return name
         else:
             return "unknown"
     
     def visit_block_stmt(self, node: BlockStmtNode):
         """Generate code for block statement"""
         for stmt in node.statements:
-            stmt.accept(self)
+            self._visit(stmt)
     
     def visit_expression_stmt(self, node: ExpressionStmtNode):
         """Generate code for expression statement"""
-        node.expression.accept(self)
+        self._visit(node.expression)
         # Pop the result if it's not used
         # (In a real implementation, we'd track whether the result is used)
     
@@ -410,21 +721,21 @@ class BytecodeGenerator(ASTVisitor):
         end_label = self.create_label()
         
         # Generate condition
-        node.condition.accept(self)
+        self._visit(node.condition)
         
         # Jump to else if condition is false
-        self.emit(Instruction(Opcode.JUMPIF_FALSE, [else_label]))
+        self.emit_op(Opcode.JUMPIF_FALSE, else_label)
         
         # Generate then branch
-        node.then_stmt.accept(self)
+        self._visit(node.then_stmt)
         
         # Jump to end
-        self.emit(Instruction(Opcode.JUMP, [end_label]))
+        self.emit_op(Opcode.JUMP, end_label)
         
         # Else branch
         self.mark_label(else_label)
         if node.else_stmt:
-            node.else_stmt.accept(self)
+            self._visit(node.else_stmt)
         
         # End
         self.mark_label(end_label)
@@ -445,16 +756,16 @@ class BytecodeGenerator(ASTVisitor):
         self.mark_label(start_label)
         
         # Generate condition
-        node.condition.accept(self)
+        self._visit(node.condition)
         
         # Jump to end if condition is false
-        self.emit(Instruction(Opcode.JUMPIF_FALSE, [end_label]))
+        self.emit_op(Opcode.JUMPIF_FALSE, end_label)
         
         # Generate body
-        node.body.accept(self)
+        self._visit(node.body)
         
         # Jump back to start
-        self.emit(Instruction(Opcode.JUMP, [start_label]))
+        self.emit_op(Opcode.JUMP, start_label)
         
         # Loop end
         self.mark_label(end_label)
@@ -478,28 +789,28 @@ class BytecodeGenerator(ASTVisitor):
         
         # Initialize
         if node.init:
-            node.init.accept(self)
+            self._visit(node.init)
         
         # Loop start
         self.mark_label(start_label)
         
         # Check condition
         if node.condition:
-            node.condition.accept(self)
-            self.emit(Instruction(Opcode.JUMPIF_FALSE, [end_label]))
+            self._visit(node.condition)
+            self.emit_op(Opcode.JUMPIF_FALSE, end_label)
         
         # Generate body
-        node.body.accept(self)
+        self._visit(node.body)
         
         # Continue point (for continue statements)
         self.mark_label(continue_label)
         
         # Update
         if node.update:
-            node.update.accept(self)
+            self._visit(node.update)
         
         # Jump back to start
-        self.emit(Instruction(Opcode.JUMP, [start_label]))
+        self.emit_op(Opcode.JUMP, start_label)
         
         # Loop end
         self.mark_label(end_label)
@@ -511,27 +822,27 @@ class BytecodeGenerator(ASTVisitor):
     def visit_return_stmt(self, node: ReturnStmtNode):
         """Generate code for return statement"""
         if node.value:
-            node.value.accept(self)
+            self._visit(node.value)
         
         self.emit(InstructionBuilder.ret())
     
     def visit_break_stmt(self, node: BreakStmtNode):
         """Generate code for break statement"""
         if self.break_labels:
-            self.emit(Instruction(Opcode.JUMP, [self.break_labels[-1]]))
+            self.emit_op(Opcode.JUMP, self.break_labels[-1])
     
     def visit_continue_stmt(self, node: ContinueStmtNode):
         """Generate code for continue statement"""
         if self.continue_labels:
-            self.emit(Instruction(Opcode.JUMP, [self.continue_labels[-1]]))
+            self.emit_op(Opcode.JUMP, self.continue_labels[-1])
     
     def visit_binary_expr(self, node: BinaryExprNode):
         """Generate code for binary expression"""
         # Generate left operand
-        node.left.accept(self)
+        self._visit(node.left)
         
         # Generate right operand
-        node.right.accept(self)
+        self._visit(node.right)
         
         # Generate operation
         op_map = {
@@ -551,20 +862,22 @@ class BytecodeGenerator(ASTVisitor):
             '&': Opcode.AND,
             '|': Opcode.OR,
             '^': Opcode.XOR,
+            '<<': Opcode.SHL,
+            '>>': Opcode.SHR,
         }
         
         if node.operator in op_map:
-            self.emit(Instruction(op_map[node.operator], []))
+            self.emit_op(op_map[node.operator])
         else:
             raise CodeGenError(f"Unknown binary operator: {node.operator}")
     
     def visit_unary_expr(self, node: UnaryExprNode):
         """Generate code for unary expression"""
-        node.operand.accept(self)
+        self._visit(node.operand)
         
         if node.operator == '-':
             # Negate by multiplying by -1
-            const_idx = self.add_constant(-1)
+            const_idx = self._add_int_const(-1)
             self.emit(InstructionBuilder.load_const(const_idx))
             self.emit(InstructionBuilder.mul())
         elif node.operator == '!':
@@ -584,13 +897,7 @@ class BytecodeGenerator(ASTVisitor):
         
         if isinstance(node.operand, IdentifierExprNode):
             # Check local variables first, then global
-            addr = None
-            if node.operand.name in self.local_variables:
-                addr = self.local_variables[node.operand.name]
-            elif node.operand.name in self.symbol_table:
-                addr = self.symbol_table[node.operand.name]
-            else:
-                raise CodeGenError(f"Undefined variable: {node.operand.name}")
+            addr = self.get_variable_address(node.operand.name)
             
             # Load current value first (this will be the result)
             self.emit(InstructionBuilder.load_var(addr))
@@ -599,14 +906,14 @@ class BytecodeGenerator(ASTVisitor):
             if node.operator == '++':
                 # Load current value again, add 1, store back
                 self.emit(InstructionBuilder.load_var(addr))
-                const_idx = self.add_constant(1)
+                const_idx = self._add_int_const(1)
                 self.emit(InstructionBuilder.load_const(const_idx))
                 self.emit(InstructionBuilder.add())
                 self.emit(InstructionBuilder.store_var(addr))
             elif node.operator == '--':
                 # Load current value again, subtract 1, store back
                 self.emit(InstructionBuilder.load_var(addr))
-                const_idx = self.add_constant(1)
+                const_idx = self._add_int_const(1)
                 self.emit(InstructionBuilder.load_const(const_idx))
                 self.emit(InstructionBuilder.sub())
                 self.emit(InstructionBuilder.store_var(addr))
@@ -621,7 +928,7 @@ class BytecodeGenerator(ASTVisitor):
         # Accept the value if target is not an array access before accept target
         if not isinstance(node.target, ArrayAccessNode):
             # Generate value
-            node.value.accept(self)
+            self._visit(node.value)
         
         # Handle different assignment operators
         if node.operator != '=':
@@ -647,7 +954,7 @@ class BytecodeGenerator(ASTVisitor):
             }
             
             if op in op_map:
-                self.emit(Instruction(op_map[op], []))
+                self.emit_op(op_map[op])
             else:
                 raise CodeGenError(f"Unknown assignment operator: {node.operator}")
         
@@ -673,83 +980,40 @@ class BytecodeGenerator(ASTVisitor):
             return base_address + field_offset
         elif isinstance(node.object, MemberExprNode):
             # For nested access like rect.top_left.x, get the base variable
-            base_var = self._get_base_variable_name(node.object)
+            base_var = self._get_base_variable(node.object)
             base_address = self.get_variable_address(base_var)
             # Calculate nested offset
-            nested_offset = self._calculate_nested_offset(node)
+            nested_offset = self._get_nested_accessor(node).offset
             return base_address + nested_offset
         else:
             # Fallback: treat as simple variable access
             return 0  # Use address 0 as fallback
     
     def _get_struct_name_for_member(self, member_expr: MemberExprNode) -> str:
+        """Get the struct name for a member expression, memoized per node"""
+        key = id(member_expr)
+        struct_name = self._struct_name_cache.get(key)
+        if struct_name is None:
+            struct_name = self._resolve_struct_name_for_member(member_expr)
+            self._struct_name_cache[key] = struct_name
+        return struct_name
+    
+    def _resolve_struct_name_for_member(self, member_expr: MemberExprNode) -> str:
         """Get the struct name for a member expression using dynamic type resolution"""
         if isinstance(member_expr.object, IdentifierExprNode):
             # Simple case: variable.field or ptr->field
             var_name = member_expr.object.name
             
-            # First, try to get the variable's type from the struct layout table
-            # This should contain type information from semantic analysis
-            try:
-                var_type = self.struct_layout_table.get_variable_type(var_name)
-                if var_type:
-                    # Handle pointer types for arrow operator
-                    if member_expr.computed and isinstance(member_expr.property, str) and var_type.endswith('*'):
-                        # This is pointer member access (ptr->field)
-                        pointed_type = var_type[:-1]  # Remove '*'
-                        if pointed_type.startswith('struct '):
-                            return pointed_type[7:]  # Remove 'struct '
-                        else:
-                            return pointed_type
-                    elif not member_expr.computed:
-                        # This is regular member access (obj.field)
-                        if var_type.startswith('struct '):
-                            return var_type[7:]  # Remove 'struct '
-                        else:
-                            return var_type
-                    else:
-                        return var_type
-            except (AttributeError, KeyError):
-                pass
-            
-            # If struct layout table doesn't have variable type info, 
-            # we need to look up the variable declaration to find its type
+            # Look up the variable's declared type
             variable_type = self._resolve_variable_type(var_name)
             if variable_type:
-                # Handle pointer types for arrow operator
-                if member_expr.computed and isinstance(member_expr.property, str) and variable_type.endswith('*'):
+                if member_expr.computed and isinstance(member_expr.property, str) and variable_type.is_pointer:
                     # This is pointer member access (ptr->field)
-                    pointed_type = variable_type[:-1]  # Remove '*'
-                    if pointed_type.startswith('struct '):
-                        return pointed_type[7:]  # Remove 'struct '
-                    else:
-                        return pointed_type
-                elif not member_expr.computed:
-                    # This is regular member access (obj.field)
-                    if variable_type.startswith('struct '):
-                        return variable_type[7:]  # Remove 'struct '
-                    else:
-                        return variable_type
-                else:
-                    return variable_type
+                    return variable_type.element.name
+                return variable_type.name
             
             # As a fallback, try to find the struct type by checking which struct contains this field
-            field_name = member_expr.property
-            candidate_structs = []
-            for struct_name, fields in self.struct_layouts.items():
-                if field_name in fields:
-                    candidate_structs.append(struct_name)
-            
-            # If only one struct contains this field, use it
-            if len(candidate_structs) == 1:
-                return candidate_structs[0]
-            elif len(candidate_structs) > 1:
-                # Multiple structs contain this field - this is ambiguous
-                # In a real compiler, this would be caught by semantic analysis
-                raise CodeGenError(f"Ambiguous field access: field '{field_name}' exists in multiple structs: {candidate_structs}")
-            
-            # Field not found in any struct
-            raise CodeGenError(f"Field '{field_name}' not found in any registered struct")
+            return self._find_struct_with_field(member_expr.property)
             
         elif isinstance(member_expr.object, MemberExprNode):
             # Nested case: obj.field1.field2
@@ -758,15 +1022,6 @@ class BytecodeGenerator(ASTVisitor):
             parent_field = member_expr.object.property
             
             # Look up the type of parent_field in parent_struct
-            try:
-                field_type = self.struct_layout_table.get_field_type(parent_struct, parent_field)
-                if field_type:
-                    return field_type
-            except (AttributeError, KeyError):
-                pass
-            
-            # If struct layout table doesn't have field type info, 
-            # try to resolve it from the struct declaration
             field_type = self._resolve_field_type(parent_struct, parent_field)
             if field_type:
                 return field_type
@@ -780,35 +1035,12 @@ class BytecodeGenerator(ASTVisitor):
                 array_name = member_expr.object.array.name
                 array_type = self._resolve_variable_type(array_name)
                 
-                if array_type:
-                    element_type = None
-                    if '[' in array_type:
-                        # Array type: extract element type
-                        element_type = array_type.split('[')[0]
-                    elif array_type.endswith('*'):
-                        # Pointer type: remove one level of indirection
-                        element_type = array_type[:-1]
-                    
-                    if element_type:
-                        # Remove 'struct ' prefix if present
-                        if element_type.startswith('struct '):
-                            return element_type[7:]
-                        else:
-                            return element_type
+                if array_type and array_type.element is not None:
+                    # Array or pointer type: the element type holds the field
+                    return array_type.element.name
                 
                 # Fallback: try to find the struct type by checking which struct contains this field
-                field_name = member_expr.property
-                candidate_structs = []
-                for struct_name, fields in self.struct_layouts.items():
-                    if field_name in fields:
-                        candidate_structs.append(struct_name)
-                
-                if len(candidate_structs) == 1:
-                    return candidate_structs[0]
-                elif len(candidate_structs) > 1:
-                    raise CodeGenError(f"Ambiguous field access: field '{field_name}' exists in multiple structs: {candidate_structs}")
-                else:
-                    raise CodeGenError(f"Field '{field_name}' not found in any registered struct")
+                return self._find_struct_with_field(member_expr.property)
             else:
                 raise CodeGenError("Complex array access in member expression not yet supported")
         elif isinstance(member_expr.object, DereferenceNode):
@@ -819,31 +1051,18 @@ class BytecodeGenerator(ASTVisitor):
                 
                 # Get the pointer's type and extract the base struct type
                 pointer_type = self._resolve_variable_type(pointer_name)
-                if pointer_type and pointer_type.endswith('*'):
-                    # Remove the pointer indicator and extract struct name
-                    base_type = pointer_type[:-1]  # Remove '*'
-                    if base_type.startswith('struct '):
-                        return base_type[7:]  # Remove 'struct ' prefix
-                    elif base_type.startswith('TestStruct'):  # Handle direct struct names
-                        return base_type
+                if pointer_type and pointer_type.is_pointer:
+                    # The pointed-to type names the struct
+                    if pointer_type.element.is_struct:
+                        return pointer_type.element.name
                     else:
                         # For other pointer types, we need to infer the struct
                         # This is a simplified approach - in a full compiler, 
                         # we'd have better type information from semantic analysis
-                        field_name = member_expr.property
-                        candidate_structs = []
-                        for struct_name, fields in self.struct_layouts.items():
-                            if field_name in fields:
-                                candidate_structs.append(struct_name)
-                        
-                        if len(candidate_structs) == 1:
-                            return candidate_structs[0]
-                        elif len(candidate_structs) > 1:
-                            raise CodeGenError(f"Ambiguous field access: field '{field_name}' exists in multiple structs: {candidate_structs}")
-                        else:
-                            raise CodeGenError(f"Field '{field_name}' not found in any registered struct")
+                        return self._find_struct_with_field(member_expr.property)
                 
-                raise CodeGenError(f"Cannot resolve base type for pointer '{pointer_name}' with type '{pointer_type}'")
+                type_name = pointer_type.name if pointer_type else None
+                raise CodeGenError(f"Cannot resolve base type for pointer '{pointer_name}' with type '{type_name}'")
             else:
                 raise CodeGenError("Complex pointer dereference not yet supported")
         else:
@@ -851,7 +1070,22 @@ class BytecodeGenerator(ASTVisitor):
             # This would require full type inference from semantic analysis
             raise CodeGenError("Complex member access on non-identifier objects not yet supported")
     
-    def _resolve_variable_type(self, var_name: str) -> Optional[str]:
+    def _find_struct_with_field(self, field_name: str) -> str:
+        """Find the single registered struct that declares field_name"""
+        candidate_structs = self._field_to_structs.get(field_name, ())
+        
+        # If only one struct contains this field, use it
+        if len(candidate_structs) == 1:
+            return candidate_structs[0]
+        elif len(candidate_structs) > 1:
+            # Multiple structs contain this field - this is ambiguous
+            # In a real compiler, this would be caught by semantic analysis
+            raise CodeGenError(f"Ambiguous field access: field '{field_name}' exists in multiple structs: {candidate_structs}")
+        
+        # Field not found in any struct
+        raise CodeGenError(f"Field '{field_name}' not found in any registered struct")
+    
+    def _resolve_variable_type(self, var_name: str) -> Optional[TypeInfo]:
         """Resolve the type of a variable from declarations"""
         # Check local variables first (if we're in a function)
         if self.current_function and var_name in self.local_variable_types:
@@ -862,13 +1096,10 @@ class BytecodeGenerator(ASTVisitor):
             return self.variable_types[var_name]
         
         # Check if we have type information stored in struct layout table
-        if hasattr(self.struct_layout_table, 'get_variable_type'):
-            try:
-                var_type = self.struct_layout_table.get_variable_type(var_name)
-                if var_type:
-                    return var_type
-            except (AttributeError, KeyError):
-                pass
+        if self._slt_get_var_type is not None:
+            var_type = self._slt_get_var_type(var_name)
+            if var_type:
+                return self._parse_type_info(var_type)
         
         # Variable type not found
         return None
@@ -876,71 +1107,51 @@ class BytecodeGenerator(ASTVisitor):
     def _resolve_field_type(self, struct_name: str, field_name: str) -> Optional[str]:
         """Resolve the type of a field within a struct"""
         # This should ideally be provided by semantic analysis
-        # For now, we'll try to look it up in the struct layout table
-        
-        try:
-            return self.struct_layout_table.get_field_type(struct_name, field_name)
-        except (AttributeError, KeyError):
-            pass
-        
-        # If not available from struct layout, this is a limitation
-        # In a real implementation, this would be resolved during semantic analysis
-        return None
+        # For now, we look it up in the struct layout table (None if unknown)
+        return self.struct_layout_table.get_field_type(struct_name, field_name)
+    
+    def _get_field_accessor(self, struct_name: str, field_name: str) -> FieldAccessor:
+        """Get the precomputed accessor for a struct field"""
+        accessors = self._field_accessors.get(struct_name)
+        if accessors is not None:
+            return accessors.get(field_name, _UNKNOWN_FIELD)
+        
+        # Struct registered on the layout table directly rather than through visit_struct_decl
+        bit_field_info = self.struct_layout_table.get_bit_field_info_or(struct_name, field_name)
+        if bit_field_info:
+            return FieldAccessor(*bit_field_info)
+        
+        # Unknown structs/fields default to offset 0 (e.g. when semantic analysis was skipped)
+        offset = self.struct_layout_table.get_field_offset_or(struct_name, field_name)
+        return _UNKNOWN_FIELD if offset is None else FieldAccessor(offset)
     
     def _get_simple_field_offset(self, struct_name: str, field_name: str) -> int:
-        """Get field offset with support for nested structs"""
-        try:
-            return self.struct_layout_table.get_field_offset(struct_name, field_name)
-        except (ValueError, KeyError):
-            # If semantic analysis was skipped, provide a default offset
-            # This is a simplified fallback - assumes 4-byte fields
-            # TODO: Improve this when semantic analysis is fixed
-            return 0  # Default offset for now
-    
-    def _get_bit_field_info(self, struct_name: str, field_name: str) -> Optional[Tuple[int, int, int]]:
-        """Get bit-field information with support for nested structs"""
-        try:
-            return self.struct_layout_table.get_bit_field_info(struct_name, field_name)
-        except (ValueError, KeyError):
-            # Not a bitfield or struct not found - return None instead of raising
-            return None
+        """Get field offset from the per-struct accessors"""
+        return self._get_field_accessor(struct_name, field_name).offset
     
     def visit_call_expr(self, node: CallExprNode):
         """Generate code for call expression"""
         if isinstance(node.callee, IdentifierExprNode):
             func_name = node.callee.name
             
-            rtos_functions = [
-                'RTOS_CREATE_TASK', 'RTOS_DELETE_TASK', 'delay_ms',
-                'RTOS_SEMAPHORE_CREATE', 'RTOS_SEMAPHORE_TAKE',
-                'RTOS_SEMAPHORE_GIVE', 'RTOS_YIELD', 'RTOS_SUSPEND_TASK',
-                'RTOS_RESUME_TASK', 'HW_GPIO_INIT', 'HW_GPIO_SET',
-                'HW_GPIO_GET', 'HW_TIMER_INIT', 'HW_TIMER_START',
-                'HW_TIMER_STOP', 'HW_TIMER_SET_PWM_DUTY', 'HW_ADC_INIT']
-            hw_functions = [
-                'HW_ADC_READ', 'HW_UART_WRITE', 'HW_UART_READ',
-                'HW_SPI_TRANSFER', 'HW_I2C_WRITE', 'HW_I2C_READ']
-            debug_functions = ['print', 'printf', 'DBG_BREAKPOINT']
-
             # Check if it's StartTask function
             if func_name == 'StartTask':
                 self.generate_start_task_call(node.arguments)
             # Check if it's a built-in function
-            elif func_name in rtos_functions or func_name in hw_functions or func_name in debug_functions:
+            elif func_name in _BUILTIN_NAMES:
                 self.generate_builtin_call(func_name, node.arguments)
             else:
-                # Regular function call
-                # Generate arguments
-                for arg in node.arguments:
-                    arg.accept(self)
-                
-                # Call function
-                if func_name in self.functions:
-                    func_id = self.functions[func_name]
-                    param_count = len(node.arguments)
-                    self.emit(InstructionBuilder.call(func_id, param_count))
-                else:
+                # Regular function call; resolve it before emitting any arguments
+                func_id = self.functions.get(func_name)
+                if func_id is None:
                     raise CodeGenError(f"Unknown function: {func_name}")
+                
+                arguments = node.arguments
+                param_count = len(arguments)
+                for arg in arguments:
+                    self._visit(arg)
+                
+                self.emit(InstructionBuilder.call(func_id, param_count))
         else:
             raise CodeGenError("Complex function calls not supported yet")
     
@@ -952,102 +1163,25 @@ class BytecodeGenerator(ASTVisitor):
         
         # Generate arguments in reverse order (stack_size, core, priority, task_id, function_pointer)
         for arg in arguments:
-            arg.accept(self)
+            self._visit(arg)
         
         # Emit RTOS_CREATE_TASK instruction
-        self.emit(Instruction(Opcode.RTOS_CREATE_TASK, []))
+        self.emit_op(Opcode.RTOS_CREATE_TASK)
     
     def generate_builtin_call(self, func_name: str, arguments: List[ExpressionNode]):
         """Generate code for built-in function calls"""
-        # Generate arguments
-        for arg in arguments:
-            arg.accept(self)
-        
-        # RTOS functions
-        if func_name == 'RTOS_CREATE_TASK':
-            # RTOS_CREATE_TASK(func_ptr, name, stack_size, priority, core)
-            if len(arguments) >= 5:
-                self.emit(InstructionBuilder.rtos_create_task(0, 0, 0, 0, 0))  # VM will pop args
-        elif func_name == 'RTOS_DELETE_TASK':
-            self.emit(InstructionBuilder.rtos_delete_task(0))
-        elif func_name == 'delay_ms':
-            self.emit(InstructionBuilder.rtos_delay_ms(0))
-        elif func_name == 'RTOS_SEMAPHORE_CREATE':
-            self.emit(InstructionBuilder.rtos_semaphore_create())
-        elif func_name == 'RTOS_SEMAPHORE_TAKE':
-            self.emit(InstructionBuilder.rtos_semaphore_take(0, 0))
-        elif func_name == 'RTOS_SEMAPHORE_GIVE':
-            self.emit(InstructionBuilder.rtos_semaphore_give(0))
-        elif func_name == 'RTOS_YIELD':
-            self.emit(InstructionBuilder.rtos_yield())
-        elif func_name == 'RTOS_SUSPEND_TASK':
-            self.emit(InstructionBuilder.rtos_suspend_task(0))
-        elif func_name == 'RTOS_RESUME_TASK':
-            self.emit(InstructionBuilder.rtos_resume_task(0))
-        
-        # Hardware GPIO functions
-        elif func_name == 'HW_GPIO_INIT':
-            self.emit(InstructionBuilder.hw_gpio_init(0, 0))
-        elif func_name == 'HW_GPIO_SET':
-            self.emit(InstructionBuilder.hw_gpio_set(0, 0))
-        elif func_name == 'HW_GPIO_GET':
-            self.emit(InstructionBuilder.hw_gpio_get(0))
-        
-        # Hardware Timer functions
-        elif func_name == 'HW_TIMER_INIT':
-            self.emit(InstructionBuilder.hw_timer_init(0, 0, 0))
-        elif func_name == 'HW_TIMER_START':
-            self.emit(InstructionBuilder.hw_timer_start(0))
-        elif func_name == 'HW_TIMER_STOP':
-            self.emit(InstructionBuilder.hw_timer_stop(0))
-        elif func_name == 'HW_TIMER_SET_PWM_DUTY':
-            self.emit(InstructionBuilder.hw_timer_set_pwm_duty(0, 0))
-        
-        # Hardware ADC functions
-        elif func_name == 'HW_ADC_INIT':
-            self.emit(InstructionBuilder.hw_adc_init(0))
-        elif func_name == 'HW_ADC_READ':
-            self.emit(InstructionBuilder.hw_adc_read(0))
-        
-        # Hardware Communication functions
-        elif func_name == 'HW_UART_WRITE':
-            self.emit(InstructionBuilder.hw_uart_write(0, 0))
-        elif func_name == 'HW_UART_READ':
-            self.emit(InstructionBuilder.hw_uart_read(0, 0, 0))
-        elif func_name == 'HW_SPI_TRANSFER':
-            self.emit(InstructionBuilder.hw_spi_transfer(0, 0, 0))
-        elif func_name == 'HW_I2C_WRITE':
-            self.emit(InstructionBuilder.hw_i2c_write(0, 0))
-        elif func_name == 'HW_I2C_READ':
-            self.emit(InstructionBuilder.hw_i2c_read(0, 0))
-        
-        # Debug functions
-        elif func_name == 'print':
-            # For print, the string argument should be processed specially
-            if len(arguments) >= 1:
-                # Generate the string argument and get its ID
-                self.emit(InstructionBuilder.dbg_print(0))  # String ID will be handled by VM from stack
-            else:
-                self.emit(InstructionBuilder.dbg_print(0))
-        elif func_name == 'DBG_BREAKPOINT':
-            self.emit(InstructionBuilder.dbg_breakpoint())
-        elif func_name == 'printf':
-            # For printf, process format string and arguments
-            if len(arguments) >= 1:
-                # The format string is the first argument
-                # Arguments for formatting are the rest
-                arg_count = len(arguments) - 1
-                self.emit(InstructionBuilder.dbg_printf(0, arg_count))  # Format string ID from stack
-            else:
-                self.emit(InstructionBuilder.dbg_printf(0, 0))
+        # Validate the name before generating any argument code
+        emitter = _BUILTIN_EMITTERS.get(func_name)
+        if emitter is None:
+            raise CodeGenError(f"Unknown built-in function: {func_name}")
         
-        elif func_name == 'StartTask':
-            # StartTask(stack_size, core, priority, task_id, function_pointer)
-            if len(arguments) >= 5:
-                self.emit(InstructionBuilder.rtos_create_task(0, 0, 0, 0, 0))  # VM will pop args
+        argc = len(arguments)
+        for arg in arguments:
+            self._visit(arg)
         
-        else:
-            raise CodeGenError(f"Unknown built-in function: {func_name}")
+        instruction = emitter(argc)
+        if instruction is not None:
+            self.emit(instruction)
     
     def visit_member_expr(self, node: MemberExprNode):
         """Generate code for member expression"""
@@ -1057,39 +1191,15 @@ class BytecodeGenerator(ASTVisitor):
                 # Pointer member access: ptr->field
                 # Get struct name and field offset
                 struct_name = self._get_struct_name_for_member(node)
-                field_offset = self._get_simple_field_offset(struct_name, node.property)
-                
-                # Generate code to load the pointer value
-                node.object.accept(self)
-                
-                # Check if this is a bit-field
-                bit_field_info = self._get_bit_field_info(struct_name, node.property)
-                if bit_field_info:
-                    byte_offset, bit_offset, bit_width = bit_field_info
-                    # For pointer access, we need to load the address, add the byte offset,
-                    # then load the bit field
-                    if byte_offset > 0:
-                        offset_const = self.add_constant(byte_offset)
-                        self.emit(InstructionBuilder.load_const(offset_const))
-                        self.emit(InstructionBuilder.add())
-                    self.emit(InstructionBuilder.load_struct_member_bit(0, 0, bit_offset, bit_width))
-                else:
-                    # Regular field access through pointer
-                    # Add field offset to the pointer address
-                    if field_offset > 0:
-                        offset_const = self.add_constant(field_offset)
-                        self.emit(InstructionBuilder.load_const(offset_const))
-                        self.emit(InstructionBuilder.add())
-                    # Load the value at the computed address
-                    self.emit(InstructionBuilder.load_deref())
-                
+                accessor = self._get_field_accessor(struct_name, node.property)
+                self._emit_pointer_field_access(node.object, accessor)
                 return
             else:
                 # Array access: obj[index]
-                node.object.accept(self)
+                self._visit(node.object)
                 
                 if isinstance(node.property, ExpressionNode):
-                    node.property.accept(self)
+                    self._visit(node.property)
                 else:
                     const_idx = self.add_constant(node.property)
                     self.emit(InstructionBuilder.load_const(const_idx))
@@ -1101,87 +1211,70 @@ class BytecodeGenerator(ASTVisitor):
             # Struct field access: obj.field
             # Get struct name and field offset
             struct_name = self._get_struct_name_for_member(node)
-            field_offset = self._get_simple_field_offset(struct_name, node.property)
+            accessor = self._get_field_accessor(struct_name, node.property)
             
-            # Generate code to load the struct base address
-            if isinstance(node.object, IdentifierExprNode):
-                # Simple case: variable.field
-                base_address = self.get_variable_address(node.object.name)
-                
-                # Check if this is a bit-field
-                bit_field_info = self._get_bit_field_info(struct_name, node.property)
-                if bit_field_info:
-                    byte_offset, bit_offset, bit_width = bit_field_info
-                    self.emit(InstructionBuilder.load_struct_member_bit(base_address, byte_offset, bit_offset, bit_width))
-                    
-                    return
-                else:
-                    # Regular field access
-                    self.emit(InstructionBuilder.load_struct_member(base_address, field_offset))
-
-                    return
-            elif isinstance(node.object, MemberExprNode):
-                # Nested access: variable.field1.field2
-                base_var = self._get_base_variable_name(node.object)
-                base_address = self.get_variable_address(base_var)
-                nested_offset = self._calculate_nested_offset(node)
-                # field_offset = base_address + nested_offset
-                self.emit(InstructionBuilder.load_struct_member(base_address, nested_offset))
-
-                return
-            elif isinstance(node.object, ArrayAccessNode):
-                # Array access result: array_ptr[index].member
-                # First, generate the array access to get the element address
-                node.object.accept(self)
-                
-                # The array access leaves the element address on the stack
-                # Now we need to add the field offset to access the member
-                if field_offset > 0:
-                    offset_const = self.add_constant(field_offset)
-                    self.emit(InstructionBuilder.load_const(offset_const))
-                    self.emit(InstructionBuilder.add())
-                
-                # Load the value at the computed address
-                self.emit(InstructionBuilder.load_deref())
-                
-                return
-            elif isinstance(node.object, DereferenceNode):
-                # Pointer access: ptr->member
-                # Generate code to load the pointer value
-                node.object.operand.accept(self)
-                
-                # Check if this is a bit-field
-                bit_field_info = self._get_bit_field_info(struct_name, node.property)
-                if bit_field_info:
-                    byte_offset, bit_offset, bit_width = bit_field_info
-                    # For pointer access, we need to load the address, add the byte offset,
-                    # then load the bit field
-                    if byte_offset > 0:
-                        offset_const = self.add_constant(byte_offset)
-                        self.emit(InstructionBuilder.load_const(offset_const))
-                        self.emit(InstructionBuilder.add())
-                    self.emit(InstructionBuilder.load_struct_member_bit(0, 0, bit_offset, bit_width))
-                else:
-                    # Regular field access through pointer
-                    # Add field offset to the pointer address
-                    if field_offset > 0:
-                        offset_const = self.add_constant(field_offset)
-                        self.emit(InstructionBuilder.load_const(offset_const))
-                        self.emit(InstructionBuilder.add())
-                    # Load the value at the computed address
-                    self.emit(InstructionBuilder.load_deref())
-                
-                return
+            # Dispatch on the concrete object node type
+            handler = self._member_emitters.get(type(node.object), self._emit_member_complex)
+            handler(node, struct_name, accessor)
+    
+    def _member_template(self, base_address: int, accessor: FieldAccessor) -> Tuple[Opcode, Opcode, Tuple[int, ...]]:
+        """Get the load/store opcodes and operands for base_address.field, built once per pair"""
+        key = (base_address, accessor)
+        template = self._member_templates.get(key)
+        if template is None:
+            if accessor.bit_width:
+                template = (Opcode.LOAD_STRUCT_MEMBER_BIT, Opcode.STORE_STRUCT_MEMBER_BIT,
+                            (base_address, accessor.offset, accessor.bit_offset, accessor.bit_width))
             else:
-                # Complex object access
-                node.object.accept(self)
-                # Add field offset to the address on stack
-                offset_const = self.add_constant(field_offset)
-                self.emit(InstructionBuilder.load_const(offset_const))
-                self.emit(InstructionBuilder.add())
-                field_offset = 0  # Offset already added
-            
-            self.emit(InstructionBuilder.load_struct_member(0, field_offset))
+                template = (Opcode.LOAD_STRUCT_MEMBER, Opcode.STORE_STRUCT_MEMBER,
+                            (base_address, accessor.offset))
+            self._member_templates[key] = template
+        return template
+    
+    def _emit_member_from_ident(self, node: MemberExprNode, struct_name: str, accessor: FieldAccessor):
+        """Load variable.field"""
+        load_opcode, _, operands = self._member_template(self.get_variable_address(node.object.name), accessor)
+        self.emit_op(load_opcode, *operands)
+    
+    def _emit_member_from_member(self, node: MemberExprNode, struct_name: str, accessor: FieldAccessor):
+        """Load variable.field1.field2"""
+        base_var = self._get_base_variable(node.object)
+        base_address = self.get_variable_address(base_var)
+        load_opcode, _, operands = self._member_template(base_address, self._get_nested_accessor(node))
+        self.emit_op(load_opcode, *operands)
+    
+    def _emit_member_from_array(self, node: MemberExprNode, struct_name: str, accessor: FieldAccessor):
+        """Load array_ptr[index].member"""
+        # The array access leaves the element address on the stack;
+        # load the member at element address + field offset
+        self._visit(node.object)
+        self._emit_load_deref(accessor.offset)
+    
+    def _emit_member_from_deref(self, node: MemberExprNode, struct_name: str, accessor: FieldAccessor):
+        """Load (*ptr).member"""
+        self._emit_pointer_field_access(node.object.operand, accessor)
+    
+    def _emit_pointer_field_access(self, ptr_expr: ExpressionNode, accessor: FieldAccessor):
+        """Load a field through a pointer expression (ptr->field and (*ptr).field)"""
+        # Generate code to load the pointer value
+        self._visit(ptr_expr)
+        
+        if accessor.bit_width:
+            # For pointer access, we need to load the address, add the byte offset,
+            # then load the bit field
+            self._emit_add_offset(accessor.offset)
+            self.emit(InstructionBuilder.load_struct_member_bit(
+                0, 0, accessor.bit_offset, accessor.bit_width))
+        else:
+            # Load the value at pointer + field offset
+            self._emit_load_deref(accessor.offset)
+    
+    def _emit_member_complex(self, node: MemberExprNode, struct_name: str, accessor: FieldAccessor):
+        """Load a member of any other object expression"""
+        self._visit(node.object)
+        # Add field offset to the address on stack
+        self._emit_add_offset(accessor.offset)
+        self.emit(InstructionBuilder.load_struct_member(0, 0))
     
     def visit_identifier_expr(self, node: IdentifierExprNode):
         """Generate code for identifier expression"""
@@ -1192,7 +1285,7 @@ class BytecodeGenerator(ASTVisitor):
             # Might be a function name
             if node.name in self.functions:
                 func_id = self.functions[node.name]
-                const_idx = self.add_constant(func_id)
+                const_idx = self._add_int_const(func_id)
                 self.emit(InstructionBuilder.load_const(const_idx))
             else:
                 raise CodeGenError(f"Unknown identifier: {node.name}")
@@ -1202,7 +1295,7 @@ class BytecodeGenerator(ASTVisitor):
         if node.literal_type == 'string':
             string_idx = self.add_string(node.value)
             # For strings, we need to load the string index, not as a constant
-            const_idx = self.add_constant(string_idx)
+            const_idx = self._add_int_const(string_idx)
             self.emit(InstructionBuilder.load_const(const_idx))
         else:
             const_idx = self.add_constant(node.value)
@@ -1211,25 +1304,27 @@ class BytecodeGenerator(ASTVisitor):
     def get_type_size(self, type_node: TypeNode) -> int:
         """Get size of type in bytes with proper struct size calculation"""
         if isinstance(type_node, PrimitiveTypeNode):
-            if type_node.type_name == 'char':
-                return 1
-            elif type_node.type_name in ['int', 'float']:
-                return 4
-            elif type_node.type_name == 'bool':
-                return 1
-            elif type_node.type_name == 'void':
-                return 0
-            else:
+            size = _PRIMITIVE_SIZES.get(type_node.type_name)
+            if size is None:
                 raise CodeGenError("Unknown primitive type: " + type_node.type_name)
+            return size
         elif isinstance(type_node, StructTypeNode):
-            # Use struct layout table for accurate size calculation
-            try:
-                return self.struct_layout_table.get_struct_size(type_node.struct_name)
-            except (ValueError, KeyError):
-                raise CodeGenError("Struct not found in layout table")
+            # Struct sizes are fixed once laid out; cache them by name
+            size = self._struct_size_cache.get(type_node.struct_name)
+            if size is None:
+                # Use struct layout table for accurate size calculation
+                if type_node.struct_name not in self.struct_layout_table.struct_decls:
+                    raise CodeGenError("Struct not found in layout table")
+                size = self.struct_layout_table.get_struct_size(type_node.struct_name)
+                self._struct_size_cache[type_node.struct_name] = size
+            return size
         elif isinstance(type_node, ArrayTypeNode):
-            element_size = self.get_type_size(type_node.element_type)
-            return element_size * (type_node.size or 1)
+            size = self._type_size_cache.get(id(type_node))
+            if size is None:
+                element_size = self.get_type_size(type_node.element_type)
+                size = element_size * (type_node.size or 1)
+                self._type_size_cache[id(type_node)] = size
+            return size
         elif isinstance(type_node, PointerTypeNode):
             return 8  # 64-bit pointer size
         elif isinstance(type_node, str):
@@ -1242,12 +1337,12 @@ class BytecodeGenerator(ASTVisitor):
                 size = int(size_str) if size_str.isdigit() else 1
                 
                 # Create element type node
-                element_type = PrimitiveTypeNode(element_type_str)
+                element_type = primitive_type(element_type_str)
                 element_size = self.get_type_size(element_type)
                 return element_size 
             else:
                 # Simple string type - treat as char array
-                return self.get_type_size(PrimitiveTypeNode('char')) * (len(type_node) + 1)
+                return self.get_type_size(primitive_type('char')) * (len(type_node) + 1)
         else:
             raise CodeGenError("Pointer types not supported in this context")
 
@@ -1256,12 +1351,8 @@ class BytecodeGenerator(ASTVisitor):
         array_address = self.get_variable_address(node.array.name)
         index_value = self.add_constant(node.index.value)
         
-        if self.current_function:
-            node_type = self.local_variable_types[node.array.name]
-        else:
-            node_type = self.variable_types[node.array.name]
-
-        element_size = self.get_type_size(node_type)
+        # Same element stride as visit_array_access, read from the declared TypeInfo
+        element_size = self._element_size_for(node.array.name, struct_stride=False)
         self.store_array_element(array_address, index_value, value, element_size)
 
     def store_array_element(self, array_address: int, index_value: int, value: ExpressionNode, element_size: int):
@@ -1274,7 +1365,7 @@ class BytecodeGenerator(ASTVisitor):
         self.emit(InstructionBuilder.load_const(index_value))
 
         # Generate element value
-        value.accept(self)
+        self._visit(value)
 
         # Store element: array[i] = value
         # Stack now contains [base_addr, index, value]
@@ -1286,23 +1377,23 @@ class BytecodeGenerator(ASTVisitor):
             # Simple case: variable.field
             base_address = self.get_variable_address(node.object.name)
             
-            # Check if this is a bit-field
             struct_name = self._get_struct_name_for_member(node)
-            bit_field_info = self._get_bit_field_info(struct_name, node.property)
-            if bit_field_info:
-                byte_offset, bit_offset, bit_width = bit_field_info
+            accessor = self._get_field_accessor(struct_name, node.property)
+            if accessor.bit_width:
                 self.emit(InstructionBuilder.load_struct_member_bit(
-                    base_address, byte_offset, bit_offset, bit_width))
+                    base_address, accessor.offset, accessor.bit_offset, accessor.bit_width))
             else:
-                # Regular field access
-                field_offset = self._get_simple_field_offset(struct_name, node.property)
-                self.emit(InstructionBuilder.load_struct_member(base_address, field_offset))
+                self.emit(InstructionBuilder.load_struct_member(base_address, accessor.offset))
         elif isinstance(node.object, MemberExprNode):
             # Nested case: variable.field1.field2
-            base_var = self._get_base_variable_name(node.object)
+            base_var = self._get_base_variable(node.object)
             base_address = self.get_variable_address(base_var)
-            field_offset = self._calculate_nested_offset(node)
-            self.emit(InstructionBuilder.load_struct_member(base_address, field_offset))
+            nested = self._get_nested_accessor(node)
+            if nested.bit_width:
+                self.emit(InstructionBuilder.load_struct_member_bit(
+                    base_address, nested.offset, nested.bit_offset, nested.bit_width))
+            else:
+                self.emit(InstructionBuilder.load_struct_member(base_address, nested.offset))
         else:
             raise CodeGenError("Complex member access not supported yet")
     
@@ -1310,244 +1401,113 @@ class BytecodeGenerator(ASTVisitor):
         """Generate code to store to a member expression"""
         if node.computed and isinstance(node.property, str):
             # Arrow operator: ptr->field = value
-            # At this point, the value to store is already on the stack
-            
-            # Get the pointer variable and compute the address
-            if isinstance(node.object, IdentifierExprNode):
-                pointer_name = node.object.name
-                pointer_address = self.get_variable_address(pointer_name)
-                
-                # Allocate a temporary variable to store the value
-                temp_var_addr = self.allocate_variable(f"__temp_store_{self.temp_counter}")
-                self.temp_counter += 1
-                
-                # Store the value temporarily
-                self.emit(InstructionBuilder.store_var(temp_var_addr))
-                
-                # Load the pointer value (which is an address)
-                self.emit(InstructionBuilder.load_var(pointer_address))
-                
-                # Add the field offset
-                struct_name = self._get_struct_name_for_member(node)
-                field_offset = self._get_simple_field_offset(struct_name, node.property)
-                if field_offset > 0:
-                    offset_const = self.add_constant(field_offset)
-                    self.emit(InstructionBuilder.load_const(offset_const))
-                    self.emit(InstructionBuilder.add())
-                
-                # Load the value back
-                self.emit(InstructionBuilder.load_var(temp_var_addr))
-                
-                # Store through the pointer
-                self.emit(InstructionBuilder.store_deref())
-            else:
-                raise CodeGenError("Complex pointer member assignment not supported yet")
+            self._emit_pointer_field_store(node.object, node)
         elif isinstance(node.object, IdentifierExprNode):
             # Simple case: variable.field = value
             base_address = self.get_variable_address(node.object.name)
             
-            # Check if this is a bit-field
             struct_name = self._get_struct_name_for_member(node)
-            bit_field_info = self._get_bit_field_info(struct_name, node.property)
-            if bit_field_info:
-                byte_offset, bit_offset, bit_width = bit_field_info
-                self.emit(InstructionBuilder.store_struct_member_bit(
-                    base_address, byte_offset, bit_offset, bit_width))
-            else:
-                # Regular field access
-                field_offset = self._get_simple_field_offset(struct_name, node.property)
-                self.emit(InstructionBuilder.store_struct_member(base_address, field_offset))
+            accessor = self._get_field_accessor(struct_name, node.property)
+            _, store_opcode, operands = self._member_template(base_address, accessor)
+            self.emit_op(store_opcode, *operands)
         elif isinstance(node.object, MemberExprNode):
             # Nested case: variable.field1.field2 = value
-            base_var = self._get_base_variable_name(node.object)
+            base_var = self._get_base_variable(node.object)
             base_address = self.get_variable_address(base_var)
-            field_offset = self._calculate_nested_offset(node)
-            self.emit(InstructionBuilder.store_struct_member(base_address, field_offset))
+            _, store_opcode, operands = self._member_template(base_address, self._get_nested_accessor(node))
+            self.emit_op(store_opcode, *operands)
         elif isinstance(node.object, ArrayAccessNode):
             # Array case: array[index].member = value
-            # At this point, the value to store is already on the stack
+            # At this point, the value to store is already on the stack;
+            # the element address is computed above it
             
             if isinstance(node.object.array, IdentifierExprNode):
                 array_name = node.object.array.name
                 array_address = self.get_variable_address(array_name)
                 
-                # Allocate a temporary variable to store the value
-                temp_var_addr = self.allocate_variable(f"__temp_store_{self.temp_counter}")
-                self.temp_counter += 1
-                
-                # Store the value temporarily
-                self.emit(InstructionBuilder.store_var(temp_var_addr))
-                
                 # Load array base address
                 self.emit(InstructionBuilder.load_var(array_address))
                 
                 # Generate index
-                node.object.index.accept(self)
-                
-                # Get element type and size for array access
-                array_type = self.local_variable_types.get(array_name) or self.variable_types.get(array_name)
-                element_size = 4  # Default size
-                
-                if array_type and '[' in array_type:
-                    element_type_name = array_type.split('[')[0]
-                    # If it's a struct type, get the struct size
-                    if element_type_name in self.struct_layouts:
-                        try:
-                            element_size = self.struct_layout_table.get_struct_size(element_type_name)
-                        except (ValueError, KeyError):
-                            element_size = 20  # Default struct size
-                    elif element_type_name == 'char':
-                        element_size = 1
-                    elif element_type_name in ['int', 'float']:
-                        element_size = 4
+                self._visit(node.object.index)
                 
                 # Calculate array element address: base + index * element_size
                 # Multiply index by element size
-                size_const = self.add_constant(element_size)
+                element_size = self._element_size_for(array_name)
+                size_const = self._add_int_const(element_size)
                 self.emit(InstructionBuilder.load_const(size_const))
                 self.emit(InstructionBuilder.mul())
                 
                 # Add to base address to get element address
                 self.emit(InstructionBuilder.add())
                 
-                # Now add the field offset within the struct
+                # Store at element address + field offset, folding the offset into the store
                 struct_name = self._get_struct_name_for_member(node)
                 field_offset = self._get_simple_field_offset(struct_name, node.property)
-                if field_offset > 0:
-                    offset_const = self.add_constant(field_offset)
-                    self.emit(InstructionBuilder.load_const(offset_const))
-                    self.emit(InstructionBuilder.add())
-                
-                # Load the value back onto the stack
-                self.emit(InstructionBuilder.load_var(temp_var_addr))
-                
-                # Store through the computed address
-                self.emit(InstructionBuilder.store_deref())
+                self.emit(InstructionBuilder.store_deref_offset(field_offset))
             else:
                 raise CodeGenError("Complex array access in member assignment not yet supported")
         elif isinstance(node.object, DereferenceNode):
-            # Pointer case: ptr->member = value
-            # At this point, the value to store is already on the stack
-            
-            # Strategy: Use a temporary variable to handle stack ordering
-            # 1. Store the value in a temp variable
-            # 2. Compute the target address
-            # 3. Load the value back
-            # 4. Call STORE_DEREF
-            
-            # Get the pointer variable and compute the address
-            if isinstance(node.object.operand, IdentifierExprNode):
-                pointer_name = node.object.operand.name
-                pointer_address = self.get_variable_address(pointer_name)
-                
-                # Allocate a temporary variable to store the value
-                temp_var_addr = self.allocate_variable(f"__temp_store_{self.temp_counter}")
-                self.temp_counter += 1
-                
-                # Store the value temporarily
-                self.emit(InstructionBuilder.store_var(temp_var_addr))
-                
-                # Load the pointer value (which is an address)
-                self.emit(InstructionBuilder.load_var(pointer_address))
-                
-                # Get the field offset
-                struct_name = self._get_struct_name_for_member(node)
-                field_offset = self._get_simple_field_offset(struct_name, node.property)
-                
-                # Add field offset to the pointer address
-                if field_offset > 0:
-                    offset_const = self.add_constant(field_offset)
-                    self.emit(InstructionBuilder.load_const(offset_const))
-                    self.emit(InstructionBuilder.add())
-                
-                # Load the value back onto the stack
-                self.emit(InstructionBuilder.load_var(temp_var_addr))
-                
-                # Now stack is: [target_address, value] which is correct for STORE_DEREF
-                self.emit(InstructionBuilder.store_deref())
-            else:
-                raise CodeGenError("Complex pointer dereference in assignment not yet supported")
+            # Pointer case: (*ptr).member = value
+            self._emit_pointer_field_store(node.object.operand, node)
         else:
             raise CodeGenError("Complex member access not supported yet")
     
-    def _get_base_variable(self, node: MemberExprNode) -> str:
-        """Get the base variable name from a nested member expression"""
-        if isinstance(node.object, IdentifierExprNode):
-            return node.object.name
-        elif isinstance(node.object, MemberExprNode):
-            return self._get_base_variable(node.object)
-        else:
-            raise CodeGenError("Cannot determine base variable")
+    def _emit_pointer_field_store(self, ptr_expr: ExpressionNode, node: MemberExprNode):
+        """Store the value on the stack into a field through a pointer expression"""
+        # The value is already on the stack; push the pointer above it and let
+        # STORE_DEREF_OFFSET consume both, so no temporary is needed
+        struct_name = self._get_struct_name_for_member(node)
+        accessor = self._get_field_accessor(struct_name, node.property)
+        self._visit(ptr_expr)
+        self.emit(InstructionBuilder.store_deref_offset(accessor.offset))
     
-    def _get_base_variable_name(self, node: MemberExprNode) -> str:
+    def _get_base_variable(self, node: MemberExprNode) -> str:
         """Get the base variable name from a nested member expression"""
-        if isinstance(node.object, IdentifierExprNode):
-            return node.object.name
-        elif isinstance(node.object, MemberExprNode):
-            return self._get_base_variable_name(node.object)
-        else:
+        base_var = self._base_var_cache.get(id(node))
+        if base_var is not None:
+            return base_var
+        
+        current = node.object
+        while isinstance(current, MemberExprNode):
+            current = current.object
+        if not isinstance(current, IdentifierExprNode):
             raise CodeGenError("Cannot determine base variable")
+        
+        base_var = current.name
+        self._base_var_cache[id(node)] = base_var
+        return base_var
     
-    def _calculate_nested_offset(self, node: MemberExprNode) -> int:
-        """Calculate offset for nested member access"""
-        if isinstance(node.object, IdentifierExprNode):
-            # This is the final level, just return field offset
-            struct_name = self._get_struct_name_for_member(node)
-            return self._get_simple_field_offset(struct_name, node.property)
-        elif isinstance(node.object, MemberExprNode):
-            # Nested access: calculate parent offset + current field offset
-            parent_offset = self._calculate_nested_offset(node.object)
-            struct_name = self._get_struct_name_for_member(node)
-            current_offset = self._get_simple_field_offset(struct_name, node.property)
-            # Simple encoding: multiply parent by struct size and add current
-            return parent_offset * 10 + current_offset
-        else:
-            return 0
-
-    def _get_field_offset(self, field_name: str) -> int:
-        """Get the offset of a field (simplified implementation)"""
-        # In a real implementation, this would look up the struct definition
-        # and calculate the actual field offset based on field sizes and alignment
-        # For now, we'll use a simple hash-based offset
-        field_offsets = {
-            'temperature': 0,
-            'humidity': 1, 
-            'pressure': 2,
-            'control': 3,
-            'enable': 0,
-            'mode': 1,
-            'speed': 2,
-            'reserved': 3
-        }
-        return field_offsets.get(field_name, 0)
-    
-    def _get_nested_field_offset(self, node: MemberExprNode) -> int:
-        """Get the offset for nested field access (simplified)"""
-        # For nested access like sensor.control.enable, we need to calculate
-        # the offset of 'control' in the parent struct plus the offset of 'enable' in control
-        if isinstance(node.object, MemberExprNode):
-            parent_offset = self._get_field_offset(node.object.property)
-            current_offset = self._get_field_offset(node.property)
-            # In a real implementation, we'd need proper struct layout calculation
-            # For now, use a simple additive approach
-            return parent_offset * 10 + current_offset  # Simple encoding
+    def _get_nested_accessor(self, node: MemberExprNode) -> FieldAccessor:
+        """Get the accessor for a nested member chain like var.field1.field2"""
+        accessor = self._nested_accessor_cache.get(id(node))
+        if accessor is not None:
+            return accessor
+        
+        # Collect the field path down to the member applied to the base variable
+        path = [node.property]
+        inner = node
+        while isinstance(inner.object, MemberExprNode):
+            inner = inner.object
+            path.append(inner.property)
+        
+        if isinstance(inner.object, IdentifierExprNode):
+            # Nested paths are flattened per struct, so this is a single lookup
+            struct_name = self._get_struct_name_for_member(inner)
+            accessor = self._get_field_accessor(struct_name, '.'.join(reversed(path)))
         else:
-            return self._get_field_offset(node.property)
+            accessor = _UNKNOWN_FIELD
+        
+        self._nested_accessor_cache[id(node)] = accessor
+        return accessor
 
-    def _get_field_info(self, struct_var_name: str, field_name: str) -> Optional[Dict]:
+    def _get_field_info(self, struct_var_name: str, field_name: str) -> FieldAccessor:
         """Get field information including bit-field details"""
         # Find the struct type of the variable
-        for struct_name, field_info in self.struct_layouts.items():
-            if field_name in field_info:
-                return field_info[field_name]
-        
-        # Fallback for unknown fields
-        return {
-            'byte_offset': 0,
-            'bit_offset': 0,
-            'bit_width': None,
-            'is_bitfield': False
-        }
+        var_type = self._resolve_variable_type(struct_var_name)
+        if var_type is None:
+            return _UNKNOWN_FIELD
+        return self._get_field_accessor(var_type.base, field_name)
 
     def visit_message_decl(self, node: MessageDeclNode):
         """Generate code for message declaration"""
@@ -1557,45 +1517,38 @@ class BytecodeGenerator(ASTVisitor):
         
         # Emit message queue declaration instruction
         type_name = self._get_type_name(node.message_type)
-        self.emit(Instruction(Opcode.MSG_DECLARE, [message_id, type_name]))
+        self.emit_op(Opcode.MSG_DECLARE, message_id, type_name)
 
+    def _get_message_id(self, channel) -> int:
+        """Resolve a message queue name (as produced by the parser) to its ID"""
+        # The parser stores the channel as a plain identifier string
+        channel_name = channel if channel.__class__ is str else channel.name
+        message_id = self.symbol_table.get(channel_name)
+        if message_id is None:
+            raise CodeGenError(f"Undefined message queue: {channel_name}")
+        return message_id
+    
     def visit_message_send(self, node: MessageSendNode):
         """Generate code for message send"""
         # Generate code for the payload expression
-        node.payload.accept(self)
-        
-        # Get the message queue ID
-        channel_name = node.channel.name if hasattr(node.channel, 'name') else str(node.channel)
-        if channel_name not in self.symbol_table:
-            raise CodeGenError(f"Undefined message queue: {channel_name}")
+        self._visit(node.payload)
         
-        message_id = self.symbol_table[channel_name]
+        message_id = self._get_message_id(node.channel)
         
         # Emit message send instruction
-        self.emit(Instruction(Opcode.MSG_SEND, [message_id]))
+        self.emit_op(Opcode.MSG_SEND, message_id)
 
     def visit_message_recv(self, node: MessageRecvNode):
         """Generate code for message receive"""
-        # Get the message queue ID
-        channel_name = node.channel.name if hasattr(node.channel, 'name') else str(node.channel)
-        if channel_name not in self.symbol_table:
-            raise CodeGenError(f"Undefined message queue: {channel_name}")
-        
-        message_id = self.symbol_table[channel_name]
+        message_id = self._get_message_id(node.channel)
         
-        # Handle timeout parameter
+        # A receive without a timeout blocks forever; the second operand tells
+        # the VM whether a timeout value was pushed for it to pop
         if node.timeout is not None:
-            # Generate code to compute timeout value
-            node.timeout.accept(self)
-            # The timeout value is now on the stack
+            self._visit(node.timeout)
+            self.emit_op(Opcode.MSG_RECV, message_id, 1)
         else:
-            # No timeout specified, use blocking receive (we'll handle this differently)
-            # Use a large positive timeout value instead of -1
-            self.emit(Instruction(Opcode.LOAD_CONST, [self.add_constant(999999)]))
-        
-        # Emit message receive instruction with timeout
-        # Stack order: [timeout_value] -> MSG_RECV will pop timeout and use it
-        self.emit(Instruction(Opcode.MSG_RECV, [message_id]))
+            self.emit_op(Opcode.MSG_RECV, message_id, 0)
 
     def visit_include_stmt(self, node: IncludeStmtNode):
         """Import statements are handled by the compiler, no bytecode needed"""
@@ -1621,7 +1574,7 @@ class BytecodeGenerator(ASTVisitor):
         self.emit(InstructionBuilder.store_var(array_address))
         
         # Track the array type
-        array_type = f"{self._get_type_name(node.element_type)}[{array_size}]"
+        array_type = self._array_type_info(self._get_type_info(node.element_type), array_size)
         if self.current_function:
             self.local_variable_types[node.name] = array_type
         else:
@@ -1631,37 +1584,43 @@ class BytecodeGenerator(ASTVisitor):
         if node.initializer:
             # Initialize array elements
             if isinstance(node.initializer, ArrayLiteralNode):
-                for i, element in enumerate(node.initializer.elements):
-                    if i >= array_size:
-                        break  # Don't exceed array bounds
-                    
-                    # Load array base address for initialization
+                elements = node.initializer.elements[:array_size]
+                if elements and all(isinstance(element, LiteralExprNode) and element.literal_type != 'string'
+                                    for element in elements):
+                    # All-constant initializer: one bulk store from a constant run
+                    first_const = self.add_constant_run([element.value for element in elements])
                     self.emit(InstructionBuilder.load_var(array_address))
-                    
-                    # Load index
-                    const_idx = self.add_constant(i)
-                    self.emit(InstructionBuilder.load_const(const_idx))
-                    
-                    # Generate element value
-                    element.accept(self)
-                    
-                    # Store element: array[i] = value
-                    # Stack now contains [base_addr, index, value]
-                    self.emit(InstructionBuilder.store_array_elem(element_size))
+                    self.emit(InstructionBuilder.init_array_const(first_const, len(elements), element_size))
+                    return
+                
+                # Bound once outside the per-element loop
+                visit = self._visit
+                emit = self.emit
+                store_array_elem_i = InstructionBuilder.store_array_elem_i
+                
+                # elements is already clipped to the array bounds
+                for i, element in enumerate(elements):
+                    # Only the value goes through the stack; the array variable
+                    # and the index are immediates of the store
+                    visit(element)
+                    emit(store_array_elem_i(array_address, i, element_size))
             else:
                 # Single initializer for all elements
-                node.initializer.accept(self)
+                self._visit(node.initializer)
     
     def visit_array_literal(self, node: ArrayLiteralNode):
-        """Visit array literal node"""
-        # For array literals, we need to handle them in context
-        # This is typically called from array declaration initialization
-        # For now, just emit the first element or zero
-        if node.elements:
-            node.elements[0].accept(self)
+        """Visit array literal node used as a value; pushes the base address of a new array"""
+        # Declarations initialize in place (see visit_array_decl); here the
+        # literal needs storage of its own
+        elements = node.elements
+        if elements and all(isinstance(element, LiteralExprNode) and element.literal_type != 'string'
+                            for element in elements):
+            first_const = self.add_constant_run([element.value for element in elements])
+            self.emit(InstructionBuilder.load_blob(first_const, len(elements)))
         else:
-            const_idx = self.add_constant(0)
-            self.emit(Instruction(Opcode.LOAD_CONST, [const_idx]))
+            for element in elements:
+                self._visit(element)
+            self.emit(InstructionBuilder.build_array(len(elements)))
     
     def visit_array_access(self, node: ArrayAccessNode):
         """Visit array access node"""
@@ -1674,55 +1633,48 @@ class BytecodeGenerator(ASTVisitor):
             self.emit(InstructionBuilder.load_var(array_address))
             
             # Generate index
-            node.index.accept(self)
-            
-            # Get element type and size
-            array_type = self.local_variable_types.get(array_name) or self.variable_types.get(array_name)
-            element_size = 4  # Default to 4 bytes for int
-            
-            if array_type:
-                if '[' in array_type:
-                    # Array type: extract element type
-                    element_type_name = array_type.split('[')[0]
-                elif array_type.endswith('*'):
-                    # Pointer type: remove one level of indirection
-                    element_type_name = array_type[:-1]
-                    # Handle nested pointers like "struct MyStruct*"
-                    if element_type_name.startswith('struct '):
-                        element_type_name = element_type_name[7:]  # Remove 'struct ' prefix
-                        if element_type_name in self.struct_layouts:
-                            element_size = self.struct_layouts[element_type_name]['size']
-                        else:
-                            element_size = 20  # Default struct size
-                    else:
-                        # Simple types
-                        if element_type_name == 'char':
-                            element_size = 1
-                        elif element_type_name == 'float':
-                            element_size = 4
-                        elif element_type_name == 'int':
-                            element_size = 4
-                else:
-                    # Fallback for other types
-                    element_type_name = array_type
-                    
-                # Set element size based on type
-                if element_type_name == 'char':
-                    element_size = 1
-                elif element_type_name == 'float':
-                    element_size = 4
-                elif element_type_name == 'int':
-                    element_size = 4
+            self._visit(node.index)
             
             # Load array element
+            element_size = self._element_size_for(array_name, struct_stride=False)
             self.emit(InstructionBuilder.load_array_elem(element_size))
         else:
             # Complex array access
-            node.array.accept(self)
-            node.index.accept(self)
+            self._visit(node.array)
+            self._visit(node.index)
             # For now, just use default element size
             self.emit(InstructionBuilder.load_array_elem(4))
     
+    def _element_size_for(self, array_name: str, struct_stride: bool = True) -> int:
+        """Size of the elements indexed through an array or pointer variable
+        
+        With struct_stride=False struct elements keep the 4-byte word default, as
+        LOAD_ARRAY_ELEM reads a single word rather than a whole struct.
+        """
+        array_type = self.local_variable_types.get(array_name) or self.variable_types.get(array_name)
+        if array_type is None:
+            return 4  # Default to 4 bytes for int
+        
+        if array_type.is_array or array_type.is_pointer:
+            # Array or pointer type: index the element type
+            element_type_name = array_type.element.name
+        else:
+            # Fallback for other types
+            element_type_name = array_type.name
+        
+        element_size = self._elem_size_cache.get(element_type_name)
+        if element_size is None:
+            if element_type_name in self.struct_layouts:
+                element_size = self.struct_layout_table.get_struct_size(element_type_name)
+            else:
+                # Unsized names (void, nested arrays/pointers) index in 4-byte units
+                element_size = _PRIMITIVE_SIZES.get(element_type_name) or 4
+            self._elem_size_cache[element_type_name] = element_size
+        
+        if not struct_stride and element_type_name in self.struct_layouts:
+            return 4
+        return element_size
+    
     def visit_pointer_type(self, node: PointerTypeNode):
         """Visit pointer type node"""
         # Type nodes don't generate bytecode
@@ -1737,7 +1689,7 @@ class BytecodeGenerator(ASTVisitor):
         pointer_address = self.allocate_variable(node.name)
         
         # Track the pointer type
-        pointer_type = self._get_type_name(node.type)
+        pointer_type = self._get_type_info(node.type)
         if self.current_function:
             self.local_variable_types[node.name] = pointer_type
         else:
@@ -1745,14 +1697,14 @@ class BytecodeGenerator(ASTVisitor):
         
         if node.initializer:
             # Generate code for initializer
-            node.initializer.accept(self)
+            self._visit(node.initializer)
             # Store the initialized value
-            self.emit(Instruction(Opcode.STORE_VAR, [pointer_address]))
+            self.emit_op(Opcode.STORE_VAR, pointer_address)
         else:
             # Initialize to null pointer (0)
-            const_idx = self.add_constant(0)
-            self.emit(Instruction(Opcode.LOAD_CONST, [const_idx]))
-            self.emit(Instruction(Opcode.STORE_VAR, [pointer_address]))
+            const_idx = self._add_int_const(0)
+            self.emit_op(Opcode.LOAD_CONST, const_idx)
+            self.emit_op(Opcode.STORE_VAR, pointer_address)
     
     def visit_address_of(self, node: AddressOfNode):
         """Visit address-of expression node (&variable)"""
@@ -1762,7 +1714,7 @@ class BytecodeGenerator(ASTVisitor):
         if isinstance(node.operand, IdentifierExprNode):
             # Simple case: &variable
             var_address = self.get_variable_address(node.operand.name)
-            self.emit(Instruction(Opcode.LOAD_ADDR, [var_address]))
+            self.emit_op(Opcode.LOAD_ADDR, var_address)
         else:
             # Complex address-of operation
             raise CodeGenError("Complex address-of operations not yet supported")
@@ -1773,10 +1725,10 @@ class BytecodeGenerator(ASTVisitor):
         self.set_current_position(node.line, getattr(node, 'column', 0))
         
         # Generate code for the pointer expression
-        node.operand.accept(self)
+        self._visit(node.operand)
         
         # Dereference the pointer
-        self.emit(Instruction(Opcode.LOAD_DEREF, []))
+        self.emit_op(Opcode.LOAD_DEREF)
     
     def _evaluate_constant_expression(self, expr_node):
         """Evaluate a constant expression to get its integer value"""
@@ -1791,15 +1743,17 @@ class BytecodeGenerator(ASTVisitor):
     
     def visit_cast_expr(self, node: CastExprNode):
         """Visit cast expression node"""
-        # Set current position for debug info
-        self.set_current_position(node.line, getattr(node, 'column', 0))
-        
-        # Generate code for the operand
-        node.operand.accept(self)
+        # Casts emit no conversion instructions: the semantic analyzer has
+        # already type-checked them, so only the operand generates code.
+        # Line info is only consumed in debug builds.
+        if self.mode == CompileMode.DEBUG:
+            self.set_current_position(node.line, node.column)
         
-        # For now, casting is mostly a no-op at runtime
-        # In a full implementation, we might emit type conversion instructions
-        # The semantic analyzer handles the type checking
+        # Skip straight through chains like (int)(float)x
+        operand = node.operand
+        while operand.__class__ is CastExprNode:
+            operand = operand.operand
+        self._visit(operand)
     
     def visit_sizeof_expr(self, node: SizeOfExprNode):
         """Visit sizeof expression node"""
@@ -1808,4 +1762,4 @@ class BytecodeGenerator(ASTVisitor):
         
         # By the time we get here, the optimizer should have replaced sizeof
         # with a constant value. If we still see a sizeof, emit an error placeholder
-        self.emit(Instruction(Opcode.LOAD_CONST, [-1]))  # Error indicator
+        self.emit_op(Opcode.LOAD_CONST, -1)  # Error indicator
@@ -113,14 +113,47 @@ class Opcode(IntEnum):
     HALT = auto()
     NOP = auto()
     COMMENT = auto()  # NEW: For debug comments
+    
+    # Fused pointer instructions (appended to keep existing opcode values stable)
+    LOAD_DEREF_OFFSET = auto()   # Dereference pointer on stack plus immediate offset
+    STORE_DEREF_OFFSET = auto()  # Store value at pointer on stack plus immediate offset
+    
+    # Bulk array initialization from a run of constant pool entries
+    INIT_ARRAY_CONST = auto()
+    STORE_ARRAY_ELEM_I = auto()  # Store into array variable at an immediate index
+    
+    # Array literals used as values; both push the base address of a fresh array
+    LOAD_BLOB = auto()    # Array filled from a run of constant pool entries
+    BUILD_ARRAY = auto()  # Array filled from values popped off the stack
+    
+    # Bit shifts; also the strength-reduced form of multiply/divide by 2^k
+    SHL = auto()
+    SHR = auto()
 
-@dataclass
 class Instruction:
     """A single bytecode instruction with enhanced debug info"""
-    opcode: Opcode
-    operands: List[Any]
-    line: Optional[int] = None
-    column: Optional[int] = None  # NEW: Column information for better debug info
+    # Hand-written rather than a dataclass so instances carry no __dict__;
+    # the generator allocates one per emitted instruction
+    __slots__ = ('opcode', 'operands', 'line', 'column')
+    
+    def __init__(self, opcode: Opcode, operands: List[Any],
+                 line: Optional[int] = None, column: Optional[int] = None):
+        self.opcode = opcode
+        self.operands = operands
+        self.line = line
+        self.column = column  # NEW: Column information for better debug info
+    
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.opcode, self.operands, self.line, self.column) == \
+               (other.opcode, other.operands, other.line, other.column)
+    
+    __hash__ = None  # Mutable, like the dataclass it replaces
+    
+    def __repr__(self):
+        return (f"Instruction(opcode={self.opcode!r}, operands={self.operands!r}, "
+                f"line={self.line!r}, column={self.column!r})")
     
     def __str__(self):
         if self.operands:
@@ -201,6 +234,14 @@ class InstructionBuilder:
     def store_deref() -> Instruction:
         return Instruction(Opcode.STORE_DEREF, [])
     
+    @staticmethod
+    def load_deref_offset(offset: int) -> Instruction:
+        return Instruction(Opcode.LOAD_DEREF_OFFSET, [offset])
+    
+    @staticmethod
+    def store_deref_offset(offset: int) -> Instruction:
+        return Instruction(Opcode.STORE_DEREF_OFFSET, [offset])
+    
     @staticmethod
     def comment(text: str) -> Instruction:
         return Instruction(Opcode.COMMENT, [text])
@@ -241,6 +282,14 @@ class InstructionBuilder:
     def xor() -> Instruction:
         return Instruction(Opcode.XOR, [])
     
+    @staticmethod
+    def shl() -> Instruction:
+        return Instruction(Opcode.SHL, [])
+    
+    @staticmethod
+    def shr() -> Instruction:
+        return Instruction(Opcode.SHR, [])
+    
     @staticmethod
     def eq() -> Instruction:
         return Instruction(Opcode.EQ, [])
@@ -297,6 +346,22 @@ class InstructionBuilder:
     def store_array_elem(element_size: int = 4) -> Instruction:
         return Instruction(Opcode.STORE_ARRAY_ELEM, [element_size])
     
+    @staticmethod
+    def init_array_const(first_const: int, count: int, element_size: int = 4) -> Instruction:
+        return Instruction(Opcode.INIT_ARRAY_CONST, [first_const, count, element_size])
+    
+    @staticmethod
+    def store_array_elem_i(array_address: int, index: int, element_size: int = 4) -> Instruction:
+        return Instruction(Opcode.STORE_ARRAY_ELEM_I, [array_address, index, element_size])
+    
+    @staticmethod
+    def load_blob(first_const: int, count: int, element_size: int = 4) -> Instruction:
+        return Instruction(Opcode.LOAD_BLOB, [first_const, count, element_size])
+    
+    @staticmethod
+    def build_array(count: int, element_size: int = 4) -> Instruction:
+        return Instruction(Opcode.BUILD_ARRAY, [count, element_size])
+    
     @staticmethod
     def rtos_create_task(func_id: int, name_id: int, stack_size: int, priority: int, core: int) -> Instruction:
         return Instruction(Opcode.RTOS_CREATE_TASK, [func_id, name_id, stack_size, priority, core])
@@ -433,6 +498,9 @@ INSTRUCTION_INFO = {
     Opcode.LOAD_STRUCT_MEMBER_BIT: {"operands": 4, "description": "Load bit-field"},
     Opcode.STORE_STRUCT_MEMBER_BIT: {"operands": 4, "description": "Store bit-field"},
     
+    Opcode.LOAD_DEREF_OFFSET: {"operands": 1, "description": "Load value at pointer plus offset"},
+    Opcode.STORE_DEREF_OFFSET: {"operands": 1, "description": "Store value at pointer plus offset"},
+    
     Opcode.ADD: {"operands": 0, "description": "Add two values"},
     Opcode.SUB: {"operands": 0, "description": "Subtract two values"},
     Opcode.MUL: {"operands": 0, "description": "Multiply two values"},
@@ -442,6 +510,8 @@ INSTRUCTION_INFO = {
     Opcode.OR: {"operands": 0, "description": "Logical OR"},
     Opcode.NOT: {"operands": 0, "description": "Logical NOT"},
     Opcode.XOR: {"operands": 0, "description": "Logical XOR"},
+    Opcode.SHL: {"operands": 0, "description": "Shift left"},
+    Opcode.SHR: {"operands": 0, "description": "Arithmetic shift right"},
     
     Opcode.EQ: {"operands": 0, "description": "Equal comparison"},
     Opcode.NEQ: {"operands": 0, "description": "Not equal comparison"},
@@ -459,6 +529,10 @@ INSTRUCTION_INFO = {
     Opcode.ALLOC_ARRAY: {"operands": 2, "description": "Allocate array"},
     Opcode.LOAD_ARRAY_ELEM: {"operands": 1, "description": "Load array element"},
     Opcode.STORE_ARRAY_ELEM: {"operands": 1, "description": "Store array element"},
+    Opcode.INIT_ARRAY_CONST: {"operands": 3, "description": "Initialize array from constant run"},
+    Opcode.STORE_ARRAY_ELEM_I: {"operands": 3, "description": "Store array element at immediate index"},
+    Opcode.LOAD_BLOB: {"operands": 3, "description": "Push new array from constant run"},
+    Opcode.BUILD_ARRAY: {"operands": 2, "description": "Push new array from stack values"},
     
     Opcode.RTOS_CREATE_TASK: {"operands": 5, "description": "Create RTOS task"},
     Opcode.RTOS_DELETE_TASK: {"operands": 1, "description": "Delete RTOS task"},
@@ -473,7 +547,7 @@ INSTRUCTION_INFO = {
     Opcode.GLOBAL_VAR_DECLARE: {"operands": 3, "description": "Declare global variable"},
     Opcode.MSG_DECLARE: {"operands": 2, "description": "Declare message queue"},
     Opcode.MSG_SEND: {"operands": 1, "description": "Send message"},
-    Opcode.MSG_RECV: {"operands": 1, "description": "Receive message"},
+    Opcode.MSG_RECV: {"operands": 2, "description": "Receive message"},
     
     Opcode.HW_GPIO_INIT: {"operands": 2, "description": "Initialize GPIO"},
     Opcode.HW_GPIO_SET: {"operands": 2, "description": "Set GPIO value"},
@@ -3,7 +3,13 @@ Bytecode Reader for RT-Micro-C Language
 Reads bytecode programs from .vmb files.
 """
 
-from .writer import BytecodeReader
-
 # Re-export for convenience
 __all__ = ['BytecodeReader']
+
+def __getattr__(name):
+    # Import the writer module on first use only; compile-only flows never need it
+    if name == 'BytecodeReader':
+        from .writer import BytecodeReader
+        globals()[name] = BytecodeReader
+        return BytecodeReader
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
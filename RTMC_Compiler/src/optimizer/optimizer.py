@@ -5,7 +5,92 @@ Performs compile-time optimizations on the AST.
 
 from RTMC_Compiler.src.parser.ast_nodes import *
 from RTMC_Compiler.src.semantic.struct_layout import StructLayoutTable
-from typing import Dict, List, Optional, Any, Set
+from typing import Dict, List, Optional, Any, Set, Callable, Tuple
+import operator
+
+# Sizes of the primitive types in bytes
+_PRIMITIVE_SIZES = {
+    'char': 1,
+    'int': 4,
+    'float': 4,
+    'void': 0,
+    'bool': 1
+}
+
+# Constant folding per operator; comparisons and logic yield 0/1 ints
+_BINARY_FOLDS: Dict[str, Callable[[Any, Any], Any]] = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '%': operator.mod,
+    '==': lambda left, right: 1 if left == right else 0,
+    '!=': lambda left, right: 1 if left != right else 0,
+    '<': lambda left, right: 1 if left < right else 0,
+    '<=': lambda left, right: 1 if left <= right else 0,
+    '>': lambda left, right: 1 if left > right else 0,
+    '>=': lambda left, right: 1 if left >= right else 0,
+    '&&': lambda left, right: 1 if left and right else 0,
+    '||': lambda left, right: 1 if left or right else 0,
+    '&': operator.and_,
+    '|': operator.or_,
+    '^': operator.xor,
+    '<<': operator.lshift,
+    '>>': operator.rshift,
+}
+
+# Operators that must not fold with a zero right operand
+_ZERO_DIVISORS = {
+    '/': "Division by zero",
+    '%': "Modulo by zero",
+}
+
+_UNARY_FOLDS: Dict[str, Callable[[Any], Any]] = {
+    '+': operator.pos,
+    '-': operator.neg,
+    '!': lambda operand: 1 if not operand else 0,
+    '~': operator.invert,
+}
+
+# Strength reduction of multiply/divide by a power of two; the VM's integer
+# division floors, so x / 2^k and x >> k agree for negative x as well
+_POWER_OF_TWO_SHIFTS = {
+    '*': '<<',
+    '/': '>>',
+}
+
+# Logical operators whose result a constant left operand alone can decide,
+# mapped to that result: 0 && x is 0, nonzero || x is 1
+_SHORT_CIRCUIT_RESULTS = {
+    '&&': 0,
+    '||': 1,
+}
+
+# Results of an integer operator applied to the same variable on both
+# sides; None means the variable itself
+_SAME_OPERAND_RESULTS = {
+    '-': 0,
+    '^': 0,
+    '&': None,
+    '|': None,
+}
+
+# Statements after which the rest of a block is unreachable
+_TERMINATOR_TYPES = (ReturnStmtNode, BreakStmtNode, ContinueStmtNode)
+
+# Types whose values may be shifted; matches TypeChecker.is_integer_type
+_INTEGER_TYPES = {'int', 'char'}
+
+# Upper bound on constant folding passes per optimize() call
+MAX_FOLD_PASSES = 4
+
+# Folded integers in this range share one literal node per source line
+_SMALL_INT_RANGE = range(-1, 11)
+
+def _is_int_literal(node: ASTNode, value: int) -> bool:
+    """Whether node is an int-typed literal with the given value"""
+    # LiteralExprNode is never subclassed, so the folder checks the exact type
+    return type(node) is LiteralExprNode and node.literal_type == 'int' and node.value == value
 
 class OptimizationError(Exception):
     """Optimization error"""
@@ -18,109 +103,186 @@ class ConstantFolder(ASTVisitor):
 
     def visit_pointer_decl(self, node: PointerDeclNode) -> PointerDeclNode:
         """Optimize pointer declaration"""
-        optimized_initializer = None
-        if node.initializer:
-            optimized_initializer = node.initializer.accept(self)
-        return PointerDeclNode(node.name, node.base_type, node.pointer_level, optimized_initializer, node.is_const, node.line, node.column, node.filename)
+        if node.initializer is not None:
+            node.initializer = self._visit(node.initializer)
+        self._non_integer_names.add(node.name)
+        return node
 
     def visit_address_of(self, node: AddressOfNode) -> AddressOfNode:
         """Optimize address-of expression"""
-        optimized_operand = node.operand.accept(self)
-        return AddressOfNode(optimized_operand, node.line)
+        node.operand = self._visit(node.operand)
+        return node
 
     def visit_dereference(self, node: DereferenceNode) -> DereferenceNode:
         """Optimize dereference expression"""
-        optimized_operand = node.operand.accept(self)
-        return DereferenceNode(optimized_operand, node.line)
+        node.operand = self._visit(node.operand)
+        return node
 
     def visit_cast_expr(self, node: CastExprNode) -> CastExprNode:
         """Optimize cast expression"""
-        optimized_operand = node.operand.accept(self)
-        return CastExprNode(node.target_type, optimized_operand, node.line)
+        node.operand = self._visit(node.operand)
+        return node
     
     def visit_sizeof_expr(self, node: SizeOfExprNode) -> LiteralExprNode:
         """Optimize sizeof expression - replace with constant value"""
         try:
             size = self._calculate_sizeof(node.target)
-            return LiteralExprNode(size, "int", node.line)
         except Exception:
             # If we can't calculate size, return a placeholder
-            return LiteralExprNode(-1, "int", node.line)  # Error placeholder
+            size = -1  # Error placeholder
+        self.changed = True
+        return self._lit(size, "int", node.line)
     
-    def _calculate_sizeof(self, target) -> int:
+    def _calculate_sizeof(self, target: ASTNode) -> int:
         """Calculate the size of a type or expression"""
-        if isinstance(target, PrimitiveTypeNode):
-            return self._get_primitive_size(target.type_name)
-        elif isinstance(target, StructTypeNode):
-            return self.struct_layout_table.get_struct_size(target.struct_name)
-        elif isinstance(target, UnionTypeNode):
-            return self.struct_layout_table.get_struct_size(target.union_name)
-        elif isinstance(target, ArrayTypeNode):
-            element_size = self._calculate_sizeof(target.element_type)
-            return element_size * (target.size or 1)
-        elif isinstance(target, PointerTypeNode):
-            return 8  # 64-bit pointers
-        elif isinstance(target, IdentifierExprNode):
-            # Look up variable type in symbol table
-            var_type = self.symbol_table.get(target.name, {}).get('type', 'int')
-            return self._get_type_size(var_type)
-        else:
+        handler = self._sizeof_handlers.get(type(target))
+        if handler is None:
             # For expressions, try to deduce their type
             return 4  # Default to int size
+        return handler(target)
+    
+    def _sizeof_primitive(self, target: PrimitiveTypeNode) -> int:
+        return self._get_primitive_size(target.type_name)
+    
+    def _sizeof_struct(self, target: StructTypeNode) -> int:
+        return self._get_struct_size(target.struct_name)
+    
+    def _sizeof_union(self, target: UnionTypeNode) -> int:
+        return self._get_struct_size(target.union_name)
+    
+    def _sizeof_array(self, target: ArrayTypeNode) -> int:
+        element_size = self._calculate_sizeof(target.element_type)
+        return element_size * (target.size or 1)
+    
+    def _sizeof_pointer(self, target: PointerTypeNode) -> int:
+        return 8  # 64-bit pointers
+    
+    def _sizeof_identifier(self, target: IdentifierExprNode) -> int:
+        # Look up variable type in symbol table
+        var_type = self.symbol_table.get(target.name, {}).get('type', 'int')
+        return self._get_type_size(var_type)
     
     def _get_primitive_size(self, type_name: str) -> int:
         """Get size of primitive types"""
-        sizes = {
-            'char': 1,
-            'int': 4,
-            'float': 4,
-            'void': 0,
-            'bool': 1
-        }
-        return sizes.get(type_name, 4)
+        return _PRIMITIVE_SIZES.get(type_name, 4)
+    
+    def _get_struct_size(self, struct_name: str) -> int:
+        """Get size of a struct or union, looked up in the layout table once per name"""
+        size = self._struct_size_cache.get(struct_name)
+        if size is None:
+            size = self.struct_layout_table.get_struct_size(struct_name)
+            self._struct_size_cache[struct_name] = size
+        return size
     
     def _get_type_size(self, type_str: str) -> int:
         """Get size from type string (e.g., 'int', 'struct Point', 'int*')"""
-        if type_str in ['char', 'int', 'float', 'void', 'bool']:
-            return self._get_primitive_size(type_str)
-        elif type_str.startswith('struct '):
-            struct_name = type_str[7:]  # Remove 'struct '
-            return self.struct_layout_table.get_struct_size(struct_name)
+        size = self._type_size_cache.get(type_str)
+        if size is not None:
+            return size
+        
+        if type_str in _PRIMITIVE_SIZES:
+            size = _PRIMITIVE_SIZES[type_str]
+        elif type_str.startswith(('struct ', 'union ')):
+            struct_name = type_str.split(' ', 1)[1]  # Remove 'struct '/'union '
+            size = self._get_struct_size(struct_name)
         elif type_str.endswith('*'):
-            return 8  # Pointer size
+            size = 8  # Pointer size
         elif type_str.endswith('[]'):
             # Array type - would need more context for exact size
-            return 4  # Default element size
+            size = 4  # Default element size
         else:
-            return 4  # Default size
+            size = 4  # Default size
+        
+        self._type_size_cache[type_str] = size
+        return size
     """Constant folding optimizer"""
     
     def __init__(self, struct_layout_table: Optional[StructLayoutTable] = None, symbol_table: Optional[Dict] = None):
+        super().__init__()
         self.constants: Dict[str, Any] = {}
         self.struct_layout_table = struct_layout_table or StructLayoutTable()
         self.symbol_table = symbol_table or {}  # For variable type lookup
+        
+        # Names declared with an integer type, minus any name that was ever
+        # declared otherwise, since shadowing makes the type ambiguous
+        self._integer_names: Set[str] = set()
+        self._non_integer_names: Set[str] = set()
+        
+        # Dead code after return/break/continue is dropped in the same pass
+        self.reachable_code = True
+        
+        # Set whenever a pass replaces or removes a node; Optimizer re-runs
+        # the folder until a pass leaves the tree unchanged
+        self.changed = False
+        self._laid_out_structs: Set[str] = set()
+        
+        # Declared type node -> type string for array/pointer chains. Keyed on
+        # the node itself (not id()) so entries cannot alias a freed node;
+        # kept across folding passes and dropped when a new program arrives
+        self._type_string_cache: Dict[TypeNode, str] = {}
+        self._current_program: Optional[ProgramNode] = None
+        
+        # Struct/union sizes by name and sizes by type string; both are
+        # dropped whenever a new layout is registered
+        self._struct_size_cache: Dict[str, int] = {}
+        self._type_size_cache: Dict[str, int] = {}
+        
+        # (value, type, line) -> shared literal for small folded integers
+        self._literal_cache: Dict[Tuple[int, str, int], LiteralExprNode] = {}
+        
+        # sizeof target class -> size handler; other expressions default to int
+        self._sizeof_handlers: Dict[type, Callable] = {
+            PrimitiveTypeNode: self._sizeof_primitive,
+            StructTypeNode: self._sizeof_struct,
+            UnionTypeNode: self._sizeof_union,
+            ArrayTypeNode: self._sizeof_array,
+            PointerTypeNode: self._sizeof_pointer,
+            IdentifierExprNode: self._sizeof_identifier,
+        }
+    
+    def _lit(self, value: Any, literal_type: str, line: int) -> LiteralExprNode:
+        """Create a folded literal, reusing the node for small integers on the same line"""
+        # type() check keeps True/False from aliasing the cached 1/0 nodes
+        if type(value) is not int or value not in _SMALL_INT_RANGE:
+            return LiteralExprNode(value, literal_type, line)
+        key = (value, literal_type, line)
+        literal = self._literal_cache.get(key)
+        if literal is None:
+            literal = self._literal_cache[key] = LiteralExprNode(value, literal_type, line)
+        return literal
     
     def visit_program(self, node: ProgramNode) -> ProgramNode:
         """Optimize program"""
-        optimized_declarations = []
+        # Constant propagation follows declaration order, so every pass
+        # starts without constants recorded by the previous one
+        self.constants.clear()
+        self._integer_names.clear()
+        self._non_integer_names.clear()
         
-        for decl in node.declarations:
-            optimized_decl = decl.accept(self)
-            if optimized_decl:
-                optimized_declarations.append(optimized_decl)
+        if node is not self._current_program:
+            self._current_program = node
+            self._type_string_cache.clear()
         
-        return ProgramNode(optimized_declarations, node.line, node.filename)
+        visit = self._visit
+        node.declarations = [optimized_decl for optimized_decl in map(visit, node.declarations)
+                             if optimized_decl is not None]
+        return node
     
     def visit_function_decl(self, node: FunctionDeclNode) -> FunctionDeclNode:
         """Optimize function declaration"""
-        optimized_body = node.body.accept(self)
-        
-        return FunctionDeclNode(node.name, node.return_type, node.parameters, 
-                              optimized_body, node.line)
+        self.reachable_code = True
+        for param in node.parameters:
+            self._record_declared_type(param.name, param.type)
+        node.body = self._visit(node.body)
+        return node
 
 
     def visit_struct_decl(self, node: StructDeclNode)-> StructDeclNode:
         """Optimize struct declaration"""
+        # Later folding passes revisit the declaration; lay it out only once
+        if node.name in self._laid_out_structs:
+            return node
+        self._laid_out_structs.add(node.name)
 
         # Check if the struct has a base struct
         if node.base_struct:
@@ -135,42 +297,68 @@ class ConstantFolder(ASTVisitor):
                         node.fields.insert(index, field)
                         index += 1
         
-        # Register struct with layout table
-        self.struct_layout_table.register_struct(node)
-
-        # Calculate layout
-        layout = self.struct_layout_table.calculate_layout(node.name)
+        self._register_layout(node)
         
         return node  # Struct declarations don't need optimization
     
     def visit_union_decl(self, node: UnionDeclNode)-> StructDeclNode:
         """Optimize union declaration"""
+        if node.name in self._laid_out_structs:
+            return node
+        self._laid_out_structs.add(node.name)
         
-        # Register union with layout table (treat similar to struct but with overlapping fields)
-        self.struct_layout_table.register_struct(node)
-        
-        # Calculate layout
-        layout = self.struct_layout_table.calculate_layout(node.name)
+        # Unions go through the same layout table, with overlapping fields
+        self._register_layout(node)
         
         return node  # Struct declarations don't need optimization
+    
+    def _register_layout(self, node: ASTNode) -> None:
+        """Register and lay out a struct or union, invalidating cached sizes"""
+        # A table handed in by the caller may already hold this layout; the
+        # table caches layouts by name, so registering again would change nothing
+        if node.name in self.struct_layout_table.struct_decls:
+            return
+        
+        self.struct_layout_table.register_struct(node)
+        self.struct_layout_table.calculate_layout(node.name)
+        
+        # Keep cached sizes in step with the table
+        self._struct_size_cache.clear()
+        self._type_size_cache.clear()
 
     def visit_variable_decl(self, node: VariableDeclNode) -> VariableDeclNode:
         """Optimize variable declaration"""
-        optimized_initializer = None
-        
-        if node.initializer:
-            optimized_initializer = node.initializer.accept(self)
+        if node.initializer is not None:
+            node.initializer = self._visit(node.initializer)
             
             # If it's a constant initializer, record it
-            if isinstance(optimized_initializer, LiteralExprNode) and node.is_const:
-                self.constants[node.name] = optimized_initializer.value
+            if type(node.initializer) is LiteralExprNode and node.is_const:
+                self.constants[node.name] = node.initializer.value
         
-        # Track variable type for sizeof calculations
+        # Track variable type for sizeof calculations; later passes see the
+        # same declarations, so only a changed type allocates a new entry
         type_str = self._get_type_string_from_node(node.type)
-        self.symbol_table[node.name] = {'type': type_str}
+        entry = self.symbol_table.get(node.name)
+        if entry is None or entry.get('type') != type_str:
+            self.symbol_table[node.name] = {'type': type_str}
+        self._record_declared_type(node.name, node.type)
         
-        return VariableDeclNode(node.name, node.type, optimized_initializer, 
-                              node.is_const, node.line)
+        return node
+    
+    def _record_declared_type(self, name: str, type_node: TypeNode) -> None:
+        """Note whether a declared name is known to hold an integer"""
+        if isinstance(type_node, PrimitiveTypeNode) and type_node.type_name in _INTEGER_TYPES:
+            self._integer_names.add(name)
+        else:
+            self._non_integer_names.add(name)
+    
+    def _is_integer_operand(self, node: ExpressionNode) -> bool:
+        """Whether an expression is statically known to be an integer"""
+        if type(node) is LiteralExprNode:
+            return node.literal_type == 'int'
+        if isinstance(node, IdentifierExprNode):
+            return node.name in self._integer_names and node.name not in self._non_integer_names
+        return False
     
     def _get_type_string_from_node(self, type_node: TypeNode) -> str:
         """Convert a type node to a type string"""
@@ -180,14 +368,23 @@ class ConstantFolder(ASTVisitor):
             return f"struct {type_node.struct_name}"
         elif isinstance(type_node, UnionTypeNode):
             return f"union {type_node.union_name}"
-        elif isinstance(type_node, ArrayTypeNode):
+        
+        # Array and pointer types recurse; every pass sees the same nodes
+        type_str = self._type_string_cache.get(type_node)
+        if type_str is not None:
+            return type_str
+        
+        if isinstance(type_node, ArrayTypeNode):
             element_type = self._get_type_string_from_node(type_node.element_type)
-            return f"{element_type}[]"
+            type_str = f"{element_type}[]"
         elif isinstance(type_node, PointerTypeNode):
             base_type = self._get_type_string_from_node(type_node.base_type)
-            return f"{base_type}{'*' * type_node.pointer_level}"
+            type_str = f"{base_type}{'*' * type_node.pointer_level}"
         else:
-            return "int"  # Default type
+            type_str = "int"  # Default type
+        
+        self._type_string_cache[type_node] = type_str
+        return type_str
     
     def visit_primitive_type(self, node: PrimitiveTypeNode) -> PrimitiveTypeNode:
         """Type nodes don't need optimization"""
@@ -209,177 +406,268 @@ class ConstantFolder(ASTVisitor):
         """Optimize block statement"""
         optimized_statements = []
         
+        # Visiting a statement can clear reachable_code, so the check stays
+        # in the loop; only the method lookups are hoisted
+        visit = self._visit
+        append = optimized_statements.append
         for stmt in node.statements:
-            optimized_stmt = stmt.accept(self)
-            if optimized_stmt:
-                optimized_statements.append(optimized_stmt)
+            if not self.reachable_code:
+                break  # Skip unreachable code
+            
+            optimized_stmt = visit(stmt)
+            if optimized_stmt is not None:
+                append(optimized_stmt)
         
-        return BlockStmtNode(optimized_statements, node.line)
+        node.statements = optimized_statements
+        return node
     
     def visit_expression_stmt(self, node: ExpressionStmtNode) -> ExpressionStmtNode:
         """Optimize expression statement"""
-        optimized_expr = node.expression.accept(self)
+        optimized_expr = self._visit(node.expression)
         
         # Remove statements with no side effects
-        if isinstance(optimized_expr, LiteralExprNode):
+        if type(optimized_expr) is LiteralExprNode:
+            self.changed = True
             return None  # Dead code elimination
         
-        return ExpressionStmtNode(optimized_expr, node.line)
+        node.expression = optimized_expr
+        return node
     
     def visit_if_stmt(self, node: IfStmtNode) -> StatementNode:
         """Optimize if statement"""
-        optimized_condition = node.condition.accept(self)
+        optimized_condition = self._visit(node.condition)
         
         # Constant condition optimization
-        if isinstance(optimized_condition, LiteralExprNode):
-            if self._is_truthy(optimized_condition.value):
+        if type(optimized_condition) is LiteralExprNode:
+            self.changed = True
+            if optimized_condition.value:
                 # Condition is always true, replace with then branch
-                return node.then_stmt.accept(self)
+                return self._visit(node.then_stmt)
             else:
                 # Condition is always false, replace with else branch or remove
                 if node.else_stmt:
-                    return node.else_stmt.accept(self)
+                    return self._visit(node.else_stmt)
                 else:
                     return None  # Dead code elimination
         
-        optimized_then = node.then_stmt.accept(self)
-        optimized_else = node.else_stmt.accept(self) if node.else_stmt else None
-        
-        return IfStmtNode(optimized_condition, optimized_then, optimized_else, node.line)
+        # Either branch may be skipped, so neither one ends the enclosing block
+        reachable = self.reachable_code
+        node.condition = optimized_condition
+        node.then_stmt = self._visit(node.then_stmt)
+        self.reachable_code = reachable
+        if node.else_stmt:
+            node.else_stmt = self._visit(node.else_stmt)
+            self.reachable_code = reachable
+        return node
     
     def visit_while_stmt(self, node: WhileStmtNode) -> StatementNode:
         """Optimize while statement"""
-        optimized_condition = node.condition.accept(self)
+        optimized_condition = self._visit(node.condition)
         
         # Constant condition optimization
-        if isinstance(optimized_condition, LiteralExprNode):
-            if not self._is_truthy(optimized_condition.value):
+        if type(optimized_condition) is LiteralExprNode:
+            if not optimized_condition.value:
                 # Condition is always false, remove entire loop
+                self.changed = True
                 return None
         
-        optimized_body = node.body.accept(self)
-        
-        return WhileStmtNode(optimized_condition, optimized_body, node.line)
+        reachable = self.reachable_code
+        node.condition = optimized_condition
+        node.body = self._visit(node.body)
+        self.reachable_code = reachable
+        return node
     
     def visit_for_stmt(self, node: ForStmtNode) -> StatementNode:
         """Optimize for statement"""
-        optimized_init = node.init.accept(self) if node.init else None
-        optimized_condition = node.condition.accept(self) if node.condition else None
-        optimized_update = node.update.accept(self) if node.update else None
+        optimized_init = self._visit(node.init) if node.init else None
+        optimized_condition = self._visit(node.condition) if node.condition else None
+        optimized_update = self._visit(node.update) if node.update else None
         
         # Constant condition optimization
-        if isinstance(optimized_condition, LiteralExprNode):
-            if not self._is_truthy(optimized_condition.value):
+        if type(optimized_condition) is LiteralExprNode:
+            if not optimized_condition.value:
                 # Condition is always false, return only init statement
+                self.changed = True
                 return optimized_init
         
-        optimized_body = node.body.accept(self)
-        
-        return ForStmtNode(optimized_init, optimized_condition, optimized_update, 
-                          optimized_body, node.line)
+        node.init = optimized_init
+        node.condition = optimized_condition
+        node.update = optimized_update
+        reachable = self.reachable_code
+        node.body = self._visit(node.body)
+        self.reachable_code = reachable
+        return node
     
     def visit_return_stmt(self, node: ReturnStmtNode) -> ReturnStmtNode:
         """Optimize return statement"""
-        optimized_value = node.value.accept(self) if node.value else None
+        if node.value:
+            node.value = self._visit(node.value)
         
-        return ReturnStmtNode(optimized_value, node.line)
+        # Return statements make subsequent code unreachable
+        self.reachable_code = False
+        return node
     
     def visit_break_stmt(self, node: BreakStmtNode) -> BreakStmtNode:
-        """Break statements don't need optimization"""
+        """Break statements make subsequent code unreachable"""
+        self.reachable_code = False
         return node
     
     def visit_continue_stmt(self, node: ContinueStmtNode) -> ContinueStmtNode:
-        """Continue statements don't need optimization"""
+        """Continue statements make subsequent code unreachable"""
+        self.reachable_code = False
         return node
     
     def visit_binary_expr(self, node: BinaryExprNode) -> ExpressionNode:
         """Optimize binary expression"""
-        optimized_left = node.left.accept(self)
-        optimized_right = node.right.accept(self)
-        
+        optimized_left = self._visit(node.left)
+        
+        # A constant left side can decide && / || on its own; the right side
+        # is then dropped unvisited, as long as dropping it loses no side effects
+        if node.operator in _SHORT_CIRCUIT_RESULTS and type(optimized_left) is LiteralExprNode:
+            result = _SHORT_CIRCUIT_RESULTS[node.operator]
+            if bool(optimized_left.value) == bool(result) and self._is_side_effect_free(node.right):
+                self.changed = True
+                return self._lit(result, 'int', node.line)
+        
+        optimized_right = self._visit(node.right)
+        
+        simplified = self._simplify_binary(node, optimized_left, optimized_right)
+        if simplified is not None:
+            self.changed = True
+            return simplified
+        
+        node.left = optimized_left
+        node.right = optimized_right
+        return node
+    
+    def _is_discardable_int(self, node: ExpressionNode) -> bool:
+        """Whether an integer expression can be replaced without evaluating it"""
+        return self._is_integer_operand(node) and self._is_side_effect_free(node)
+    
+    def _is_side_effect_free(self, node: ExpressionNode) -> bool:
+        """Whether evaluating an expression can be skipped without observable effect"""
+        if isinstance(node, (LiteralExprNode, IdentifierExprNode, SizeOfExprNode)):
+            return True
+        if isinstance(node, BinaryExprNode):
+            return self._is_side_effect_free(node.left) and self._is_side_effect_free(node.right)
+        if isinstance(node, (UnaryExprNode, CastExprNode, AddressOfNode, DereferenceNode)):
+            return self._is_side_effect_free(node.operand)
+        if isinstance(node, MemberExprNode):
+            return self._is_side_effect_free(node.object) and (
+                not node.computed or self._is_side_effect_free(node.property))
+        if isinstance(node, ArrayAccessNode):
+            return self._is_side_effect_free(node.array) and self._is_side_effect_free(node.index)
+        # Calls, assignments, ++/-- and message send/receive all have effects
+        return False
+    
+    def _simplify_binary(self, node: BinaryExprNode, optimized_left: ExpressionNode,
+                         optimized_right: ExpressionNode) -> Optional[ExpressionNode]:
+        """Fold or algebraically simplify a binary expression; None if nothing applies"""
         # Constant folding
-        if isinstance(optimized_left, LiteralExprNode) and isinstance(optimized_right, LiteralExprNode):
+        if type(optimized_left) is LiteralExprNode and type(optimized_right) is LiteralExprNode:
             try:
                 result = self._fold_binary_constants(optimized_left.value, node.operator, optimized_right.value)
                 result_type = self._get_result_type(optimized_left.literal_type, optimized_right.literal_type)
-                return LiteralExprNode(result, result_type, node.line)
+                return self._lit(result, result_type, node.line)
             except:
                 pass  # Fall back to non-optimized version
         
-        # Algebraic simplifications
+        # Algebraic simplifications; identities only use int literals, since
+        # dropping a float 0.0 or 1.0 would lose the float promotion
         if node.operator == '+':
             # x + 0 = x, 0 + x = x
-            if isinstance(optimized_right, LiteralExprNode) and optimized_right.value == 0:
+            if _is_int_literal(optimized_right, 0):
                 return optimized_left
-            if isinstance(optimized_left, LiteralExprNode) and optimized_left.value == 0:
+            if _is_int_literal(optimized_left, 0):
                 return optimized_right
         
         elif node.operator == '-':
             # x - 0 = x
-            if isinstance(optimized_right, LiteralExprNode) and optimized_right.value == 0:
+            if _is_int_literal(optimized_right, 0):
                 return optimized_left
         
         elif node.operator == '*':
-            # x * 0 = 0, 0 * x = 0
-            if isinstance(optimized_right, LiteralExprNode) and optimized_right.value == 0:
+            # x * 0 = 0, 0 * x = 0; x must be an int so the result type holds,
+            # and free of side effects since it is no longer evaluated
+            if _is_int_literal(optimized_right, 0) and self._is_discardable_int(optimized_left):
                 return optimized_right
-            if isinstance(optimized_left, LiteralExprNode) and optimized_left.value == 0:
+            if _is_int_literal(optimized_left, 0) and self._is_discardable_int(optimized_right):
                 return optimized_left
             # x * 1 = x, 1 * x = x
-            if isinstance(optimized_right, LiteralExprNode) and optimized_right.value == 1:
+            if _is_int_literal(optimized_right, 1):
                 return optimized_left
-            if isinstance(optimized_left, LiteralExprNode) and optimized_left.value == 1:
+            if _is_int_literal(optimized_left, 1):
                 return optimized_right
         
         elif node.operator == '/':
             # x / 1 = x
-            if isinstance(optimized_right, LiteralExprNode) and optimized_right.value == 1:
+            if _is_int_literal(optimized_right, 1):
                 return optimized_left
         
-        return BinaryExprNode(optimized_left, node.operator, optimized_right, node.line)
+        # x - x = 0, x ^ x = 0, x & x = x, x | x = x for the same variable
+        if (node.operator in _SAME_OPERAND_RESULTS
+                and isinstance(optimized_left, IdentifierExprNode)
+                and isinstance(optimized_right, IdentifierExprNode)
+                and optimized_left.name == optimized_right.name
+                and self._is_integer_operand(optimized_left)):
+            result = _SAME_OPERAND_RESULTS[node.operator]
+            if result is None:
+                return optimized_left
+            return self._lit(result, 'int', node.line)
+        
+        # x * 2^k = x << k, x / 2^k = x >> k
+        shift_operator = _POWER_OF_TWO_SHIFTS.get(node.operator)
+        if shift_operator is not None and type(optimized_right) is LiteralExprNode:
+            value = optimized_right.value
+            if (type(value) is int and value > 0 and value & (value - 1) == 0
+                    and self._get_result_type(optimized_right.literal_type, 'int') == 'int'
+                    and self._is_integer_operand(optimized_left)):
+                shift = self._lit(value.bit_length() - 1, 'int', node.line)
+                return BinaryExprNode(optimized_left, shift_operator, shift, node.line)
+        
+        return None
     
     def visit_unary_expr(self, node: UnaryExprNode) -> ExpressionNode:
         """Optimize unary expression"""
-        optimized_operand = node.operand.accept(self)
+        optimized_operand = self._visit(node.operand)
         
         # Constant folding
-        if isinstance(optimized_operand, LiteralExprNode):
+        if type(optimized_operand) is LiteralExprNode:
             try:
                 result = self._fold_unary_constant(node.operator, optimized_operand.value)
-                return LiteralExprNode(result, optimized_operand.literal_type, node.line)
+                self.changed = True
+                return self._lit(result, optimized_operand.literal_type, node.line)
             except:
                 pass  # Fall back to non-optimized version
         
-        return UnaryExprNode(node.operator, optimized_operand, node.line)
+        node.operand = optimized_operand
+        return node
     
     def visit_postfix_expr(self, node: PostfixExprNode) -> PostfixExprNode:
         """Optimize postfix expression (no optimization for now)"""
-        optimized_operand = node.operand.accept(self)
-        return PostfixExprNode(optimized_operand, node.operator, node.line)
+        node.operand = self._visit(node.operand)
+        return node
 
     def visit_assignment_expr(self, node: AssignmentExprNode) -> AssignmentExprNode:
         """Optimize assignment expression"""
-        optimized_target = node.target.accept(self)
-        optimized_value = node.value.accept(self)
-        
-        return AssignmentExprNode(optimized_target, node.operator, optimized_value, node.line)
+        node.target = self._visit(node.target)
+        node.value = self._visit(node.value)
+        return node
     
     def visit_call_expr(self, node: CallExprNode) -> CallExprNode:
         """Optimize call expression"""
-        optimized_callee = node.callee.accept(self)
-        optimized_arguments = [arg.accept(self) for arg in node.arguments]
-        
-        return CallExprNode(optimized_callee, optimized_arguments, node.line)
+        node.callee = self._visit(node.callee)
+        self._visit_in_place(node.arguments)
+        return node
     
     def visit_member_expr(self, node: MemberExprNode) -> MemberExprNode:
         """Optimize member expression"""
-        optimized_object = node.object.accept(self)
+        node.object = self._visit(node.object)
         
         if node.computed and isinstance(node.property, ExpressionNode):
-            optimized_property = node.property.accept(self)
-            return MemberExprNode(optimized_object, optimized_property, node.computed, node.line)
+            node.property = self._visit(node.property)
         
-        return MemberExprNode(optimized_object, node.property, node.computed, node.line)
+        return node
     
     def visit_identifier_expr(self, node: IdentifierExprNode) -> ExpressionNode:
         """Optimize identifier expression"""
@@ -387,7 +675,8 @@ class ConstantFolder(ASTVisitor):
         if node.name in self.constants:
             value = self.constants[node.name]
             literal_type = self._get_literal_type(value)
-            return LiteralExprNode(value, literal_type, node.line)
+            self.changed = True
+            return self._lit(value, literal_type, node.line)
         
         return node
     
@@ -397,87 +686,43 @@ class ConstantFolder(ASTVisitor):
     
     def visit_array_decl(self, node: ArrayDeclNode) -> ArrayDeclNode:
         """Optimize array declaration"""
-        optimized_initializer = None
-        if node.initializer:
-            optimized_initializer = node.initializer.accept(self)
-        
-        return ArrayDeclNode(node.name, node.element_type, node.size, optimized_initializer, node.line)
+        if node.initializer is not None:
+            node.initializer = self._visit(node.initializer)
+        self._non_integer_names.add(node.name)
+        return node
     
     def visit_array_literal(self, node: ArrayLiteralNode) -> ArrayLiteralNode:
         """Optimize array literal"""
-        optimized_elements = []
-        for element in node.elements:
-            optimized_element = element.accept(self)
-            optimized_elements.append(optimized_element)
-        
-        return ArrayLiteralNode(optimized_elements, node.line)
+        self._visit_in_place(node.elements)
+        return node
+    
+    def _visit_in_place(self, expressions: List[ExpressionNode]) -> None:
+        """Optimize each expression and write it back into the same list"""
+        visit = self._visit
+        for index, expression in enumerate(expressions):
+            expressions[index] = visit(expression)
     
     def visit_array_access(self, node: ArrayAccessNode) -> ArrayAccessNode:
         """Optimize array access"""
-        optimized_array = node.array.accept(self)
-        optimized_index = node.index.accept(self)
-        
-        return ArrayAccessNode(optimized_array, optimized_index, node.line)
+        node.array = self._visit(node.array)
+        node.index = self._visit(node.index)
+        return node
 
     def _fold_binary_constants(self, left: Any, op: str, right: Any) -> Any:
         """Fold binary constants"""
-        if op == '+':
-            return left + right
-        elif op == '-':
-            return left - right
-        elif op == '*':
-            return left * right
-        elif op == '/':
-            if right == 0:
-                raise OptimizationError("Division by zero")
-            return left / right
-        elif op == '%':
-            if right == 0:
-                raise OptimizationError("Modulo by zero")
-            return left % right
-        elif op == '==':
-            return 1 if left == right else 0
-        elif op == '!=':
-            return 1 if left != right else 0
-        elif op == '<':
-            return 1 if left < right else 0
-        elif op == '<=':
-            return 1 if left <= right else 0
-        elif op == '>':
-            return 1 if left > right else 0
-        elif op == '>=':
-            return 1 if left >= right else 0
-        elif op == '&&':
-            return 1 if left and right else 0
-        elif op == '||':
-            return 1 if left or right else 0
-        elif op == '&':
-            return left & right
-        elif op == '|':
-            return left | right
-        elif op == '^':
-            return left ^ right
-        else:
+        fold = _BINARY_FOLDS.get(op)
+        if fold is None:
             raise OptimizationError(f"Unknown binary operator: {op}")
+        if right == 0 and op in _ZERO_DIVISORS:
+            raise OptimizationError(_ZERO_DIVISORS[op])
+        return fold(left, right)
     
     def _fold_unary_constant(self, op: str, operand: Any) -> Any:
         """Fold unary constants"""
-        if op == '+':
-            return +operand
-        elif op == '-':
-            return -operand
-        elif op == '!':
-            return 1 if not operand else 0
-        elif op == '~':
-            return ~operand
-        else:
+        fold = _UNARY_FOLDS.get(op)
+        if fold is None:
             raise OptimizationError(f"Unknown unary operator: {op}")
-    
-    def _is_truthy(self, value: Any) -> bool:
-        """Check if value is truthy"""
-        if isinstance(value, (int, float)):
-            return value != 0
-        return bool(value)
+        return fold(operand)
     
     def _get_result_type(self, left_type: str, right_type: str) -> str:
         """Get result type for binary operation"""
@@ -502,227 +747,45 @@ class ConstantFolder(ASTVisitor):
 
     def visit_message_send(self, node: MessageSendNode) -> MessageSendNode:
         """Optimize message send expression"""
-        optimized_payload = node.payload.accept(self)
-        return MessageSendNode(node.channel, optimized_payload, node.line)
+        node.payload = self._visit(node.payload)
+        return node
 
     def visit_message_recv(self, node: MessageRecvNode) -> MessageRecvNode:
         """Message receive expressions don't need optimization"""
         # Optimize timeout if present
-        optimized_timeout = None
         if node.timeout:
-            optimized_timeout = node.timeout.accept(self)
-        return MessageRecvNode(node.channel, optimized_timeout, node.line)
-
-    def visit_include_stmt(self, node: IncludeStmtNode) -> IncludeStmtNode:
-        """Import statements don't need optimization"""
-        return node
-
-class DeadCodeEliminator(ASTVisitor):
-    def visit_pointer_type(self, node: PointerTypeNode) -> PointerTypeNode:
-        return node
-
-    def visit_pointer_decl(self, node: PointerDeclNode) -> PointerDeclNode:
-        return node
-
-    def visit_address_of(self, node: AddressOfNode) -> AddressOfNode:
+            node.timeout = self._visit(node.timeout)
         return node
 
-    def visit_dereference(self, node: DereferenceNode) -> DereferenceNode:
-        return node
-
-    def visit_cast_expr(self, node: CastExprNode) -> CastExprNode:
-        return node
-    
-    def visit_sizeof_expr(self, node: SizeOfExprNode) -> SizeOfExprNode:
-        """Sizeof expressions are always reachable (they're compile-time constants)"""
-        return node
-    """Dead code elimination optimizer"""
-    
-    def __init__(self):
-        self.reachable_code = True
-    
-    def visit_program(self, node: ProgramNode) -> ProgramNode:
-        """Eliminate dead code in program"""
-        optimized_declarations = []
-        
-        for decl in node.declarations:
-            optimized_decl = decl.accept(self)
-            if optimized_decl:
-                optimized_declarations.append(optimized_decl)
-        
-        return ProgramNode(optimized_declarations, node.line)
-    
-    def visit_function_decl(self, node: FunctionDeclNode) -> FunctionDeclNode:
-        """Eliminate dead code in function"""
-        self.reachable_code = True
-        optimized_body = node.body.accept(self)
-        
-        return FunctionDeclNode(node.name, node.return_type, node.parameters, 
-                              optimized_body, node.line)
-    
-    def visit_struct_decl(self, node: StructDeclNode) -> StructDeclNode:
-        """Struct declarations are always reachable"""
-        return node
-    
-    def visit_union_decl(self, node: UnionDeclNode) -> UnionDeclNode:
-        """Union declarations are always reachable"""
-        return node
-
-    def visit_variable_decl(self, node: VariableDeclNode) -> VariableDeclNode:
-        """Variable declarations are always reachable"""
-        return node
-    
-    def visit_primitive_type(self, node: PrimitiveTypeNode) -> PrimitiveTypeNode:
-        return node
-    
-    def visit_struct_type(self, node: StructTypeNode) -> StructTypeNode:
-        return node
-    
-    def visit_union_type(self, node: UnionTypeNode) -> UnionTypeNode:
-        return node
-    
-    def visit_array_type(self, node: ArrayTypeNode) -> ArrayTypeNode:
-        return node
-    
-    def visit_block_stmt(self, node: BlockStmtNode) -> BlockStmtNode:
-        """Eliminate dead code in block"""
-        optimized_statements = []
-        
-        for stmt in node.statements:
-            if not self.reachable_code:
-                break  # Skip unreachable code
-            
-            optimized_stmt = stmt.accept(self)
-            if optimized_stmt:
-                optimized_statements.append(optimized_stmt)
-        
-        return BlockStmtNode(optimized_statements, node.line)
-    
-    def visit_expression_stmt(self, node: ExpressionStmtNode) -> ExpressionStmtNode:
-        """Expression statements are reachable if we're in reachable code"""
-        if not self.reachable_code:
-            return None
-        
-        return node
-    
-    def visit_if_stmt(self, node: IfStmtNode) -> IfStmtNode:
-        """If statements don't affect reachability"""
-        if not self.reachable_code:
-            return None
-        
-        return node
-    
-    def visit_while_stmt(self, node: WhileStmtNode) -> WhileStmtNode:
-        """While statements don't affect reachability"""
-        if not self.reachable_code:
-            return None
-        
-        return node
-    
-    def visit_for_stmt(self, node: ForStmtNode) -> ForStmtNode:
-        """For statements don't affect reachability"""
-        if not self.reachable_code:
-            return None
-        
-        return node
-    
-    def visit_return_stmt(self, node: ReturnStmtNode) -> ReturnStmtNode:
-        """Return statements make subsequent code unreachable"""
-        if not self.reachable_code:
-            return None
-        
-        self.reachable_code = False
-        return node
-    
-    def visit_break_stmt(self, node: BreakStmtNode) -> BreakStmtNode:
-        """Break statements make subsequent code unreachable"""
-        if not self.reachable_code:
-            return None
-        
-        self.reachable_code = False
-        return node
-    
-    def visit_continue_stmt(self, node: ContinueStmtNode) -> ContinueStmtNode:
-        """Continue statements make subsequent code unreachable"""
-        if not self.reachable_code:
-            return None
-        
-        self.reachable_code = False
-        return node
-    
-    def visit_binary_expr(self, node: BinaryExprNode) -> BinaryExprNode:
-        return node
-    
-    def visit_unary_expr(self, node: UnaryExprNode) -> UnaryExprNode:
-        return node
-    
-    def visit_postfix_expr(self, node: PostfixExprNode) -> PostfixExprNode:
-        return node
-
-    def visit_assignment_expr(self, node: AssignmentExprNode) -> AssignmentExprNode:
-        return node
-    
-    def visit_call_expr(self, node: CallExprNode) -> CallExprNode:
-        return node
-    
-    def visit_member_expr(self, node: MemberExprNode) -> MemberExprNode:
-        return node
-    
-    def visit_identifier_expr(self, node: IdentifierExprNode) -> IdentifierExprNode:
-        return node
-    
-    def visit_literal_expr(self, node: LiteralExprNode) -> LiteralExprNode:
-        return node
-
-    def visit_message_decl(self, node: MessageDeclNode) -> MessageDeclNode:
-        """Message declarations are always needed"""
-        return node
-
-    def visit_message_send(self, node: MessageSendNode) -> MessageSendNode:
-        """Message send expressions are always needed (have side effects)"""
-        optimized_payload = node.payload.accept(self)
-        return MessageSendNode(node.channel, optimized_payload, node.line)
-
-    def visit_message_recv(self, node: MessageRecvNode) -> MessageRecvNode:
-        """Message receive expressions are always needed (have side effects)"""
-        # Optimize timeout if present
-        optimized_timeout = None
-        if node.timeout:
-            optimized_timeout = node.timeout.accept(self)
-        return MessageRecvNode(node.channel, optimized_timeout, node.line)
-
     def visit_include_stmt(self, node: IncludeStmtNode) -> IncludeStmtNode:
-        """Import statements are always needed"""
-        return node
-    
-    def visit_array_decl(self, node: ArrayDeclNode) -> ArrayDeclNode:
-        """Array declarations are always reachable"""
+        """Import statements don't need optimization"""
         return node
-    
-    def visit_array_literal(self, node: ArrayLiteralNode) -> ArrayLiteralNode:
-        """Array literals are always reachable"""
-        optimized_elements = []
-        for element in node.elements:
-            optimized_element = element.accept(self)
-            optimized_elements.append(optimized_element)
-        
-        return ArrayLiteralNode(optimized_elements, node.line)
-    
-    def visit_array_access(self, node: ArrayAccessNode) -> ArrayAccessNode:
-        """Array access is always reachable"""
-        optimized_array = node.array.accept(self)
-        optimized_index = node.index.accept(self)
-        
-        return ArrayAccessNode(optimized_array, optimized_index, node.line)
 
 class Optimizer:
     """Main optimizer class"""
     
-    def __init__(self):
-        self.passes = [
-            ConstantFolder(),
-            DeadCodeEliminator(),
-        ]
+    def __init__(self, struct_layout_table: Optional[StructLayoutTable] = None,
+                 symbol_table: Optional[Dict] = None):
+        # Forwarded to the folder so sizeof can see layouts and variable
+        # types that were resolved before optimization
+        self.struct_layout_table = struct_layout_table
+        self.symbol_table = symbol_table
+        self._passes: Optional[List[ConstantFolder]] = None
+    
+    @property
+    def passes(self) -> List[ConstantFolder]:
+        """Optimization passes, built on first use unless a caller set them"""
+        if self._passes is None:
+            # ConstantFolder also drops unreachable statements, so a single pass
+            # covers dead-code elimination too
+            self._passes = [
+                ConstantFolder(self.struct_layout_table, self.symbol_table),
+            ]
+        return self._passes
+    
+    @passes.setter
+    def passes(self, passes: List[ConstantFolder]):
+        self._passes = passes
     
     def optimize(self, ast: ProgramNode) -> ProgramNode:
         """Apply optimization passes"""
@@ -730,7 +793,12 @@ class Optimizer:
         
         for pass_optimizer in self.passes:
             try:
-                optimized_ast = optimized_ast.accept(pass_optimizer)
+                # Re-run passes that report changes until they reach a fixed point
+                for _ in range(MAX_FOLD_PASSES):
+                    pass_optimizer.changed = False
+                    optimized_ast = optimized_ast.accept(pass_optimizer)
+                    if not pass_optimizer.changed:
+                        break
             except OptimizationError as e:
                 print(f"Optimization warning: {e}")
                 # Continue with unoptimized version
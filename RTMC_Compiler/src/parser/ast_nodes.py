@@ -3,12 +3,12 @@ Abstract Syntax Tree (AST) nodes for RT-Micro-C language
 Defines the structure of parsed code.
 """
 
+import sys
 from abc import ABC, abstractmethod
-from typing import List, Optional, Any, Dict
-from dataclasses import dataclass
-from enum import Enum, auto
+from typing import List, Optional, Any, Dict, Callable
+from enum import IntEnum, auto
 
-class NodeType(Enum):
+class NodeType(IntEnum):
     """AST node types"""
     # Program structure
     PROGRAM        = auto()
@@ -56,30 +56,76 @@ class NodeType(Enum):
     ARRAY_TYPE     = auto()
     POINTER_TYPE   = auto()  # Pointer type
 
-class ASTNode(ABC):
+class ASTNode:
     """Base class for all AST nodes"""
     
-    def __init__(self, node_type: NodeType, line: int = 0, column: int = 0, filename: str = ""):
-        self.node_type = node_type
+    __slots__ = ('line', 'column', 'filename')
+    
+    # Set once per concrete class rather than stored on every instance
+    node_type: NodeType
+    
+    def __init__(self, line: int = 0, column: int = 0, filename: str = ""):
         self.line = line
         self.column = column  # Enhanced line tracking for better debug info
         self.filename = filename
     
-    @abstractmethod
+    # Not an ABC: ABCMeta's isinstance hook would tax every node type check
     def accept(self, visitor):
         """Accept a visitor (visitor pattern)"""
-        pass
+        raise NotImplementedError(f"{self.__class__.__name__} does not implement accept()")
     
     def __repr__(self):
-        return f"{self.__class__.__name__}({self.__dict__})"
+        # Deliberately shallow: reprs of whole trees get huge and show up
+        # unasked in logs and assertion failures; use full_repr() to debug
+        return f"<{self.__class__.__name__} line={self.line}>"
+    
+    def full_repr(self) -> str:
+        """Complete multi-line dump of this node and its children"""
+        return ast_to_string(self)
+
+# Slot names per node class, collected once across the MRO
+_slot_names_cache: Dict[type, tuple] = {}
+
+def _slot_names(cls: type) -> tuple:
+    slot_names = _slot_names_cache.get(cls)
+    if slot_names is None:
+        slot_names = tuple(name for klass in reversed(cls.__mro__)
+                           for name in getattr(klass, '__slots__', ()))
+        _slot_names_cache[cls] = slot_names
+    return slot_names
+
+def node_fields(node: ASTNode) -> Dict[str, Any]:
+    """Return a node's attributes, whether stored in __slots__ or __dict__"""
+    slot_names = _slot_names(type(node))
+    
+    # node_type lives on the class but still leads the listing
+    node_type = getattr(node, 'node_type', None)
+    fields = {} if node_type is None else {'node_type': node_type}
+    fields.update((name, getattr(node, name)) for name in slot_names if hasattr(node, name))
+    fields.update(getattr(node, '__dict__', {}))
+    return fields
+
+def child_nodes(node: ASTNode) -> List[ASTNode]:
+    """Return the AST nodes held directly by node, alone or in a list/tuple field"""
+    children = []
+    for name in _slot_names(type(node)):
+        value = getattr(node, name, None)
+        if isinstance(value, ASTNode):
+            children.append(value)
+        elif isinstance(value, (list, tuple)):
+            children.extend(item for item in value if isinstance(item, ASTNode))
+    return children
 
 # Program structure nodes
 
 class ProgramNode(ASTNode):
     """Root node of the AST"""
     
+    __slots__ = ('declarations',)
+    node_type = NodeType.PROGRAM
+    
     def __init__(self, declarations: List[ASTNode], line: int = 0, filename: str = ""):
-        super().__init__(NodeType.PROGRAM, line, filename=filename)
+        super().__init__(line, filename=filename)
         self.declarations = declarations
     
     def accept(self, visitor):
@@ -88,9 +134,12 @@ class ProgramNode(ASTNode):
 class FunctionDeclNode(ASTNode):
     """Function declaration node"""
     
+    __slots__ = ('name', 'return_type', 'parameters', 'body')
+    node_type = NodeType.FUNCTION_DECL
+    
     def __init__(self, name: str, return_type: 'TypeNode', parameters: List['ParameterNode'], 
                  body: 'BlockStmtNode', line: int = 0, filename: str = ""):
-        super().__init__(NodeType.FUNCTION_DECL, line, filename=filename)
+        super().__init__(line, filename=filename)
         self.name = name
         self.return_type = return_type
         self.parameters = parameters
@@ -99,36 +148,92 @@ class FunctionDeclNode(ASTNode):
     def accept(self, visitor):
         return visitor.visit_function_decl(self)
 
-@dataclass
 class ParameterNode:
     """Function parameter"""
-    name: str
-    type: 'TypeNode'
-    line: int = 0
+    
+    __slots__ = ('name', 'type', 'line')
+    
+    def __init__(self, name: str, type: 'TypeNode', line: int = 0):
+        self.name = name
+        self.type = type
+        self.line = line
+    
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.name, self.type, self.line) == (other.name, other.type, other.line)
+    
+    __hash__ = None
+    
+    def __repr__(self):
+        return f"{self.__class__.__name__}({node_fields(self)})"
+
+class _FieldOffsets:
+    """Field offset lookup shared by struct and union declarations.
+    
+    Offsets are kept as parallel name/offset lists; most declarations have
+    only a handful of fields, where a linear scan beats hashing. Larger ones
+    get a dict index, built on first lookup.
+    """
+    
+    __slots__ = ()
+    
+    _INDEX_THRESHOLD = 16
+    
+    def set_field_offsets(self, names: List[str], offsets: List[int]):
+        """Record the laid-out offset of every field"""
+        self._field_names = names
+        self._field_offsets = offsets
+        self._offset_index = None
+    
+    def offset_of(self, name: str) -> int:
+        """Byte offset of field name; raises KeyError if there is none"""
+        names = self._field_names
+        if len(names) <= self._INDEX_THRESHOLD:
+            try:
+                return self._field_offsets[names.index(name)]
+            except ValueError:
+                raise KeyError(name) from None
+        if self._offset_index is None:
+            self._offset_index = dict(zip(names, self._field_offsets))
+        return self._offset_index[name]
+    
+    @property
+    def field_offsets(self) -> Dict[str, int]:
+        """Dict mapping field_name -> offset"""
+        return dict(zip(self._field_names, self._field_offsets))
 
-class StructDeclNode(ASTNode):
+class StructDeclNode(_FieldOffsets, ASTNode):
     """Structure declaration node"""
     
+    __slots__ = ('name', 'fields', 'base_struct', 'total_size',
+                 '_field_names', '_field_offsets', '_offset_index')
+    node_type = NodeType.STRUCT_DECL
+    
     def __init__(self, name: str, fields: List['FieldNode'], base_struct, line: int = 0, column: int = 0, filename: str = ""):
-        super().__init__(NodeType.STRUCT_DECL, line, column, filename)
+        super().__init__(line, column, filename)
         self.name = name
         self.fields = fields
         self.base_struct = base_struct
         self.total_size = 0      # Computed size during semantic analysis
-        self.field_offsets = {}  # Dict mapping field_name -> offset
+        self.set_field_offsets((), ())
     
     def accept(self, visitor):
         return visitor.visit_struct_decl(self)
 
-class UnionDeclNode(ASTNode):
+class UnionDeclNode(_FieldOffsets, ASTNode):
     """Union declaration node"""
     
+    __slots__ = ('name', 'fields', 'total_size',
+                 '_field_names', '_field_offsets', '_offset_index')
+    node_type = NodeType.UNION_DECL
+    
     def __init__(self, name: str, fields: List['FieldNode'], line: int = 0, column: int = 0, filename: str = ""):
-        super().__init__(NodeType.UNION_DECL, line, column, filename)
+        super().__init__(line, column, filename)
         self.name = name
         self.fields = fields
         self.total_size = 0      # Computed size during semantic analysis (max of all field sizes)
-        self.field_offsets = {}  # Dict mapping field_name -> offset (all start at 0 for unions)
+        self.set_field_offsets((), ())  # All offsets are 0 for unions
     
     def accept(self, visitor):
         return visitor.visit_union_decl(self)
@@ -136,8 +241,11 @@ class UnionDeclNode(ASTNode):
 class MessageDeclNode(ASTNode):
     """Message queue declaration node for RT-Micro-C"""
     
+    __slots__ = ('name', 'message_type')
+    node_type = NodeType.MESSAGE_DECL
+    
     def __init__(self, name: str, message_type: 'TypeNode', line: int = 0):
-        super().__init__(NodeType.MESSAGE_DECL, line)
+        super().__init__(line)
         self.name = name
         self.message_type = message_type
     
@@ -147,10 +255,13 @@ class MessageDeclNode(ASTNode):
 class ArrayDeclNode(ASTNode):
     """Array declaration node for fixed-length arrays"""
     
+    __slots__ = ('name', 'element_type', 'size', 'initializer', 'union_group', 'bit_width')
+    node_type = NodeType.ARRAY_DECL
+    
     def __init__(self, name: str, element_type: 'TypeNode', size: int, 
                  initializer: Optional['ExpressionNode'] = None, line: int = 0,
                  union_group: Optional[str] = None, bit_width: Optional[int] = None):
-        super().__init__(NodeType.ARRAY_DECL, line)
+        super().__init__(line)
         self.name = name
         self.element_type = element_type
         self.size = size
@@ -161,9 +272,12 @@ class ArrayDeclNode(ASTNode):
     def accept(self, visitor):
         return visitor.visit_array_decl(self)
 
-@dataclass
 class FieldNode:
     """Structure field with support for nested structs and bit-fields"""
+    
+    __slots__ = ('name', 'type', 'bit_width', 'offset', 'bit_offset', 'size', 'initializer',
+                 'is_base_struct', 'union_group', 'line', 'column')
+    
     def __init__(self, name: str, type: 'TypeNode', bit_width: Optional[int] = None, 
                  offset: Optional[int] = None, initializer: Optional['ExpressionNode'] = None, 
                  line: int = 0, column: int = 0, union_group: Optional[str] = None):
@@ -178,14 +292,20 @@ class FieldNode:
         self.union_group = union_group  # Identifier for union grouping (fields with same group overlap)
         self.line = line
         self.column = column
+    
+    def __repr__(self):
+        return f"{self.__class__.__name__}({node_fields(self)})"
 
 class VariableDeclNode(ASTNode):
     """Variable declaration node"""
     
+    __slots__ = ('name', 'type', 'initializer', 'is_const', 'union_group', 'bit_width')
+    node_type = NodeType.VARIABLE_DECL
+    
     def __init__(self, name: str, type: 'TypeNode', initializer: Optional['ExpressionNode'] = None, 
                  is_const: bool = False, line: int = 0, column: int = 0, filename: str = "",
                  union_group: Optional[str] = None, bit_width: Optional[int] = None):
-        super().__init__(NodeType.VARIABLE_DECL, line, column, filename)
+        super().__init__(line, column, filename)
         self.name = name
         self.type = type
         self.initializer = initializer
@@ -200,14 +320,17 @@ class VariableDeclNode(ASTNode):
 
 class TypeNode(ASTNode):
     """Base class for type nodes"""
-    pass
+    __slots__ = ()
 
 class PrimitiveTypeNode(TypeNode):
     """Primitive type node (int, float, char, void)"""
     
+    __slots__ = ('type_name',)
+    node_type = NodeType.PRIMITIVE_TYPE
+    
     def __init__(self, type_name: str, line: int = 0):
-        super().__init__(NodeType.PRIMITIVE_TYPE, line)
-        self.type_name = type_name
+        super().__init__(line)
+        self.type_name = sys.intern(type_name)
     
     def accept(self, visitor):
         return visitor.visit_primitive_type(self)
@@ -215,8 +338,11 @@ class PrimitiveTypeNode(TypeNode):
 class StructTypeNode(TypeNode):
     """Structure type node"""
     
+    __slots__ = ('struct_name',)
+    node_type = NodeType.STRUCT_TYPE
+    
     def __init__(self, struct_name: str, line: int = 0):
-        super().__init__(NodeType.STRUCT_TYPE, line)
+        super().__init__(line)
         self.struct_name = struct_name
     
     def accept(self, visitor):
@@ -225,8 +351,11 @@ class StructTypeNode(TypeNode):
 class UnionTypeNode(TypeNode):
     """Union type node"""
     
+    __slots__ = ('union_name',)
+    node_type = NodeType.UNION_TYPE
+    
     def __init__(self, union_name: str, line: int = 0):
-        super().__init__(NodeType.UNION_TYPE, line)
+        super().__init__(line)
         self.union_name = union_name
     
     def accept(self, visitor):
@@ -235,8 +364,11 @@ class UnionTypeNode(TypeNode):
 class ArrayTypeNode(TypeNode):
     """Array type node"""
     
+    __slots__ = ('element_type', 'size')
+    node_type = NodeType.ARRAY_TYPE
+    
     def __init__(self, element_type: TypeNode, size: Optional[int] = None, line: int = 0, column: int = 0):
-        super().__init__(NodeType.ARRAY_TYPE, line, column)
+        super().__init__(line, column)
         self.element_type = element_type
         self.size = size
     
@@ -246,8 +378,11 @@ class ArrayTypeNode(TypeNode):
 class PointerTypeNode(TypeNode):
     """Pointer type node"""
     
+    __slots__ = ('base_type', 'pointer_level')
+    node_type = NodeType.POINTER_TYPE
+    
     def __init__(self, base_type: TypeNode, pointer_level: int = 1, line: int = 0, column: int = 0):
-        super().__init__(NodeType.POINTER_TYPE, line, column)
+        super().__init__(line, column)
         self.base_type = base_type
         self.pointer_level = pointer_level  # 1 = *, 2 = ** etc.
     
@@ -258,13 +393,16 @@ class PointerTypeNode(TypeNode):
 
 class StatementNode(ASTNode):
     """Base class for statement nodes"""
-    pass
+    __slots__ = ()
 
 class BlockStmtNode(StatementNode):
     """Block statement node"""
     
+    __slots__ = ('statements',)
+    node_type = NodeType.BLOCK_STMT
+    
     def __init__(self, statements: List[StatementNode], line: int = 0):
-        super().__init__(NodeType.BLOCK_STMT, line)
+        super().__init__(line)
         self.statements = statements
     
     def accept(self, visitor):
@@ -273,8 +411,11 @@ class BlockStmtNode(StatementNode):
 class ExpressionStmtNode(StatementNode):
     """Expression statement node"""
     
+    __slots__ = ('expression',)
+    node_type = NodeType.EXPRESSION_STMT
+    
     def __init__(self, expression: 'ExpressionNode', line: int = 0):
-        super().__init__(NodeType.EXPRESSION_STMT, line)
+        super().__init__(line)
         self.expression = expression
     
     def accept(self, visitor):
@@ -283,9 +424,12 @@ class ExpressionStmtNode(StatementNode):
 class IfStmtNode(StatementNode):
     """If statement node"""
     
+    __slots__ = ('condition', 'then_stmt', 'else_stmt')
+    node_type = NodeType.IF_STMT
+    
     def __init__(self, condition: 'ExpressionNode', then_stmt: StatementNode, 
                  else_stmt: Optional[StatementNode] = None, line: int = 0):
-        super().__init__(NodeType.IF_STMT, line)
+        super().__init__(line)
         self.condition = condition
         self.then_stmt = then_stmt
         self.else_stmt = else_stmt
@@ -296,8 +440,11 @@ class IfStmtNode(StatementNode):
 class WhileStmtNode(StatementNode):
     """While statement node"""
     
+    __slots__ = ('condition', 'body')
+    node_type = NodeType.WHILE_STMT
+    
     def __init__(self, condition: 'ExpressionNode', body: StatementNode, line: int = 0):
-        super().__init__(NodeType.WHILE_STMT, line)
+        super().__init__(line)
         self.condition = condition
         self.body = body
     
@@ -307,9 +454,12 @@ class WhileStmtNode(StatementNode):
 class ForStmtNode(StatementNode):
     """For statement node"""
     
+    __slots__ = ('init', 'condition', 'update', 'body')
+    node_type = NodeType.FOR_STMT
+    
     def __init__(self, init: Optional[StatementNode], condition: Optional['ExpressionNode'], 
                  update: Optional['ExpressionNode'], body: StatementNode, line: int = 0):
-        super().__init__(NodeType.FOR_STMT, line)
+        super().__init__(line)
         self.init = init
         self.condition = condition
         self.update = update
@@ -321,8 +471,11 @@ class ForStmtNode(StatementNode):
 class ReturnStmtNode(StatementNode):
     """Return statement node"""
     
+    __slots__ = ('value',)
+    node_type = NodeType.RETURN_STMT
+    
     def __init__(self, value: Optional['ExpressionNode'] = None, line: int = 0):
-        super().__init__(NodeType.RETURN_STMT, line)
+        super().__init__(line)
         self.value = value
     
     def accept(self, visitor):
@@ -331,8 +484,11 @@ class ReturnStmtNode(StatementNode):
 class BreakStmtNode(StatementNode):
     """Break statement node"""
     
+    __slots__ = ()
+    node_type = NodeType.BREAK_STMT
+    
     def __init__(self, line: int = 0):
-        super().__init__(NodeType.BREAK_STMT, line)
+        super().__init__(line)
     
     def accept(self, visitor):
         return visitor.visit_break_stmt(self)
@@ -340,8 +496,11 @@ class BreakStmtNode(StatementNode):
 class ContinueStmtNode(StatementNode):
     """Continue statement node"""
     
+    __slots__ = ()
+    node_type = NodeType.CONTINUE_STMT
+    
     def __init__(self, line: int = 0):
-        super().__init__(NodeType.CONTINUE_STMT, line)
+        super().__init__(line)
     
     def accept(self, visitor):
         return visitor.visit_continue_stmt(self)
@@ -349,26 +508,32 @@ class ContinueStmtNode(StatementNode):
 class IncludeStmtNode(StatementNode):
     """Include statement node"""
     
+    __slots__ = ('filepath',)
+    node_type = NodeType.INCLUDE_STMT
+    
     def __init__(self, filepath: str, line: int = 0):
-        super().__init__(NodeType.INCLUDE_STMT, line)
+        super().__init__(line)
         self.filepath = filepath
     
     def accept(self, visitor):
-        return visitor.visit_inlcude_stmt(self)
+        return visitor.visit_include_stmt(self)
 
 # Expression nodes
 
 class ExpressionNode(ASTNode):
     """Base class for expression nodes"""
-    pass
+    __slots__ = ()
 
 class BinaryExprNode(ExpressionNode):
     """Binary expression node"""
     
+    __slots__ = ('left', 'operator', 'right')
+    node_type = NodeType.BINARY_EXPR
+    
     def __init__(self, left: ExpressionNode, operator: str, right: ExpressionNode, line: int = 0):
-        super().__init__(NodeType.BINARY_EXPR, line)
+        super().__init__(line)
         self.left = left
-        self.operator = operator
+        self.operator = sys.intern(operator)
         self.right = right
     
     def accept(self, visitor):
@@ -377,9 +542,12 @@ class BinaryExprNode(ExpressionNode):
 class UnaryExprNode(ExpressionNode):
     """Unary expression node"""
     
+    __slots__ = ('operator', 'operand')
+    node_type = NodeType.UNARY_EXPR
+    
     def __init__(self, operator: str, operand: ExpressionNode, line: int = 0):
-        super().__init__(NodeType.UNARY_EXPR, line)
-        self.operator = operator
+        super().__init__(line)
+        self.operator = sys.intern(operator)
         self.operand = operand
     
     def accept(self, visitor):
@@ -388,10 +556,13 @@ class UnaryExprNode(ExpressionNode):
 class PostfixExprNode(ExpressionNode):
     """Postfix expression node (++ and --)"""
     
+    __slots__ = ('operand', 'operator')
+    node_type = NodeType.POSTFIX_EXPR
+    
     def __init__(self, operand: ExpressionNode, operator: str, line: int = 0):
-        super().__init__(NodeType.POSTFIX_EXPR, line)
+        super().__init__(line)
         self.operand = operand
-        self.operator = operator  # "++" or "--"
+        self.operator = sys.intern(operator)  # "++" or "--"
     
     def accept(self, visitor):
         return visitor.visit_postfix_expr(self)
@@ -399,10 +570,13 @@ class PostfixExprNode(ExpressionNode):
 class AssignmentExprNode(ExpressionNode):
     """Assignment expression node"""
     
+    __slots__ = ('target', 'operator', 'value')
+    node_type = NodeType.ASSIGNMENT_EXPR
+    
     def __init__(self, target: ExpressionNode, operator: str, value: ExpressionNode, line: int = 0):
-        super().__init__(NodeType.ASSIGNMENT_EXPR, line)
+        super().__init__(line)
         self.target = target
-        self.operator = operator
+        self.operator = sys.intern(operator)
         self.value = value
     
     def accept(self, visitor):
@@ -411,8 +585,11 @@ class AssignmentExprNode(ExpressionNode):
 class CallExprNode(ExpressionNode):
     """Function call expression node"""
     
+    __slots__ = ('callee', 'arguments')
+    node_type = NodeType.CALL_EXPR
+    
     def __init__(self, callee: ExpressionNode, arguments: List[ExpressionNode], line: int = 0):
-        super().__init__(NodeType.CALL_EXPR, line)
+        super().__init__(line)
         self.callee = callee
         self.arguments = arguments
     
@@ -422,8 +599,11 @@ class CallExprNode(ExpressionNode):
 class MemberExprNode(ExpressionNode):
     """Member access expression node"""
     
+    __slots__ = ('object', 'property', 'computed')
+    node_type = NodeType.MEMBER_EXPR
+    
     def __init__(self, object: ExpressionNode, property: str, computed: bool = False, line: int = 0):
-        super().__init__(NodeType.MEMBER_EXPR, line)
+        super().__init__(line)
         self.object = object
         self.property = property
         self.computed = computed  # True for array[index], False for struct.field
@@ -434,8 +614,11 @@ class MemberExprNode(ExpressionNode):
 class IdentifierExprNode(ExpressionNode):
     """Identifier expression node"""
     
+    __slots__ = ('name',)
+    node_type = NodeType.IDENTIFIER_EXPR
+    
     def __init__(self, name: str, line: int = 0, filename: str = ""):
-        super().__init__(NodeType.IDENTIFIER_EXPR, line, filename=filename)
+        super().__init__(line, filename=filename)
         self.name = name
     
     def accept(self, visitor):
@@ -444,8 +627,11 @@ class IdentifierExprNode(ExpressionNode):
 class LiteralExprNode(ExpressionNode):
     """Literal expression node"""
     
+    __slots__ = ('value', 'literal_type')
+    node_type = NodeType.LITERAL_EXPR
+    
     def __init__(self, value: Any, literal_type: str, line: int = 0):
-        super().__init__(NodeType.LITERAL_EXPR, line)
+        super().__init__(line)
         self.value = value
         self.literal_type = literal_type  # 'int', 'float', 'string', 'char'
     
@@ -455,8 +641,11 @@ class LiteralExprNode(ExpressionNode):
 class ArrayLiteralNode(ExpressionNode):
     """Array literal expression node for initializer lists"""
     
+    __slots__ = ('elements',)
+    node_type = NodeType.ARRAY_LITERAL
+    
     def __init__(self, elements: List[ExpressionNode], line: int = 0):
-        super().__init__(NodeType.ARRAY_LITERAL, line)
+        super().__init__(line)
         self.elements = elements
     
     def accept(self, visitor):
@@ -465,8 +654,11 @@ class ArrayLiteralNode(ExpressionNode):
 class ArrayAccessNode(ExpressionNode):
     """Array access expression node for indexed access"""
     
+    __slots__ = ('array', 'index')
+    node_type = NodeType.ARRAY_ACCESS
+    
     def __init__(self, array: ExpressionNode, index: ExpressionNode, line: int = 0):
-        super().__init__(NodeType.ARRAY_ACCESS, line)
+        super().__init__(line)
         self.array = array
         self.index = index
     
@@ -476,8 +668,11 @@ class ArrayAccessNode(ExpressionNode):
 class MessageSendNode(ExpressionNode):
     """Message send expression node"""
     
+    __slots__ = ('channel', 'payload')
+    node_type = NodeType.MESSAGE_SEND
+    
     def __init__(self, channel: str, payload: ExpressionNode, line: int = 0):
-        super().__init__(NodeType.MESSAGE_SEND, line)
+        super().__init__(line)
         self.channel = channel
         self.payload = payload
     
@@ -487,8 +682,11 @@ class MessageSendNode(ExpressionNode):
 class MessageRecvNode(ExpressionNode):
     """Message receive expression node"""
     
+    __slots__ = ('channel', 'timeout')
+    node_type = NodeType.MESSAGE_RECV
+    
     def __init__(self, channel: str, timeout: Optional['ExpressionNode'] = None, line: int = 0, column: int = 0):
-        super().__init__(NodeType.MESSAGE_RECV, line, column)
+        super().__init__(line, column)
         self.channel = channel
         self.timeout = timeout  # Optional timeout expression
     
@@ -498,8 +696,11 @@ class MessageRecvNode(ExpressionNode):
 class AddressOfNode(ExpressionNode):
     """Address-of expression node (&variable)"""
     
+    __slots__ = ('operand',)
+    node_type = NodeType.ADDRESS_OF
+    
     def __init__(self, operand: ExpressionNode, line: int = 0, column: int = 0):
-        super().__init__(NodeType.ADDRESS_OF, line, column)
+        super().__init__(line, column)
         self.operand = operand
     
     def accept(self, visitor):
@@ -508,8 +709,11 @@ class AddressOfNode(ExpressionNode):
 class DereferenceNode(ExpressionNode):
     """Dereference expression node (*pointer)"""
     
+    __slots__ = ('operand',)
+    node_type = NodeType.DEREFERENCE
+    
     def __init__(self, operand: ExpressionNode, line: int = 0, column: int = 0):
-        super().__init__(NodeType.DEREFERENCE, line, column)
+        super().__init__(line, column)
         self.operand = operand
     
     def accept(self, visitor):
@@ -518,8 +722,11 @@ class DereferenceNode(ExpressionNode):
 class CastExprNode(ExpressionNode):
     """Cast expression node (type)expression"""
     
+    __slots__ = ('target_type', 'operand')
+    node_type = NodeType.CAST_EXPR
+    
     def __init__(self, target_type: 'TypeNode', operand: ExpressionNode, line: int = 0, column: int = 0):
-        super().__init__(NodeType.CAST_EXPR, line, column)
+        super().__init__(line, column)
         self.target_type = target_type
         self.operand = operand
     
@@ -529,8 +736,11 @@ class CastExprNode(ExpressionNode):
 class SizeOfExprNode(ExpressionNode):
     """Sizeof expression node"""
     
+    __slots__ = ('target',)
+    node_type = NodeType.SIZEOF_EXPR
+    
     def __init__(self, target, line: int = 0, column: int = 0):
-        super().__init__(NodeType.SIZEOF_EXPR, line, column)
+        super().__init__(line, column)
         self.target = target  # Can be a TypeNode, IdentifierExprNode, or other expression
     
     def accept(self, visitor):
@@ -539,13 +749,15 @@ class SizeOfExprNode(ExpressionNode):
 class PointerDeclNode(VariableDeclNode):
     """Pointer declaration node"""
     
+    __slots__ = ('base_type', 'pointer_level')
+    node_type = NodeType.POINTER_DECL
+    
     def __init__(self, name: str, base_type: 'TypeNode', pointer_level: int = 1,
                  initializer: Optional['ExpressionNode'] = None, 
                  is_const: bool = False, line: int = 0, column: int = 0, filename: str = ""):
         # Create pointer type for the base class
         pointer_type = PointerTypeNode(base_type, pointer_level, line, column)
         super().__init__(name, pointer_type, initializer, is_const, line, column, filename)
-        self.node_type = NodeType.POINTER_DECL
         self.base_type = base_type
         self.pointer_level = pointer_level
     
@@ -557,6 +769,19 @@ class PointerDeclNode(VariableDeclNode):
 class ASTVisitor(ABC):
     """Abstract base class for AST visitors"""
     
+    __slots__ = ('_dispatch',)
+    
+    def __init__(self):
+        # Node class -> bound visitor method; anything else falls back to accept()
+        self._dispatch: Dict[type, Callable] = build_dispatch(self)
+    
+    def _visit(self, node: ASTNode):
+        """Dispatch to the visitor method for node's class without going through accept()"""
+        handler = self._dispatch.get(type(node))
+        if handler is None:
+            return node.accept(self)
+        return handler(node)
+    
     @abstractmethod
     def visit_program(self, node: ProgramNode): pass
     
@@ -641,6 +866,9 @@ class ASTVisitor(ABC):
     @abstractmethod
     def visit_unary_expr(self, node: UnaryExprNode): pass
     
+    @abstractmethod
+    def visit_postfix_expr(self, node: PostfixExprNode): pass
+    
     @abstractmethod
     def visit_assignment_expr(self, node: AssignmentExprNode): pass
     
@@ -670,184 +898,529 @@ class ASTVisitor(ABC):
 
 # Utility functions
 
+# Primitive type nodes are immutable and carry nothing but their name, so
+# every occurrence of e.g. 'int' shares one node; types can then be compared
+# with `is`. Shared nodes have no meaningful line.
+_PRIMITIVE_TYPES: Dict[str, PrimitiveTypeNode] = {}
+
+def primitive_type(type_name: str) -> PrimitiveTypeNode:
+    node = _PRIMITIVE_TYPES.get(type_name)
+    if node is None:
+        node = _PRIMITIVE_TYPES[type_name] = PrimitiveTypeNode(type_name)
+    return node
+
+# Fast constructors for the node types the parser builds most often. They
+# fill the slots directly and skip the __init__ chain; the result is the same
+# as calling the class.
+
+def mk_ident(name: str, line: int = 0, filename: str = "") -> IdentifierExprNode:
+    n = object.__new__(IdentifierExprNode)
+    n.line = line
+    n.column = 0
+    n.filename = filename
+    n.name = name
+    return n
+
+def mk_literal(value: Any, literal_type: str, line: int = 0) -> LiteralExprNode:
+    n = object.__new__(LiteralExprNode)
+    n.line = line
+    n.column = 0
+    n.filename = ""
+    n.value = value
+    n.literal_type = literal_type
+    return n
+
+def mk_binary(left: ExpressionNode, operator: str, right: ExpressionNode, line: int = 0) -> BinaryExprNode:
+    n = object.__new__(BinaryExprNode)
+    n.line = line
+    n.column = 0
+    n.filename = ""
+    n.left = left
+    n.operator = sys.intern(operator)
+    n.right = right
+    return n
+
+def mk_member(object_: ExpressionNode, property: str, computed: bool = False, line: int = 0) -> MemberExprNode:
+    n = object.__new__(MemberExprNode)
+    n.line = line
+    n.column = 0
+    n.filename = ""
+    n.object = object_
+    n.property = property
+    n.computed = computed
+    return n
+
+def mk_call(callee: ExpressionNode, arguments: List[ExpressionNode], line: int = 0) -> CallExprNode:
+    n = object.__new__(CallExprNode)
+    n.line = line
+    n.column = 0
+    n.filename = ""
+    n.callee = callee
+    n.arguments = arguments
+    return n
+
+# Visitor method each node class's accept() calls, for visitors that dispatch
+# through a per-instance table instead of double dispatch
+VISIT_METHODS: Dict[type, str] = {
+    ProgramNode: 'visit_program',
+    FunctionDeclNode: 'visit_function_decl',
+    StructDeclNode: 'visit_struct_decl',
+    UnionDeclNode: 'visit_union_decl',
+    MessageDeclNode: 'visit_message_decl',
+    ArrayDeclNode: 'visit_array_decl',
+    VariableDeclNode: 'visit_variable_decl',
+    PointerDeclNode: 'visit_pointer_decl',
+    PrimitiveTypeNode: 'visit_primitive_type',
+    StructTypeNode: 'visit_struct_type',
+    UnionTypeNode: 'visit_union_type',
+    ArrayTypeNode: 'visit_array_type',
+    PointerTypeNode: 'visit_pointer_type',
+    BlockStmtNode: 'visit_block_stmt',
+    ExpressionStmtNode: 'visit_expression_stmt',
+    IfStmtNode: 'visit_if_stmt',
+    WhileStmtNode: 'visit_while_stmt',
+    ForStmtNode: 'visit_for_stmt',
+    ReturnStmtNode: 'visit_return_stmt',
+    BreakStmtNode: 'visit_break_stmt',
+    ContinueStmtNode: 'visit_continue_stmt',
+    IncludeStmtNode: 'visit_include_stmt',
+    BinaryExprNode: 'visit_binary_expr',
+    UnaryExprNode: 'visit_unary_expr',
+    PostfixExprNode: 'visit_postfix_expr',
+    AssignmentExprNode: 'visit_assignment_expr',
+    CallExprNode: 'visit_call_expr',
+    MemberExprNode: 'visit_member_expr',
+    IdentifierExprNode: 'visit_identifier_expr',
+    LiteralExprNode: 'visit_literal_expr',
+    ArrayLiteralNode: 'visit_array_literal',
+    ArrayAccessNode: 'visit_array_access',
+    MessageSendNode: 'visit_message_send',
+    MessageRecvNode: 'visit_message_recv',
+    AddressOfNode: 'visit_address_of',
+    DereferenceNode: 'visit_dereference',
+    CastExprNode: 'visit_cast_expr',
+    SizeOfExprNode: 'visit_sizeof_expr',
+}
+
+def build_dispatch(visitor) -> Dict[type, Callable]:
+    """Bind visitor's methods per node class; classes it does not handle are left out"""
+    dispatch = {}
+    for node_class, method_name in VISIT_METHODS.items():
+        method = getattr(visitor, method_name, None)
+        if method is not None:
+            dispatch[node_class] = method
+    return dispatch
+
 def ast_to_string(node: ASTNode, indent: int = 0) -> str:
     """Convert AST to string representation"""
-    indent_str = "  " * indent
-    
-    if isinstance(node, ProgramNode):
-        result = f"{indent_str}Program:\n"
-        for decl in node.declarations:
-            result += ast_to_string(decl, indent + 1)
-        return result
-    
-    elif isinstance(node, FunctionDeclNode):
-        result = f"{indent_str}FunctionDecl: {node.name}\n"
-        result += f"{indent_str}  ReturnType: {ast_to_string(node.return_type, 0).strip()}\n"
-        if node.parameters:
-            result += f"{indent_str}  Parameters:\n"
-            for param in node.parameters:
-                result += f"{indent_str}    {param.name}: {ast_to_string(param.type, 0).strip()}\n"
-        result += f"{indent_str}  Body:\n{ast_to_string(node.body, indent + 2)}"
-        return result
-    
-    elif isinstance(node, StructDeclNode):
-        result = f"{indent_str}StructDecl: {node.name}\n"
-        for field in node.fields:
-            bit_info = f":{field.bit_width}" if field.bit_width else ""
-            result += f"{indent_str}  {field.name}: {ast_to_string(field.type, 0).strip()}{bit_info}\n"
-        return result
-    
-    elif isinstance(node, UnionDeclNode):
-        result = f"{indent_str}UnionDecl: {node.name}\n"
-        for field in node.fields:
-            result += f"{indent_str}  {field.name}: {ast_to_string(field.type, 0).strip()}\n"
-        return result
-    
-    elif isinstance(node, MessageDeclNode):
-        return f"{indent_str}MessageDecl: {node.name}: {ast_to_string(node.message_type, 0).strip()}\n"
-    
-    elif isinstance(node, VariableDeclNode):
-        const_str = "const " if node.is_const else ""
-        init_str = f" = {ast_to_string(node.initializer, 0).strip()}" if node.initializer else ""
-        return f"{indent_str}VariableDecl: {const_str}{node.name}: {ast_to_string(node.type, 0).strip()}{init_str}\n"
-    
-    elif isinstance(node, ArrayDeclNode):
-        init_str = f" = {ast_to_string(node.initializer, 0).strip()}" if node.initializer else ""
-        return f"{indent_str}ArrayDecl: {node.name}: {ast_to_string(node.element_type, 0).strip()}[{node.size}]{init_str}\n"
-    
-    elif isinstance(node, PrimitiveTypeNode):
-        return f"{node.type_name}"
-    
-    elif isinstance(node, StructTypeNode):
-        return f"struct {node.struct_name}"
-    
-    elif isinstance(node, UnionTypeNode):
-        return f"union {node.union_name}"
-    
-    elif isinstance(node, ArrayTypeNode):
-        size_str = f"[{node.size}]" if node.size else "[]"
-        return f"{ast_to_string(node.element_type, 0).strip()}{size_str}"
-    
-    elif isinstance(node, PointerTypeNode):
-        stars = "*" * node.pointer_level
-        return f"{ast_to_string(node.base_type, 0).strip()}{stars}"
-    
-    elif isinstance(node, PointerDeclNode):
-        stars = "*" * node.pointer_level
-        const_str = "const " if node.is_const else ""
-        init_str = f" = {ast_to_string(node.initializer, 0).strip()}" if node.initializer else ""
-        return f"{indent_str}PointerDecl: {const_str}{ast_to_string(node.base_type, 0).strip()}{stars} {node.name}{init_str}\n"
-    
-    elif isinstance(node, AddressOfNode):
-        return f"{indent_str}AddressOf:\n{ast_to_string(node.operand, indent + 1)}"
-    
-    elif isinstance(node, DereferenceNode):
-        return f"{indent_str}Dereference:\n{ast_to_string(node.operand, indent + 1)}"
-    
-    elif isinstance(node, SizeOfExprNode):
-        return f"{indent_str}SizeOf:\n{ast_to_string(node.target, indent + 1)}"
-    
-    elif isinstance(node, BlockStmtNode):
-        result = f"{indent_str}Block:\n"
-        for stmt in node.statements:
-            result += ast_to_string(stmt, indent + 1)
-        return result
-    
-    elif isinstance(node, ExpressionStmtNode):
-        return f"{indent_str}ExpressionStmt:\n{ast_to_string(node.expression, indent + 1)}"
-    
-    elif isinstance(node, IfStmtNode):
-        result = f"{indent_str}If:\n"
-        result += f"{indent_str}  Condition:\n{ast_to_string(node.condition, indent + 2)}"
-        result += f"{indent_str}  Then:\n{ast_to_string(node.then_stmt, indent + 2)}"
-        if node.else_stmt:
-            result += f"{indent_str}  Else:\n{ast_to_string(node.else_stmt, indent + 2)}"
-        return result
-    
-    elif isinstance(node, WhileStmtNode):
-        result = f"{indent_str}While:\n"
-        result += f"{indent_str}  Condition:\n{ast_to_string(node.condition, indent + 2)}"
-        result += f"{indent_str}  Body:\n{ast_to_string(node.body, indent + 2)}"
-        return result
-    
-    elif isinstance(node, ForStmtNode):
-        result = f"{indent_str}For:\n"
-        if node.init:
-            result += f"{indent_str}  Init:\n{ast_to_string(node.init, indent + 2)}"
-        if node.condition:
-            result += f"{indent_str}  Condition:\n{ast_to_string(node.condition, indent + 2)}"
-        if node.update:
-            result += f"{indent_str}  Update:\n{ast_to_string(node.update, indent + 2)}"
-        result += f"{indent_str}  Body:\n{ast_to_string(node.body, indent + 2)}"
-        return result
-    
-    elif isinstance(node, ReturnStmtNode):
-        result = f"{indent_str}Return:\n"
-        if node.value:
-            result += ast_to_string(node.value, indent + 1)
-        return result
-    
-    elif isinstance(node, BreakStmtNode):
-        return f"{indent_str}Break\n"
-    
-    elif isinstance(node, ContinueStmtNode):
-        return f"{indent_str}Continue\n"
-    
-    elif isinstance(node, BinaryExprNode):
-        result = f"{indent_str}BinaryExpr: {node.operator}\n"
-        result += f"{indent_str}  Left:\n{ast_to_string(node.left, indent + 2)}"
-        result += f"{indent_str}  Right:\n{ast_to_string(node.right, indent + 2)}"
-        return result
-    
-    elif isinstance(node, UnaryExprNode):
-        result = f"{indent_str}UnaryExpr: {node.operator}\n"
-        result += f"{indent_str}  Operand:\n{ast_to_string(node.operand, indent + 2)}"
-        return result
-    
-    elif isinstance(node, AssignmentExprNode):
-        result = f"{indent_str}AssignmentExpr: {node.operator}\n"
-        result += f"{indent_str}  Target:\n{ast_to_string(node.target, indent + 2)}"
-        result += f"{indent_str}  Value:\n{ast_to_string(node.value, indent + 2)}"
-        return result
-    
-    elif isinstance(node, CallExprNode):
-        result = f"{indent_str}CallExpr:\n"
-        result += f"{indent_str}  Callee:\n{ast_to_string(node.callee, indent + 2)}"
-        if node.arguments:
-            result += f"{indent_str}  Arguments:\n"
-            for arg in node.arguments:
-                result += ast_to_string(arg, indent + 2)
-        return result
-    
-    elif isinstance(node, MemberExprNode):
-        access_type = "[]" if node.computed else "."
-        result = f"{indent_str}MemberExpr: {access_type}{node.property}\n"
-        result += f"{indent_str}  Object:\n{ast_to_string(node.object, indent + 2)}"
-        return result
-    
-    elif isinstance(node, IdentifierExprNode):
-        return f"{indent_str}Identifier: {node.name}\n"
-    
-    elif isinstance(node, LiteralExprNode):
-        return f"{indent_str}Literal: {node.value} ({node.literal_type})\n"
-    
-    elif isinstance(node, ArrayLiteralNode):
-        result = f"{indent_str}ArrayLiteral:\n"
-        for i, element in enumerate(node.elements):
-            result += f"{indent_str}  [{i}]: {ast_to_string(element, indent + 2).strip()}\n"
-        return result
-    
-    elif isinstance(node, ArrayAccessNode):
-        result = f"{indent_str}ArrayAccess:\n"
-        result += f"{indent_str}  Array:\n{ast_to_string(node.array, indent + 2)}"
-        result += f"{indent_str}  Index:\n{ast_to_string(node.index, indent + 2)}"
-        return result
-    
-    elif isinstance(node, MessageSendNode):
-        return f"{indent_str}MessageSend: {node.channel}\n  Payload:\n{ast_to_string(node.payload, indent + 2)}"
-    
-    elif isinstance(node, MessageRecvNode):
-        return f"{indent_str}MessageRecv: {node.channel}\n"
-    
+    return _dump(node, indent, {})
+
+def _dump(node: ASTNode, indent: int, memo: Dict[tuple, str]) -> str:
+    """Format one subtree, reusing text already produced for the same node and indent"""
+    # Nodes can be shared within a tree (e.g. interned literals), but the tree
+    # may be mutated between ast_to_string calls, so the memo is per call
+    key = (id(node), indent)
+    text = memo.get(key)
+    if text is None:
+        dump = _AST_DUMPERS.get(getattr(node, 'node_type', None))
+        if dump is None:
+            text = f"{_indent(indent)}{node.__class__.__name__}: {_inline_fields(node)}\n"
+        else:
+            text = dump(node, indent, memo)
+        memo[key] = text
+    return text
+
+def _inline_fields(node) -> str:
+    """Single-line form of a node's fields, expanding child nodes in full"""
+    return "{" + ", ".join(f"{name!r}: {_inline(value)}" for name, value in node_fields(node).items()) + "}"
+
+def _inline(value: Any) -> str:
+    """Single-line form of a field value; node reprs are shallow, so nodes are expanded here"""
+    if isinstance(value, (ASTNode, FieldNode, ParameterNode)):
+        return f"{value.__class__.__name__}({_inline_fields(value)})"
+    if isinstance(value, list):
+        return "[" + ", ".join(map(_inline, value)) + "]"
+    if isinstance(value, tuple) and value:
+        items = ", ".join(map(_inline, value))
+        return f"({items},)" if len(value) == 1 else f"({items})"
+    return repr(value)
+
+def _text(value: Any) -> str:
+    """Like str(), but child nodes are expanded rather than shown by their shallow repr"""
+    if isinstance(value, (ASTNode, FieldNode, ParameterNode)):
+        return _inline(value)
+    return str(value)
+
+# Indentation prefixes for the usual nesting depths, built once. Each binary
+# operator adds a level, so long expression chains run deeper than statements.
+_CACHED_INDENT_DEPTH = 128
+_INDENTS = tuple("  " * depth for depth in range(_CACHED_INDENT_DEPTH))
+
+def _indent(indent: int) -> str:
+    """Indentation prefix for a nesting depth"""
+    if indent < _CACHED_INDENT_DEPTH:
+        return _INDENTS[indent]
+    return "  " * indent
+
+# Per-node-type formatters for ast_to_string
+
+def _dump_program(node: ProgramNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    parts = [f"{indent_str}Program:\n"]
+    for decl in node.declarations:
+        parts.append(_dump(decl, indent + 1, memo))
+    return "".join(parts)
+
+def _dump_function_decl(node: FunctionDeclNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    parts = [f"{indent_str}FunctionDecl: {node.name}\n"]
+    parts.append(f"{indent_str}  ReturnType: {_dump(node.return_type, 0, memo).strip()}\n")
+    if node.parameters:
+        parts.append(f"{indent_str}  Parameters:\n")
+        for param in node.parameters:
+            parts.append(f"{indent_str}    {param.name}: {_dump(param.type, 0, memo).strip()}\n")
+    parts.append(f"{indent_str}  Body:\n{_dump(node.body, indent + 2, memo)}")
+    return "".join(parts)
+
+def _dump_struct_decl(node: StructDeclNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    parts = [f"{indent_str}StructDecl: {node.name}\n"]
+    for field in node.fields:
+        bit_info = f":{field.bit_width}" if field.bit_width else ""
+        parts.append(f"{indent_str}  {field.name}: {_dump(field.type, 0, memo).strip()}{bit_info}\n")
+    return "".join(parts)
+
+def _dump_union_decl(node: UnionDeclNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    parts = [f"{indent_str}UnionDecl: {node.name}\n"]
+    for field in node.fields:
+        parts.append(f"{indent_str}  {field.name}: {_dump(field.type, 0, memo).strip()}\n")
+    return "".join(parts)
+
+def _dump_message_decl(node: MessageDeclNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    return f"{indent_str}MessageDecl: {node.name}: {_dump(node.message_type, 0, memo).strip()}\n"
+
+def _dump_variable_decl(node: VariableDeclNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    const_str = "const " if node.is_const else ""
+    init_str = f" = {_dump(node.initializer, 0, memo).strip()}" if node.initializer else ""
+    return f"{indent_str}VariableDecl: {const_str}{node.name}: {_dump(node.type, 0, memo).strip()}{init_str}\n"
+
+def _dump_array_decl(node: ArrayDeclNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    init_str = f" = {_dump(node.initializer, 0, memo).strip()}" if node.initializer else ""
+    return f"{indent_str}ArrayDecl: {node.name}: {_dump(node.element_type, 0, memo).strip()}[{_text(node.size)}]{init_str}\n"
+
+def _dump_primitive_type(node: PrimitiveTypeNode, indent: int, memo: Dict[tuple, str]) -> str:
+    return f"{node.type_name}"
+
+def _dump_struct_type(node: StructTypeNode, indent: int, memo: Dict[tuple, str]) -> str:
+    return f"struct {node.struct_name}"
+
+def _dump_union_type(node: UnionTypeNode, indent: int, memo: Dict[tuple, str]) -> str:
+    return f"union {node.union_name}"
+
+def _dump_array_type(node: ArrayTypeNode, indent: int, memo: Dict[tuple, str]) -> str:
+    size_str = f"[{_text(node.size)}]" if node.size else "[]"
+    return f"{_dump(node.element_type, 0, memo).strip()}{size_str}"
+
+def _dump_pointer_type(node: PointerTypeNode, indent: int, memo: Dict[tuple, str]) -> str:
+    stars = "*" * node.pointer_level
+    return f"{_dump(node.base_type, 0, memo).strip()}{stars}"
+
+def _dump_address_of(node: AddressOfNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    return f"{indent_str}AddressOf:\n{_dump(node.operand, indent + 1, memo)}"
+
+def _dump_dereference(node: DereferenceNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    return f"{indent_str}Dereference:\n{_dump(node.operand, indent + 1, memo)}"
+
+def _dump_sizeof_expr(node: SizeOfExprNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    return f"{indent_str}SizeOf:\n{_dump(node.target, indent + 1, memo)}"
+
+def _dump_block_stmt(node: BlockStmtNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    parts = [f"{indent_str}Block:\n"]
+    for stmt in node.statements:
+        parts.append(_dump(stmt, indent + 1, memo))
+    return "".join(parts)
+
+def _dump_expression_stmt(node: ExpressionStmtNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    return f"{indent_str}ExpressionStmt:\n{_dump(node.expression, indent + 1, memo)}"
+
+def _dump_if_stmt(node: IfStmtNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    parts = [f"{indent_str}If:\n"]
+    parts.append(f"{indent_str}  Condition:\n{_dump(node.condition, indent + 2, memo)}")
+    parts.append(f"{indent_str}  Then:\n{_dump(node.then_stmt, indent + 2, memo)}")
+    if node.else_stmt:
+        parts.append(f"{indent_str}  Else:\n{_dump(node.else_stmt, indent + 2, memo)}")
+    return "".join(parts)
+
+def _dump_while_stmt(node: WhileStmtNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    parts = [f"{indent_str}While:\n"]
+    parts.append(f"{indent_str}  Condition:\n{_dump(node.condition, indent + 2, memo)}")
+    parts.append(f"{indent_str}  Body:\n{_dump(node.body, indent + 2, memo)}")
+    return "".join(parts)
+
+def _dump_for_stmt(node: ForStmtNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    parts = [f"{indent_str}For:\n"]
+    if node.init:
+        parts.append(f"{indent_str}  Init:\n{_dump(node.init, indent + 2, memo)}")
+    if node.condition:
+        parts.append(f"{indent_str}  Condition:\n{_dump(node.condition, indent + 2, memo)}")
+    if node.update:
+        parts.append(f"{indent_str}  Update:\n{_dump(node.update, indent + 2, memo)}")
+    parts.append(f"{indent_str}  Body:\n{_dump(node.body, indent + 2, memo)}")
+    return "".join(parts)
+
+def _dump_return_stmt(node: ReturnStmtNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    parts = [f"{indent_str}Return:\n"]
+    if node.value:
+        parts.append(_dump(node.value, indent + 1, memo))
+    return "".join(parts)
+
+def _dump_break_stmt(node: BreakStmtNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    return f"{indent_str}Break\n"
+
+def _dump_continue_stmt(node: ContinueStmtNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    return f"{indent_str}Continue\n"
+
+def _dump_binary_expr(node: BinaryExprNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    parts = [f"{indent_str}BinaryExpr: {node.operator}\n"]
+    parts.append(f"{indent_str}  Left:\n{_dump(node.left, indent + 2, memo)}")
+    parts.append(f"{indent_str}  Right:\n{_dump(node.right, indent + 2, memo)}")
+    return "".join(parts)
+
+def _dump_unary_expr(node: UnaryExprNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    parts = [f"{indent_str}UnaryExpr: {node.operator}\n"]
+    parts.append(f"{indent_str}  Operand:\n{_dump(node.operand, indent + 2, memo)}")
+    return "".join(parts)
+
+def _dump_assignment_expr(node: AssignmentExprNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    parts = [f"{indent_str}AssignmentExpr: {node.operator}\n"]
+    parts.append(f"{indent_str}  Target:\n{_dump(node.target, indent + 2, memo)}")
+    parts.append(f"{indent_str}  Value:\n{_dump(node.value, indent + 2, memo)}")
+    return "".join(parts)
+
+def _dump_call_expr(node: CallExprNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    parts = [f"{indent_str}CallExpr:\n"]
+    parts.append(f"{indent_str}  Callee:\n{_dump(node.callee, indent + 2, memo)}")
+    if node.arguments:
+        parts.append(f"{indent_str}  Arguments:\n")
+        for arg in node.arguments:
+            parts.append(_dump(arg, indent + 2, memo))
+    return "".join(parts)
+
+def _dump_member_expr(node: MemberExprNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    access_type = "[]" if node.computed else "."
+    parts = [f"{indent_str}MemberExpr: {access_type}{node.property}\n"]
+    parts.append(f"{indent_str}  Object:\n{_dump(node.object, indent + 2, memo)}")
+    return "".join(parts)
+
+def _dump_identifier_expr(node: IdentifierExprNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    return f"{indent_str}Identifier: {node.name}\n"
+
+def _dump_literal_expr(node: LiteralExprNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    return f"{indent_str}Literal: {node.value} ({node.literal_type})\n"
+
+def _dump_array_literal(node: ArrayLiteralNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    parts = [f"{indent_str}ArrayLiteral:\n"]
+    for i, element in enumerate(node.elements):
+        parts.append(f"{indent_str}  [{i}]: {_dump(element, indent + 2, memo).strip()}\n")
+    return "".join(parts)
+
+def _dump_array_access(node: ArrayAccessNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    parts = [f"{indent_str}ArrayAccess:\n"]
+    parts.append(f"{indent_str}  Array:\n{_dump(node.array, indent + 2, memo)}")
+    parts.append(f"{indent_str}  Index:\n{_dump(node.index, indent + 2, memo)}")
+    return "".join(parts)
+
+def _dump_message_send(node: MessageSendNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    return f"{indent_str}MessageSend: {_text(node.channel)}\n  Payload:\n{_dump(node.payload, indent + 2, memo)}"
+
+def _dump_message_recv(node: MessageRecvNode, indent: int, memo: Dict[tuple, str]) -> str:
+    indent_str = _indent(indent)
+    return f"{indent_str}MessageRecv: {_text(node.channel)}\n"
+
+# Node type -> formatter, one dict probe per node instead of an isinstance chain
+_AST_DUMPERS: Dict[NodeType, Callable[[Any, int, Dict[tuple, str]], str]] = {
+    NodeType.PROGRAM: _dump_program,
+    NodeType.FUNCTION_DECL: _dump_function_decl,
+    NodeType.STRUCT_DECL: _dump_struct_decl,
+    NodeType.UNION_DECL: _dump_union_decl,
+    NodeType.MESSAGE_DECL: _dump_message_decl,
+    NodeType.VARIABLE_DECL: _dump_variable_decl,
+    NodeType.POINTER_DECL: _dump_variable_decl,  # Pointer types print through the type
+    NodeType.ARRAY_DECL: _dump_array_decl,
+    NodeType.PRIMITIVE_TYPE: _dump_primitive_type,
+    NodeType.STRUCT_TYPE: _dump_struct_type,
+    NodeType.UNION_TYPE: _dump_union_type,
+    NodeType.ARRAY_TYPE: _dump_array_type,
+    NodeType.POINTER_TYPE: _dump_pointer_type,
+    NodeType.ADDRESS_OF: _dump_address_of,
+    NodeType.DEREFERENCE: _dump_dereference,
+    NodeType.SIZEOF_EXPR: _dump_sizeof_expr,
+    NodeType.BLOCK_STMT: _dump_block_stmt,
+    NodeType.EXPRESSION_STMT: _dump_expression_stmt,
+    NodeType.IF_STMT: _dump_if_stmt,
+    NodeType.WHILE_STMT: _dump_while_stmt,
+    NodeType.FOR_STMT: _dump_for_stmt,
+    NodeType.RETURN_STMT: _dump_return_stmt,
+    NodeType.BREAK_STMT: _dump_break_stmt,
+    NodeType.CONTINUE_STMT: _dump_continue_stmt,
+    NodeType.BINARY_EXPR: _dump_binary_expr,
+    NodeType.UNARY_EXPR: _dump_unary_expr,
+    NodeType.ASSIGNMENT_EXPR: _dump_assignment_expr,
+    NodeType.CALL_EXPR: _dump_call_expr,
+    NodeType.MEMBER_EXPR: _dump_member_expr,
+    NodeType.IDENTIFIER_EXPR: _dump_identifier_expr,
+    NodeType.LITERAL_EXPR: _dump_literal_expr,
+    NodeType.ARRAY_LITERAL: _dump_array_literal,
+    NodeType.ARRAY_ACCESS: _dump_array_access,
+    NodeType.MESSAGE_SEND: _dump_message_send,
+    NodeType.MESSAGE_RECV: _dump_message_recv,
+}
+
+def ast_canonical(node: ASTNode) -> str:
+    """Compact single-line form of a tree, for keying caches or diffing ASTs.
+    
+    Unlike ast_to_string there is no indentation or labelling, and source
+    positions are left out, so equal trees give equal strings.
+    """
+    out = []
+    _canon(node, out.append)
+    return "".join(out)
+
+def _canon(node: Any, write: Callable[[str], Any]) -> None:
+    writer = _CANONICAL_WRITERS.get(getattr(node, 'node_type', None))
+    if writer is not None:
+        writer(node, write)
+    elif isinstance(node, (ASTNode, FieldNode, ParameterNode)):
+        # Everything else: Class(field=value,...) without the position fields
+        write(node.__class__.__name__)
+        write('(')
+        for name, value in node_fields(node).items():
+            if name not in _UNCANONICAL_FIELDS and not name.startswith('_'):
+                write(name)
+                write('=')
+                _canon(value, write)
+                write(',')
+        write(')')
+    elif isinstance(node, (list, tuple)):
+        write('[')
+        for item in node:
+            _canon(item, write)
+            write(',')
+        write(']')
+    else:
+        write(repr(node))
+
+# Positions, plus union_group: drawn from a parser-global counter, so it
+# depends on how many anonymous aggregates were parsed before
+_UNCANONICAL_FIELDS = frozenset(('node_type', 'line', 'column', 'filename', 'union_group'))
+
+def _canon_literal(node: LiteralExprNode, write: Callable[[str], Any]) -> None:
+    write(repr(node.value))
+    if node.literal_type not in ('int', 'float'):
+        write(':')
+        write(node.literal_type)
+
+def _canon_binary(node: BinaryExprNode, write: Callable[[str], Any]) -> None:
+    write('(')
+    _canon(node.left, write)
+    write(node.operator)
+    _canon(node.right, write)
+    write(')')
+
+def _canon_unary(node: UnaryExprNode, write: Callable[[str], Any]) -> None:
+    write('(')
+    write(node.operator)
+    _canon(node.operand, write)
+    write(')')
+
+def _canon_postfix(node: PostfixExprNode, write: Callable[[str], Any]) -> None:
+    write('(')
+    _canon(node.operand, write)
+    write(node.operator)
+    write(')')
+
+def _canon_assignment(node: AssignmentExprNode, write: Callable[[str], Any]) -> None:
+    write('(')
+    _canon(node.target, write)
+    write(node.operator)
+    _canon(node.value, write)
+    write(')')
+
+def _canon_call(node: CallExprNode, write: Callable[[str], Any]) -> None:
+    _canon(node.callee, write)
+    write('(')
+    for argument in node.arguments:
+        _canon(argument, write)
+        write(',')
+    write(')')
+
+def _canon_member(node: MemberExprNode, write: Callable[[str], Any]) -> None:
+    _canon(node.object, write)
+    if node.computed:
+        write('[')
+        _canon(node.property, write)
+        write(']')
     else:
-        return f"{indent_str}{node.__class__.__name__}: {node.__dict__}\n"
+        write('.')
+        write(node.property)
+
+def _canon_array_access(node: ArrayAccessNode, write: Callable[[str], Any]) -> None:
+    _canon(node.array, write)
+    write('[')
+    _canon(node.index, write)
+    write(']')
+
+def _canon_pointer_type(node: PointerTypeNode, write: Callable[[str], Any]) -> None:
+    _canon(node.base_type, write)
+    write('*' * node.pointer_level)
+
+def _canon_array_type(node: ArrayTypeNode, write: Callable[[str], Any]) -> None:
+    _canon(node.element_type, write)
+    write('[')
+    if node.size is not None:
+        _canon(node.size, write)
+    write(']')
+
+# Writers for the node types that make up most of a tree; the rest go
+# through the generic field listing in _canon
+_CANONICAL_WRITERS: Dict[NodeType, Callable[[Any, Callable[[str], Any]], None]] = {
+    NodeType.IDENTIFIER_EXPR: lambda node, write: write(node.name),
+    NodeType.LITERAL_EXPR: _canon_literal,
+    NodeType.BINARY_EXPR: _canon_binary,
+    NodeType.UNARY_EXPR: _canon_unary,
+    NodeType.POSTFIX_EXPR: _canon_postfix,
+    NodeType.ASSIGNMENT_EXPR: _canon_assignment,
+    NodeType.CALL_EXPR: _canon_call,
+    NodeType.MEMBER_EXPR: _canon_member,
+    NodeType.ARRAY_ACCESS: _canon_array_access,
+    NodeType.PRIMITIVE_TYPE: lambda node, write: write(node.type_name),
+    NodeType.STRUCT_TYPE: lambda node, write: write('struct ' + node.struct_name),
+    NodeType.UNION_TYPE: lambda node, write: write('union ' + node.union_name),
+    NodeType.POINTER_TYPE: _canon_pointer_type,
+    NodeType.ARRAY_TYPE: _canon_array_type,
+}
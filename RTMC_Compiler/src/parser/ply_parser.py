@@ -3,14 +3,77 @@ PLY-based parser for RT-Micro-C Language
 Converts tokens into an Abstract Syntax Tree (AST) using PLY.
 """
 
+import os
+import sys
+import hashlib
+import itertools
 import ply.yacc as yacc
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable
 from RTMC_Compiler.src.lexer.ply_lexer import RTMCLexer
 from RTMC_Compiler.src.parser.ast_nodes import *
 
+_PRIMITIVE_TYPE_NAMES = frozenset(('int', 'float', 'char', 'bool', 'void'))
+_AGGREGATE_PREFIXES = (('struct ', StructTypeNode), ('union ', UnionTypeNode))
+
+# Shared pointer-to-primitive type nodes by their (shared) base type
+_POINTER_TYPES: Dict[TypeNode, TypeNode] = {}
+
+# Numbers for anonymous struct/union names. Unique per process rather than per
+# parse, since declarations from included files end up in one program.
+_anonymous_ids = itertools.count(1)
+
+def _anonymous_name(kind: str) -> str:
+    """Name for an anonymous struct/union that no identifier can collide with"""
+    return f"<anon {kind} {next(_anonymous_ids)}>"
+
+def _binary_rule(grammar: str):
+    """Grammar action for one left-associative binary operator level.
+    
+    Every level reduces the same way, so they share this body and differ only
+    in the docstring PLY reads the grammar from.
+    """
+    def rule(self, p):
+        if len(p) == 2:
+            p[0] = p[1]
+        else:
+            p[0] = mk_binary(p[1], p[2], p[3], p.lineno(2))
+    rule.__doc__ = grammar
+    # PLY orders rules by this line number; keep the order of the class body
+    rule.co_firstlineno = sys._getframe(1).f_lineno
+    return rule
+
+def _group_union_fields(fields: List[FieldNode], union_group: str) -> List[FieldNode]:
+    """Put every field of an anonymous union in one overlapping group"""
+    for field in fields:
+        field.union_group = union_group
+    return fields
+
+# Token type -> node builder taking (value, line, filename), for primary expressions
+_PRIMARY_BUILDERS: Dict[str, Callable[[Any, int, str], ExpressionNode]] = {
+    'IDENTIFIER': mk_ident,
+    'INTEGER': lambda value, line, filename: mk_literal(value, 'int', line),
+    'FLOAT': lambda value, line, filename: mk_literal(value, 'float', line),
+    'STRING': lambda value, line, filename: mk_literal(value, 'string', line),
+    'CHAR': lambda value, line, filename: mk_literal(value, 'char', line),
+    'TRUE': lambda value, line, filename: mk_literal(True, 'bool', line),
+    'FALSE': lambda value, line, filename: mk_literal(False, 'bool', line),
+}
+
+# Building the LALR tables dominates parser construction, so they are pickled
+# here and reused while the grammar is unchanged. Set RTMC_NO_PARSER_CACHE to
+# always rebuild them.
+_TABLE_CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'rtmc')
+
 class RTMCParser:
     """RT-Micro-C PLY parser"""
     
+    # Cache file for the current grammar, computed on first construction
+    _table_file: Optional[str] = None
+    
+    # Set by the first construction, see __init__
+    _shared_lexer: Optional[RTMCLexer] = None
+    _shared_parser = None
+    
     # Get the token map from the lexer
     tokens = RTMCLexer.tokens
     
@@ -33,24 +96,71 @@ class RTMCParser:
     )
     
     def __init__(self):
-        self.lexer = RTMCLexer()
-        self.parser = yacc.yacc(module=self, debug=False, write_tables=False)
+        # The lexer and parser tables are built once per class and shared by
+        # every instance, so instances are cheap but must not parse concurrently.
+        # Grammar actions are bound to the first instance; per-parse state
+        # therefore lives on the PLY lexer, not on self.
+        cls = type(self)
+        if cls.__dict__.get('_shared_parser') is None:
+            cls._shared_lexer = RTMCLexer()
+            cls._shared_parser = self._build_parser()
+        self.lexer = cls._shared_lexer
+        self.parser = cls._shared_parser
+    
+    def _build_parser(self):
+        """Build the PLY parser, loading its tables from the on-disk cache when possible"""
+        if os.environ.get('RTMC_NO_PARSER_CACHE'):
+            return yacc.yacc(module=self, debug=False, write_tables=False)
+        
+        picklefile = self._get_table_file()
+        try:
+            os.makedirs(_TABLE_CACHE_DIR, exist_ok=True)
+        except OSError:
+            return yacc.yacc(module=self, debug=False, write_tables=False)
+        
+        # PLY checks the grammar signature stored in the file and rebuilds
+        # (and rewrites) the tables when it does not match
+        try:
+            return yacc.yacc(module=self, debug=False, picklefile=picklefile)
+        except Exception:
+            # Truncated or unreadable cache file; replace it
+            try:
+                os.remove(picklefile)
+            except OSError:
+                pass
+            return yacc.yacc(module=self, debug=False, picklefile=picklefile)
+    
+    @classmethod
+    def _get_table_file(cls) -> str:
+        """Cache file name, keyed by a hash of the grammar so versions do not collide"""
+        if cls._table_file is None:
+            grammar = [repr(cls.tokens), repr(cls.precedence)]
+            grammar.extend(getattr(cls, name).__doc__ or '' for name in sorted(dir(cls)) if name.startswith('p_'))
+            digest = hashlib.sha1('\n'.join(grammar).encode('utf-8')).hexdigest()[:16]
+            cls._table_file = os.path.join(_TABLE_CACHE_DIR, f'parser_{digest}.pkl')
+        return cls._table_file
     
     def _create_type_node(self, type_str: str, line) -> TypeNode:
         """Convert a type string to a proper TypeNode"""
+        # Primitive types are shared position-free nodes; struct and union
+        # nodes keep their line, which undefined-type errors report
+        if type_str in _PRIMITIVE_TYPE_NAMES:
+            return primitive_type(type_str)
+        return self._build_type_node(type_str, line)
+    
+    def _build_type_node(self, type_str: str, line) -> TypeNode:
+        """Parse a non-primitive type string into a new TypeNode"""
         if not type_str:
-            return PrimitiveTypeNode("void", line)
+            return primitive_type("void")
         
-        # Handle pointer types
+        # Handle pointer types: split off the trailing stars in one pass
+        # instead of slicing one '*' at a time
         if type_str.endswith('*'):
-            pointer_count = 0
-            base_type_str = type_str
-            while base_type_str.endswith('*'):
-                pointer_count += 1
-                base_type_str = base_type_str[:-1].strip()
+            base_type_str = type_str.rstrip('* ')
+            pointer_count = type_str.count('*', len(base_type_str))
             
             # Create base type
-            base_type = self._create_type_node(base_type_str, line)
+            base_type = self._create_type_node(base_type_str.lstrip(), line)
             
             # Wrap in pointer type
             return PointerTypeNode(base_type, pointer_count, line=line)
@@ -60,17 +170,14 @@ class RTMCParser:
             # For now, just strip const - we might need to handle this differently
             type_str = type_str[6:].strip()
         
-        # Handle struct/union types
-        if type_str.startswith('struct '):
-            struct_name = type_str[7:].strip()
-            return StructTypeNode(struct_name, line)
-        elif type_str.startswith('union '):
-            union_name = type_str[6:].strip()
-            return UnionTypeNode(union_name, line)
-        
         # Handle primitive types
-        if type_str in ['int', 'float', 'char', 'bool', 'void']:
-            return PrimitiveTypeNode(type_str, line)
+        if type_str in _PRIMITIVE_TYPE_NAMES:
+            return primitive_type(type_str)
+        
+        # Handle struct/union types
+        for prefix, node_class in _AGGREGATE_PREFIXES:
+            if type_str.startswith(prefix):
+                return node_class(type_str[len(prefix):].strip(), line)
         
         # Handle custom types (might be struct/union names)
         return StructTypeNode(type_str, line)  # Assume it's a struct for now
@@ -78,8 +185,11 @@ class RTMCParser:
     def parse(self, input_text: str, filename: str = "") -> ProgramNode:
         """Parse input text and return AST"""
         try:
-            self.filename = filename
-            result = self.parser.parse(input_text, lexer=self.lexer.lexer)
+            lexer = self.lexer.lexer
+            lexer.lineno = 1
+            # Always set, so grammar actions read p.lexer.filename directly
+            lexer.filename = filename
+            result = self.parser.parse(input_text, lexer=lexer)
             return result if result else ProgramNode([])
         except Exception as e:
             print(f"Parse error: {e}")
@@ -90,7 +200,7 @@ class RTMCParser:
         '''program : declaration_list'''
         
         line = p.lineno(1)
-        filename = getattr(self, 'filename', '')
+        filename = p.lexer.filename
         p[0] = ProgramNode(p[1], line, filename)
     
     def p_declaration_list(self, p):
@@ -99,7 +209,8 @@ class RTMCParser:
         if len(p) == 2:
             p[0] = [p[1]]
         else:
-            p[0] = p[1] + [p[2]]
+            p[1].append(p[2])
+            p[0] = p[1]
     
     def p_declaration(self, p):
         '''declaration : function_declaration
@@ -116,12 +227,12 @@ class RTMCParser:
                                | type_specifier IDENTIFIER LEFT_PAREN RIGHT_PAREN compound_statement'''
         
         line = p.lineno(2)
-        filename = getattr(self, 'filename', '')
+        filename = p.lexer.filename
         
         if len(p) == 7:
             p[0] = FunctionDeclNode(p[2], p[1], p[4], p[6], line=line, filename=filename)
         else:
-            p[0] = FunctionDeclNode(p[2], p[1], [], p[5], line=line, filename=filename)
+            p[0] = FunctionDeclNode(p[2], p[1], (), p[5], line=line, filename=filename)
     
     def p_parameter_list(self, p):
         '''parameter_list : parameter
@@ -129,7 +240,8 @@ class RTMCParser:
         if len(p) == 2:
             p[0] = [p[1]]
         else:
-            p[0] = p[1] + [p[3]]
+            p[1].append(p[3])
+            p[0] = p[1]
     
     def p_parameter(self, p):
         '''parameter : type_specifier IDENTIFIER
@@ -170,7 +282,7 @@ class RTMCParser:
                              | STRUCT LEFT_BRACE struct_member_list RIGHT_BRACE SEMICOLON'''
         
         line = p.lineno(1)
-        filename = getattr(self, 'filename', '')
+        filename = p.lexer.filename
 
         if len(p) == 7:
             p[0] = StructDeclNode(p[2], p[4], None, line=line, filename=filename)
@@ -178,9 +290,8 @@ class RTMCParser:
             p[0] = StructDeclNode(p[2], p[6], p[4], line=line, filename=filename)
         else:
             # Anonymous struct - generate a unique struct name
-            import uuid
-            struct_id = f"struct_{uuid.uuid4().hex[:8]}"
-            p[0] = StructDeclNode(struct_id, p[4], line=line, filename=filename)
+            struct_id = _anonymous_name("struct")
+            p[0] = StructDeclNode(struct_id, p[3], None, line=line, filename=filename)
 
     
     def p_struct_member_list(self, p):
@@ -193,13 +304,12 @@ class RTMCParser:
             else:
                 p[0] = [p[1]]
         else:
-            # Combine existing list with new member(s)
-            result = p[1][:]  # Create a copy to avoid modifying the original
+            # Extend the list in place; it is only ever referenced from here
             if isinstance(p[2], list):
-                result.extend(p[2])
+                p[1].extend(p[2])
             else:
-                result.append(p[2])
-            p[0] = result
+                p[1].append(p[2])
+            p[0] = p[1]
     
     def p_struct_member(self, p):
         '''struct_member : type_specifier IDENTIFIER SEMICOLON
@@ -242,39 +352,16 @@ class RTMCParser:
     # Anonymous union declaration
     def p_anonymous_union_declaration(self, p):
         '''anonymous_union_declaration : UNION LEFT_BRACE struct_member_list RIGHT_BRACE SEMICOLON'''
-        # Generate a unique union group name
-        import uuid
-        union_group_id = f"union_{uuid.uuid4().hex[:8]}"
-        
-        # Flatten the union - mark all fields as belonging to the same union group
-        flattened_fields = []
-        for field in p[3]:
-            if isinstance(field, list):
-                # Nested anonymous struct/union
-                for subfield in field:
-                    if hasattr(subfield, 'union_group'):
-                        subfield.union_group = union_group_id
-                    flattened_fields.append(subfield)
-            else:
-                if hasattr(field, 'union_group'):
-                    field.union_group = union_group_id
-                flattened_fields.append(field)
-        
-        p[0] = flattened_fields
+        # struct_member_list is already flat; mark all fields as belonging to
+        # the same (new) union group
+        p[0] = _group_union_fields(p[3], _anonymous_name("union"))
     
     # Anonymous struct declaration
     def p_anonymous_struct_declaration(self, p):
         '''anonymous_struct_declaration : STRUCT LEFT_BRACE struct_member_list RIGHT_BRACE SEMICOLON'''
-        # For anonymous structs, we just return the fields (no union grouping)
-        flattened_fields = []
-        for field in p[3]:
-            if isinstance(field, list):
-                # Nested anonymous struct/union
-                flattened_fields.extend(field)
-            else:
-                flattened_fields.append(field)
-        
-        p[0] = flattened_fields
+        # For anonymous structs, we just return the fields (no union grouping);
+        # struct_member_list has already flattened nested anonymous members
+        p[0] = p[3]
     
     # Union declaration
     def p_union_declaration(self, p):
@@ -282,29 +369,14 @@ class RTMCParser:
                              | UNION LEFT_BRACE struct_member_list RIGHT_BRACE SEMICOLON'''
         
         line = p.lineno(1)
-        filename = getattr(self, 'filename', '')
+        filename = p.lexer.filename
         if len(p) == 7:
             p[0] = UnionDeclNode(p[2], p[4], line=line, filename=filename)
         else:
             # Anonymous union - generate a unique union group name
-            import uuid
-            union_group_id = f"union_{uuid.uuid4().hex[:8]}"
-            
-            # Flatten the union - mark all fields as belonging to the same union group
-            flattened_fields = []
-            for field in p[3]:
-                if isinstance(field, list):
-                    # Handle nested anonymous struct/union
-                    for subfield in field:
-                        if hasattr(subfield, 'union_group'):
-                            subfield.union_group = union_group_id
-                        flattened_fields.append(subfield)
-                else:
-                    if hasattr(field, 'union_group'):
-                        field.union_group = union_group_id
-                    flattened_fields.append(field)
-            
-            p[0] = UnionDeclNode(union_group_id, flattened_fields, line=line, filename=filename)
+            union_group_id = _anonymous_name("union")
+            fields = _group_union_fields(p[3], union_group_id)
+            p[0] = UnionDeclNode(union_group_id, fields, line=line, filename=filename)
     
     # Message declaration
     def p_message_declaration(self, p):
@@ -348,7 +420,14 @@ class RTMCParser:
                     base_type = self._create_type_node(p[1], line)
                 else:
                     base_type = p[1]
-                p[0] = PointerTypeNode(base_type, 1)
+                if type(base_type) is PrimitiveTypeNode:
+                    # Primitive bases are shared nodes, so their pointer types can be too
+                    pointer_type = _POINTER_TYPES.get(base_type)
+                    if pointer_type is None:
+                        pointer_type = _POINTER_TYPES[base_type] = PointerTypeNode(base_type, 1)
+                    p[0] = pointer_type
+                else:
+                    p[0] = PointerTypeNode(base_type, 1)
             else:
                 # struct/union IDENTIFIER
                 type_str = f"{p[1]} {p[2]}"
@@ -383,7 +462,8 @@ class RTMCParser:
         if len(p) == 2:
             p[0] = [p[1]]
         else:
-            p[0] = p[1] + [p[2]]
+            p[1].append(p[2])
+            p[0] = p[1]
     
     def p_expression_statement(self, p):
         '''expression_statement : expression SEMICOLON
@@ -462,103 +542,54 @@ class RTMCParser:
             line = p.lineno(1)
             p[0] = AssignmentExprNode(p[1], p[2], p[3], line=line)
     
-    def p_logical_or_expression(self, p):
+    # Binary operator levels, lowest precedence first; they share one action
+    p_logical_or_expression = _binary_rule(
         '''logical_or_expression : logical_and_expression
-                                | logical_or_expression LOGICAL_OR logical_and_expression'''
-        if len(p) == 2:
-            p[0] = p[1]
-        else:
-            line = p.lineno(2)
-            p[0] = BinaryExprNode(p[1], p[2], p[3], line)
+                                | logical_or_expression LOGICAL_OR logical_and_expression''')
     
-    def p_logical_and_expression(self, p):
+    p_logical_and_expression = _binary_rule(
         '''logical_and_expression : bitwise_or_expression
-                                 | logical_and_expression LOGICAL_AND bitwise_or_expression'''
-        if len(p) == 2:
-            p[0] = p[1]
-        else:
-            line = p.lineno(2)
-            p[0] = BinaryExprNode(p[1], p[2], p[3], line)
+                                 | logical_and_expression LOGICAL_AND bitwise_or_expression''')
     
-    def p_bitwise_or_expression(self, p):
+    p_bitwise_or_expression = _binary_rule(
         '''bitwise_or_expression : bitwise_xor_expression
-                                | bitwise_or_expression BITWISE_OR bitwise_xor_expression'''
-        if len(p) == 2:
-            p[0] = p[1]
-        else:
-            line = p.lineno(2)
-            p[0] = BinaryExprNode(p[1], p[2], p[3], line)
+                                | bitwise_or_expression BITWISE_OR bitwise_xor_expression''')
     
-    def p_bitwise_xor_expression(self, p):
+    p_bitwise_xor_expression = _binary_rule(
         '''bitwise_xor_expression : bitwise_and_expression
-                                 | bitwise_xor_expression BITWISE_XOR bitwise_and_expression'''
-        if len(p) == 2:
-            p[0] = p[1]
-        else:
-            line = p.lineno(2)
-            p[0] = BinaryExprNode(p[1], p[2], p[3], line)
+                                 | bitwise_xor_expression BITWISE_XOR bitwise_and_expression''')
     
-    def p_bitwise_and_expression(self, p):
+    p_bitwise_and_expression = _binary_rule(
         '''bitwise_and_expression : equality_expression
-                                 | bitwise_and_expression BITWISE_AND equality_expression'''
-        if len(p) == 2:
-            p[0] = p[1]
-        else:
-            line = p.lineno(2)
-            p[0] = BinaryExprNode(p[1], p[2], p[3], line)
+                                 | bitwise_and_expression BITWISE_AND equality_expression''')
     
-    def p_equality_expression(self, p):
+    p_equality_expression = _binary_rule(
         '''equality_expression : relational_expression
                               | equality_expression EQUAL relational_expression
-                              | equality_expression NOT_EQUAL relational_expression'''
-        if len(p) == 2:
-            p[0] = p[1]
-        else:
-            line = p.lineno(2)
-            p[0] = BinaryExprNode(p[1], p[2], p[3], line)
+                              | equality_expression NOT_EQUAL relational_expression''')
     
-    def p_relational_expression(self, p):
+    p_relational_expression = _binary_rule(
         '''relational_expression : shift_expression
                                 | relational_expression LESS_THAN shift_expression
                                 | relational_expression GREATER_THAN shift_expression
                                 | relational_expression LESS_EQUAL shift_expression
-                                | relational_expression GREATER_EQUAL shift_expression'''
-        if len(p) == 2:
-            p[0] = p[1]
-        else:
-            line = p.lineno(2)
-            p[0] = BinaryExprNode(p[1], p[2], p[3], line)
+                                | relational_expression GREATER_EQUAL shift_expression''')
     
-    def p_shift_expression(self, p):
+    p_shift_expression = _binary_rule(
         '''shift_expression : additive_expression
                            | shift_expression LEFT_SHIFT additive_expression
-                           | shift_expression RIGHT_SHIFT additive_expression'''
-        if len(p) == 2:
-            p[0] = p[1]
-        else:
-            line = p.lineno(2)
-            p[0] = BinaryExprNode(p[1], p[2], p[3], line)
+                           | shift_expression RIGHT_SHIFT additive_expression''')
     
-    def p_additive_expression(self, p):
+    p_additive_expression = _binary_rule(
         '''additive_expression : multiplicative_expression
                               | additive_expression PLUS multiplicative_expression
-                              | additive_expression MINUS multiplicative_expression'''
-        if len(p) == 2:
-            p[0] = p[1]
-        else:
-            line = p.lineno(2)
-            p[0] = BinaryExprNode(p[1], p[2], p[3], line)
+                              | additive_expression MINUS multiplicative_expression''')
     
-    def p_multiplicative_expression(self, p):
+    p_multiplicative_expression = _binary_rule(
         '''multiplicative_expression : unary_expression
                                     | multiplicative_expression MULTIPLY unary_expression
                                     | multiplicative_expression DIVIDE unary_expression
-                                    | multiplicative_expression MODULO unary_expression'''
-        if len(p) == 2:
-            p[0] = p[1]
-        else:
-            line = p.lineno(2)
-            p[0] = BinaryExprNode(p[1], p[2], p[3], line)
+                                    | multiplicative_expression MODULO unary_expression''')
     
     def p_unary_expression(self, p):
         '''unary_expression : postfix_expression
@@ -615,16 +646,16 @@ class RTMCParser:
             p[0] = PostfixExprNode(p[1], p[2], line=line)
         elif len(p) == 4:
             if p[2] == '.':
-                p[0] = MemberExprNode(p[1], p[3], False, line=line)
+                p[0] = mk_member(p[1], p[3], False, line)
             elif p[2] == '->':
-                p[0] = MemberExprNode(p[1], p[3], True, line=line)
+                p[0] = mk_member(p[1], p[3], True, line)
             else:
-                p[0] = CallExprNode(p[1], [], line=line)
+                p[0] = mk_call(p[1], (), line)
         else:
             if p[2] == '[':
                 p[0] = ArrayAccessNode(p[1], p[3], line=line)
             else:
-                p[0] = CallExprNode(p[1], p[3], line=line)
+                p[0] = mk_call(p[1], p[3], line)
     
     def p_argument_list(self, p):
         '''argument_list : expression
@@ -632,7 +663,8 @@ class RTMCParser:
         if len(p) == 2:
             p[0] = [p[1]]
         else:
-            p[0] = p[1] + [p[3]]
+            p[1].append(p[3])
+            p[0] = p[1]
     
     def p_primary_expression(self, p):
         '''primary_expression : IDENTIFIER
@@ -650,28 +682,14 @@ class RTMCParser:
                              | hw_call
                              | start_task_call'''
         
-        line = p.lineno(1)
-        filename = getattr(self, 'filename', '')
-        
         if len(p) == 2:
             # Handle based on token type, not value type
-            if p.slice[1].type == 'IDENTIFIER':
-                p[0] = IdentifierExprNode(p[1], line=line, filename=filename)
-            elif p.slice[1].type == 'INTEGER':
-                p[0] = LiteralExprNode(p[1], 'int', line)
-            elif p.slice[1].type == 'FLOAT':
-                p[0] = LiteralExprNode(p[1], 'float', line)
-            elif p.slice[1].type == 'STRING':
-                p[0] = LiteralExprNode(p[1], 'string', line)
-            elif p.slice[1].type == 'CHAR':
-                p[0] = LiteralExprNode(p[1], 'char', line)
-            elif p.slice[1].type == 'TRUE':
-                p[0] = LiteralExprNode(True, 'bool', line)
-            elif p.slice[1].type == 'FALSE':
-                p[0] = LiteralExprNode(False, 'bool', line)
-            else:
+            builder = _PRIMARY_BUILDERS.get(p.slice[1].type)
+            if builder is None:
                 # Other node types (message_send, rtos_call, etc.)
                 p[0] = p[1]
+            else:
+                p[0] = builder(p[1], p.lineno(1), p.lexer.filename)
         else:
             # Parenthesized expression: (expression)
             p[0] = p[2]
@@ -693,7 +711,8 @@ class RTMCParser:
         if len(p) == 2:
             p[0] = [p[1]]
         else:
-            p[0] = p[1] + [p[3]]
+            p[1].append(p[3])
+            p[0] = p[1]
     
     # Message operations
     def p_message_send(self, p):
@@ -735,9 +754,9 @@ class RTMCParser:
         
         line = p.lineno(1)
         if len(p) == 5:
-            p[0] = CallExprNode(IdentifierExprNode(p[1]), p[3], line=line)
+            p[0] = mk_call(mk_ident(p[1]), p[3], line)
         else:
-            p[0] = CallExprNode(IdentifierExprNode(p[1]), [], line=line)
+            p[0] = mk_call(mk_ident(p[1]), (), line)
     
     def p_hw_call(self, p):
         '''hw_call : HW_GPIO_INIT LEFT_PAREN argument_list RIGHT_PAREN
@@ -770,9 +789,9 @@ class RTMCParser:
         
         line = p.lineno(1)
         if len(p) == 5:
-            p[0] = CallExprNode(IdentifierExprNode(p[1]), p[3], line=line)
+            p[0] = mk_call(mk_ident(p[1]), p[3], line)
         else:
-            p[0] = CallExprNode(IdentifierExprNode(p[1]), [], line=line)
+            p[0] = mk_call(mk_ident(p[1]), (), line)
     
     def p_start_task_call(self, p):
         '''start_task_call : START_TASK LEFT_PAREN argument_list RIGHT_PAREN
@@ -780,9 +799,9 @@ class RTMCParser:
         
         line = p.lineno(1)
         if len(p) == 5:
-            p[0] = CallExprNode(IdentifierExprNode(p[1]), p[3], line=line)
+            p[0] = mk_call(mk_ident(p[1]), p[3], line)
         else:
-            p[0] = CallExprNode(IdentifierExprNode(p[1]), [], line=line)
+            p[0] = mk_call(mk_ident(p[1]), (), line)
     
     # Error rule for syntax errors
     def p_error(self, p):
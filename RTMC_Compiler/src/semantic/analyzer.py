@@ -13,11 +13,18 @@ KNOWN ISSUES:
   Root cause: Likely issue in scope management during nested statement traversal.
 """
 
-from typing import Dict, List, Optional, Any, Set
+from typing import Dict, List, Optional, Any, Set, Callable
 from RTMC_Compiler.src.parser.ast_nodes import *
 from dataclasses import dataclass
 from enum import Enum, auto
 
+# Type-node tags, bound once so type dispatch is a global load and an identity test
+_PRIMITIVE_TYPE = NodeType.PRIMITIVE_TYPE
+_STRUCT_TYPE = NodeType.STRUCT_TYPE
+_UNION_TYPE = NodeType.UNION_TYPE
+_ARRAY_TYPE = NodeType.ARRAY_TYPE
+_POINTER_TYPE = NodeType.POINTER_TYPE
+
 class SemanticError(Exception):
     """Semantic analysis error"""
     pass
@@ -189,7 +196,7 @@ class TypeChecker:
             return TypeChecker.get_common_type(left_type, right_type)
         
         # Bitwise operators
-        if op in ['&', '|', '^']:
+        if op in ['&', '|', '^', '<<', '>>']:
             if not (TypeChecker.is_integer_type(left_type) and TypeChecker.is_integer_type(right_type)):
                 raise SemanticError(f"Bitwise operations require integer operands")
             return TypeChecker.get_common_type(left_type, right_type)
@@ -200,6 +207,7 @@ class SemanticAnalyzer(ASTVisitor):
     """Main semantic analyzer"""
     
     def __init__(self):
+        super().__init__()
         self.symbol_table = SymbolTable()
         self.current_function = None
         self.current_return_type = None
@@ -373,7 +381,7 @@ class SemanticAnalyzer(ASTVisitor):
     def analyze(self, node: ASTNode):
         """Analyze the AST"""
         try:
-            node.accept(self)
+            self._visit(node)
         except SemanticError:
             pass  # Error already recorded
         
@@ -392,16 +400,17 @@ class SemanticAnalyzer(ASTVisitor):
     
     def get_type_from_node(self, type_node: TypeNode) -> str:
         """Get type string from type node"""
-        if isinstance(type_node, PrimitiveTypeNode):
+        kind = getattr(type_node, 'node_type', None)
+        if kind is _PRIMITIVE_TYPE:
             return type_node.type_name
-        elif isinstance(type_node, StructTypeNode):
+        elif kind is _STRUCT_TYPE:
             return f"struct {type_node.struct_name}"
-        elif isinstance(type_node, UnionTypeNode):
+        elif kind is _UNION_TYPE:
             return f"union {type_node.union_name}"
-        elif isinstance(type_node, ArrayTypeNode):
+        elif kind is _ARRAY_TYPE:
             element_type = self.get_type_from_node(type_node.element_type)
             return f"{element_type}[]"
-        elif isinstance(type_node, PointerTypeNode):
+        elif kind is _POINTER_TYPE:
             base_type = self.get_type_from_node(type_node.base_type)
             return base_type + '*' * type_node.pointer_level
         else:
@@ -412,7 +421,7 @@ class SemanticAnalyzer(ASTVisitor):
     def visit_program(self, node: ProgramNode):
         """Visit program node"""
         for declaration in node.declarations:
-            declaration.accept(self)
+            self._visit(declaration)
         
         # Check if main function exists
         main_func = self.symbol_table.get('main')
@@ -451,7 +460,7 @@ class SemanticAnalyzer(ASTVisitor):
         for param_symbol in param_symbols:
             self.symbol_table.define(param_symbol)
         
-        node.body.accept(self)
+        self._visit(node.body)
         
         self.exit_scope()
         
@@ -518,7 +527,7 @@ class SemanticAnalyzer(ASTVisitor):
         
         # Check initializer type if present
         if node.initializer:
-            init_type = node.initializer.accept(self)
+            init_type = self._visit(node.initializer)
             if not TypeChecker.can_convert(init_type, var_type):
                 self.error(f"Cannot initialize {var_type} with {init_type}", node.line, node.filename)
         
@@ -548,7 +557,7 @@ class SemanticAnalyzer(ASTVisitor):
 
     def visit_array_type(self, node: ArrayTypeNode):
         """Visit array type node"""
-        element_type = node.element_type.accept(self)
+        element_type = self._visit(node.element_type)
         return f"{element_type}[]"
     
     def visit_block_stmt(self, node: BlockStmtNode):
@@ -556,35 +565,35 @@ class SemanticAnalyzer(ASTVisitor):
         self.enter_scope()
         
         for stmt in node.statements:
-            stmt.accept(self)
+            self._visit(stmt)
         
         self.exit_scope()
     
     def visit_expression_stmt(self, node: ExpressionStmtNode):
         """Visit expression statement"""
-        node.expression.accept(self)
+        self._visit(node.expression)
     
     def visit_if_stmt(self, node: IfStmtNode):
         """Visit if statement"""
-        cond_type = node.condition.accept(self)
+        cond_type = self._visit(node.condition)
         if not TypeChecker.is_condition_type(cond_type):
             self.error(f"If condition must be numeric or boolean, got {cond_type}", node.line, node.filename)
         
-        node.then_stmt.accept(self)
+        self._visit(node.then_stmt)
         
         if node.else_stmt:
-            node.else_stmt.accept(self)
+            self._visit(node.else_stmt)
     
     def visit_while_stmt(self, node: WhileStmtNode):
         """Visit while statement"""
-        cond_type = node.condition.accept(self)
+        cond_type = self._visit(node.condition)
         if not TypeChecker.is_condition_type(cond_type):
             self.error(f"While condition must be numeric or boolean, got {cond_type}", node.line, node.filename)
         
         old_in_loop = self.in_loop
         self.in_loop = True
         
-        node.body.accept(self)
+        self._visit(node.body)
         
         self.in_loop = old_in_loop
     
@@ -593,20 +602,20 @@ class SemanticAnalyzer(ASTVisitor):
         self.enter_scope()
         
         if node.init:
-            node.init.accept(self)
+            self._visit(node.init)
         
         if node.condition:
-            cond_type = node.condition.accept(self)
+            cond_type = self._visit(node.condition)
             if not TypeChecker.is_condition_type(cond_type):
                 self.error(f"For condition must be numeric or boolean, got {cond_type}", node.line, node.filename)
         
         if node.update:
-            node.update.accept(self)
+            self._visit(node.update)
         
         old_in_loop = self.in_loop
         self.in_loop = True
         
-        node.body.accept(self)
+        self._visit(node.body)
         
         self.in_loop = old_in_loop
         
@@ -618,7 +627,7 @@ class SemanticAnalyzer(ASTVisitor):
             self.error("Return statement outside function", node.line, node.filename)
         
         if node.value:
-            value_type = node.value.accept(self)
+            value_type = self._visit(node.value)
             if not TypeChecker.can_convert(value_type, self.current_return_type):
                 self.error(f"Cannot return {value_type} from function returning {self.current_return_type}", node.line, node.filename)
         else:
@@ -637,8 +646,8 @@ class SemanticAnalyzer(ASTVisitor):
     
     def visit_binary_expr(self, node: BinaryExprNode):
         """Visit binary expression"""
-        left_type = node.left.accept(self)
-        right_type = node.right.accept(self)
+        left_type = self._visit(node.left)
+        right_type = self._visit(node.right)
         
         try:
             result_type = TypeChecker.get_binary_result_type(node.operator, left_type, right_type)
@@ -649,7 +658,7 @@ class SemanticAnalyzer(ASTVisitor):
     
     def visit_unary_expr(self, node: UnaryExprNode):
         """Visit unary expression"""
-        operand_type = node.operand.accept(self)
+        operand_type = self._visit(node.operand)
         
         if node.operator == '!':
             return 'int'
@@ -663,7 +672,7 @@ class SemanticAnalyzer(ASTVisitor):
     
     def visit_postfix_expr(self, node: PostfixExprNode):
         """Visit postfix expression (++ and --)"""
-        operand_type = node.operand.accept(self)
+        operand_type = self._visit(node.operand)
         
         if node.operator in ['++', '--']:
             if not TypeChecker.is_numeric_type(operand_type):
@@ -678,8 +687,8 @@ class SemanticAnalyzer(ASTVisitor):
 
     def visit_assignment_expr(self, node: AssignmentExprNode):
         """Visit assignment expression"""
-        target_type = node.target.accept(self)
-        value_type = node.value.accept(self)
+        target_type = self._visit(node.target)
+        value_type = self._visit(node.value)
         
         # Check if target is assignable
         if isinstance(node.target, IdentifierExprNode):
@@ -731,16 +740,16 @@ class SemanticAnalyzer(ASTVisitor):
                 if func_name == 'printf':
                     # For printf, only check the first argument (format string)
                     if len(node.arguments) > 0:
-                        arg_type = node.arguments[0].accept(self)
+                        arg_type = self._visit(node.arguments[0])
                         if not TypeChecker.can_convert(arg_type, func_symbol.function_params[0].data_type):
                             self.error(f"First argument to '{func_name}': cannot convert {arg_type} to {func_symbol.function_params[0].data_type}", node.line, node.filename)
                     # Additional arguments can be any type for formatting
                     for i in range(1, len(node.arguments)):
-                        node.arguments[i].accept(self)  # Just validate the expressions
+                        self._visit(node.arguments[i])  # Just validate the expressions
                 else:
                     # Normal function - check all parameters
                     for i, (arg, param) in enumerate(zip(node.arguments, func_symbol.function_params)):
-                        arg_type = arg.accept(self)
+                        arg_type = self._visit(arg)
                         if not TypeChecker.can_convert(arg_type, param.data_type):
                             self.error(f"Argument {i+1} to '{func_name}': cannot convert {arg_type} to {param.data_type}", node.line, node.filename)
             
@@ -752,7 +761,7 @@ class SemanticAnalyzer(ASTVisitor):
     
     def visit_member_expr(self, node: MemberExprNode):
         """Visit member expression"""
-        object_type = node.object.accept(self)
+        object_type = self._visit(node.object)
         
         if node.computed:
             # This is either array access (obj[index]) or pointer member access (ptr->field)
@@ -793,7 +802,7 @@ class SemanticAnalyzer(ASTVisitor):
                 
                 # Index should be integer
                 if isinstance(node.property, ExpressionNode):
-                    index_type = node.property.accept(self)
+                    index_type = self._visit(node.property)
                     if not TypeChecker.is_integer_type(index_type):
                         self.error(f"Array index must be integer, got {index_type}", node.line)
                 
@@ -840,7 +849,7 @@ class SemanticAnalyzer(ASTVisitor):
     def visit_message_decl(self, node: MessageDeclNode):
         """Visit message declaration"""
         # Check if the message type is valid
-        message_type = node.message_type.accept(self)
+        message_type = self._visit(node.message_type)
         
         # Messages must be declared at global scope (not inside functions or tasks)
         if self.symbol_table.scope_level > 0:
@@ -881,7 +890,7 @@ class SemanticAnalyzer(ASTVisitor):
             return "void"
         
         # Check payload type matches message type
-        payload_type = node.payload.accept(self)
+        payload_type = self._visit(node.payload)
         
         if not self.is_type_compatible(payload_type, symbol.data_type):
             self.error(f"Type mismatch in message send: expected {symbol.data_type}, got {payload_type}", node.line)
@@ -909,7 +918,7 @@ class SemanticAnalyzer(ASTVisitor):
         
         # Check timeout parameter if present
         if node.timeout:
-            timeout_type = node.timeout.accept(self)
+            timeout_type = self._visit(node.timeout)
             if timeout_type != "int":
                 self.error(f"Timeout parameter must be int, got {timeout_type}", node.line)
         
@@ -939,14 +948,14 @@ class SemanticAnalyzer(ASTVisitor):
             self.error(f"Array size must be positive, got {size_value}", node.line)
         
         # Get element type
-        element_type = node.element_type.accept(self)
+        element_type = self._visit(node.element_type)
         
         # Create array type string
         array_type = f"{element_type}[]"
         
         # Validate initializer if present
         if node.initializer:
-            init_type = node.initializer.accept(self)
+            init_type = self._visit(node.initializer)
             # The initializer should be an array literal
             if not isinstance(node.initializer, ArrayLiteralNode):
                 self.error(f"Array initializer must be an array literal", node.line, node.filename)
@@ -970,7 +979,7 @@ class SemanticAnalyzer(ASTVisitor):
         # Check that all elements have the same type
         element_types = []
         for element in node.elements:
-            element_type = element.accept(self)
+            element_type = self._visit(element)
             element_types.append(element_type)
         
         # For now, just return the type of the first element
@@ -985,7 +994,7 @@ class SemanticAnalyzer(ASTVisitor):
     def visit_array_access(self, node: ArrayAccessNode):
         """Visit array access node"""
         # Get the array type
-        array_type = node.array.accept(self)
+        array_type = self._visit(node.array)
         
         # Check that it's either an array type or a pointer type
         is_array = '[' in array_type and ']' in array_type
@@ -995,7 +1004,7 @@ class SemanticAnalyzer(ASTVisitor):
             self.error(f"Cannot index non-array type {array_type}", node.line, node.filename)
         
         # Get the index type
-        index_type = node.index.accept(self)
+        index_type = self._visit(node.index)
         if index_type != "int":
             self.error(f"Array index must be int, got {index_type}", node.line)
         
@@ -1011,7 +1020,7 @@ class SemanticAnalyzer(ASTVisitor):
     
     def visit_pointer_type(self, node: PointerTypeNode):
         """Visit pointer type node"""
-        base_type = node.base_type.accept(self)
+        base_type = self._visit(node.base_type)
         
         # Build pointer type string with correct level of indirection
         pointer_type = base_type + '*' * node.pointer_level
@@ -1020,7 +1029,7 @@ class SemanticAnalyzer(ASTVisitor):
     def visit_pointer_decl(self, node: PointerDeclNode):
         """Visit pointer declaration node"""
         # Get the pointer type
-        pointer_type = node.type.accept(self)
+        pointer_type = self._visit(node.type)
         
         # Check if variable already exists in current scope
         if node.name in self.symbol_table.symbols:
@@ -1028,7 +1037,7 @@ class SemanticAnalyzer(ASTVisitor):
         
         # Check initializer type if present
         if node.initializer:
-            init_type = node.initializer.accept(self)
+            init_type = self._visit(node.initializer)
             if not TypeChecker.can_convert(init_type, pointer_type):
                 self.error(f"Cannot initialize {pointer_type} with {init_type}", node.line, node.filename)
         
@@ -1040,7 +1049,7 @@ class SemanticAnalyzer(ASTVisitor):
     
     def visit_address_of(self, node: AddressOfNode):
         """Visit address-of expression (&)"""
-        operand_type = node.operand.accept(self)
+        operand_type = self._visit(node.operand)
         
         # Check that operand is an lvalue (addressable)
         if not isinstance(node.operand, (IdentifierExprNode, MemberExprNode, ArrayAccessNode)):
@@ -1051,7 +1060,7 @@ class SemanticAnalyzer(ASTVisitor):
     
     def visit_dereference(self, node: DereferenceNode):
         """Visit dereference expression (*)"""
-        operand_type = node.operand.accept(self)
+        operand_type = self._visit(node.operand)
         
         # Check that operand is a pointer type
         if not operand_type.endswith('*'):
@@ -1064,7 +1073,7 @@ class SemanticAnalyzer(ASTVisitor):
     def visit_cast_expr(self, node: CastExprNode):
         """Visit cast expression"""
         # Get the operand type (mainly for validation)
-        operand_type = node.operand.accept(self)
+        operand_type = self._visit(node.operand)
         
         # Get the target type
         target_type = self.get_type_from_node(node.target_type)
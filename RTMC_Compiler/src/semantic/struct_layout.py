@@ -7,15 +7,33 @@ from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 from RTMC_Compiler.src.parser.ast_nodes import *
 
-@dataclass
 class FieldLayout:
     """Layout information for a struct field"""
-    name: str
-    offset: int           # Byte offset from struct base
-    size: int             # Size in bytes
-    bit_offset: int = 0   # Bit offset within byte (for bit-fields)
-    bit_width: int = 0    # Bit width (0 = not a bit-field)
-    is_base_struct: bool = False  # True if this field is used for inheritance
+    # Slotted rather than a dataclass: one record per field of every laid-out struct
+    __slots__ = ('name', 'offset', 'size', 'bit_offset', 'bit_width', 'is_base_struct')
+    
+    def __init__(self, name: str, offset: int, size: int, bit_offset: int = 0,
+                 bit_width: int = 0, is_base_struct: bool = False):
+        self.name = name
+        self.offset = offset                  # Byte offset from struct base
+        self.size = size                      # Size in bytes
+        self.bit_offset = bit_offset          # Bit offset within byte (for bit-fields)
+        self.bit_width = bit_width            # Bit width (0 = not a bit-field)
+        self.is_base_struct = is_base_struct  # True if this field is used for inheritance
+    
+    def _key(self) -> tuple:
+        return (self.name, self.offset, self.size, self.bit_offset, self.bit_width, self.is_base_struct)
+    
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._key() == other._key()
+    
+    __hash__ = None  # Mutable (offsets are adjusted during layout)
+    
+    def __repr__(self):
+        return ("FieldLayout(name={!r}, offset={!r}, size={!r}, bit_offset={!r}, "
+                "bit_width={!r}, is_base_struct={!r})".format(*self._key()))
 
 @dataclass
 class StructLayout:
@@ -177,7 +195,7 @@ class StructLayoutTable:
         
         # Update the struct declaration with computed values
         struct_decl.total_size = current_offset
-        struct_decl.field_offsets = {name: field.offset for name, field in fields.items()}
+        struct_decl.set_field_offsets(list(fields), [field.offset for field in fields.values()])
         struct_decl.base_struct = base_struct
         
         return layout
@@ -305,6 +323,37 @@ class StructLayoutTable:
         
         return None
     
+    def get_field_offset_or(self, struct_name: str, field_path: str, default: Optional[int] = None) -> Optional[int]:
+        """Get field offset like get_field_offset, returning default instead of raising"""
+        current_struct = struct_name
+        total_offset = 0
+        
+        for part in field_path.split('.'):
+            if current_struct not in self.struct_decls:
+                return default
+            
+            field_layout = self.calculate_layout(current_struct).fields.get(part)
+            if field_layout is None:
+                return default
+            total_offset += field_layout.offset
+            
+            # Continue with nested struct if applicable
+            for field in self.struct_decls[current_struct].fields:
+                if field.name == part and isinstance(field.type, StructTypeNode):
+                    current_struct = field.type.struct_name
+                    break
+        
+        return total_offset
+    
+    def get_bit_field_info_or(self, struct_name: str, field_path: str,
+                              default: Optional[Tuple[int, int, int]] = None) -> Optional[Tuple[int, int, int]]:
+        """Get bit-field information like get_bit_field_info, returning default for unknown structs"""
+        if struct_name not in self.struct_decls:
+            return default
+        
+        bit_field_info = self.get_bit_field_info(struct_name, field_path)
+        return default if bit_field_info is None else bit_field_info
+    
     def get_struct_size(self, struct_name: str) -> int:
         """Get total size of a struct"""
         layout = self.calculate_layout(struct_name)
@@ -357,12 +406,14 @@ class StructLayoutTable:
             return type_node.type_name
         elif isinstance(type_node, StructTypeNode):
             return type_node.struct_name
+        elif isinstance(type_node, UnionTypeNode):
+            return type_node.union_name
         elif isinstance(type_node, ArrayTypeNode):
             element_name = self._get_type_name_from_node(type_node.element_type)
             return f"{element_name}[{type_node.size}]"
         elif isinstance(type_node, PointerTypeNode):
-            pointed_type = self._get_type_name_from_node(type_node.pointed_type)
-            return f"{pointed_type}*"
+            pointed_type = self._get_type_name_from_node(type_node.base_type)
+            return pointed_type + '*' * type_node.pointer_level
         else:
             return "unknown"
     
@@ -400,6 +451,6 @@ class StructLayoutTable:
         
         # Update the union declaration with computed values
         union_decl.total_size = total_size
-        union_decl.field_offsets = {name: field.offset for name, field in fields.items()}
+        union_decl.set_field_offsets(list(fields), [field.offset for field in fields.values()])
         
         return layout
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Shared imports and helpers for the code generation tests
+"""
+
+import sys
+import os
+
+# Add the parent directory to the path so we can import the compiler modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+try:
+    from src.parser.ply_parser import RTMCParser
+    from src.bytecode.generator import BytecodeGenerator
+    from src.bytecode.instructions import Opcode
+except ImportError:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from RTMC_Compiler.src.parser.ply_parser import RTMCParser
+    from RTMC_Compiler.src.bytecode.generator import BytecodeGenerator
+    from RTMC_Compiler.src.bytecode.instructions import Opcode
+
+def compile_source(code):
+    """Parse a source string and generate its bytecode program"""
+    ast = RTMCParser().parse(code)
+    return BytecodeGenerator().generate(ast)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for array initializer code generation in RTMC compiler
+"""
+
+from compile_helpers import Opcode, compile_source
+
+def test_constant_initializer_uses_bulk_init():
+    """An all-literal initializer becomes one INIT_ARRAY_CONST over a constant run"""
+    program = compile_source("""
+void main() {
+    int arr[4] = {10, 20, 30, 40};
+}
+""")
+    inits = [instr for instr in program.instructions if instr.opcode == Opcode.INIT_ARRAY_CONST]
+    assert len(inits) == 1
+
+    first_const, count, element_size = inits[0].operands
+    assert (count, element_size) == (4, 4)
+    assert program.constants[first_const:first_const + count] == [10, 20, 30, 40]
+    assert Opcode.STORE_ARRAY_ELEM not in [instr.opcode for instr in program.instructions]
+
+def test_non_constant_initializer_stores_per_element():
+    """Initializers with non-literal elements store each element at an immediate index"""
+    program = compile_source("""
+void main() {
+    int x = 3;
+    int arr[3] = {1, x, 2};
+}
+""")
+    opcodes = [instr.opcode for instr in program.instructions]
+    assert Opcode.INIT_ARRAY_CONST not in opcodes
+    assert Opcode.STORE_ARRAY_ELEM not in opcodes
+
+    stores = [instr.operands for instr in program.instructions if instr.opcode == Opcode.STORE_ARRAY_ELEM_I]
+    assert [operands[1:] for operands in stores] == [[0, 4], [1, 4], [2, 4]]
+
+    # The array base is never reloaded per element
+    array_address = stores[0][0]
+    reloads = [instr for instr in program.instructions
+               if instr.opcode == Opcode.LOAD_VAR and instr.operands == [array_address]]
+    assert reloads == []
+
+def test_element_store_size_comes_from_declared_type():
+    """arr[i] = value stores with the declared element size, for locals, globals and pointers"""
+    program = compile_source("""
+char gbuf[4];
+
+void main() {
+    char buf[4];
+    int* p;
+    buf[1] = 7;
+    gbuf[2] = 9;
+    p[0] = 5;
+}
+""")
+    stores = [instr.operands for instr in program.instructions if instr.opcode == Opcode.STORE_ARRAY_ELEM]
+    assert stores == [[1], [1], [4]]
+
+def test_array_literal_value_builds_whole_array():
+    """An array literal used as a value builds every element, not just the first"""
+    program = compile_source("""
+void main() {
+    int x = 4;
+    int* p = {7, 8, 9};
+    int* q = {1, x, 3};
+}
+""")
+    blobs = [instr.operands for instr in program.instructions if instr.opcode == Opcode.LOAD_BLOB]
+    assert len(blobs) == 1
+    first_const, count, element_size = blobs[0]
+    assert program.constants[first_const:first_const + count] == [7, 8, 9]
+
+    builds = [instr.operands for instr in program.instructions if instr.opcode == Opcode.BUILD_ARRAY]
+    assert builds == [[3, 4]]
+
+if __name__ == "__main__":
+    test_constant_initializer_uses_bulk_init()
+    test_non_constant_initializer_stores_per_element()
+    test_element_store_size_comes_from_declared_type()
+    test_array_literal_value_builds_whole_array()
+    print("✓ Array initializer tests passed!")
@@ -121,6 +121,62 @@ def test_complex_example():
     print(ast_to_string(y_member))
     print()
 
+def test_fast_constructors():
+    """Test that the parser's fast constructors match the regular ones"""
+    ident = IdentifierExprNode("x", line=3, filename="a.rtmc")
+    literal = LiteralExprNode(7, "int", 3)
+    pairs = [
+        (mk_ident("x", 3, "a.rtmc"), ident),
+        (mk_literal(7, "int", 3), literal),
+        (mk_binary(ident, "+", literal, 3), BinaryExprNode(ident, "+", literal, 3)),
+        (mk_member(ident, "y", False, 3), MemberExprNode(ident, "y", False, line=3)),
+        (mk_call(ident, [literal], 3), CallExprNode(ident, [literal], line=3)),
+    ]
+    for fast, regular in pairs:
+        assert type(fast) is type(regular)
+        assert node_fields(fast) == node_fields(regular)
+
+def test_repr_is_shallow():
+    """Test that repr stays short while full_repr dumps the whole subtree"""
+    expr = BinaryExprNode(IdentifierExprNode("x", line=4), "+", LiteralExprNode(1, "int", 4), 4)
+
+    assert repr(expr) == "<BinaryExprNode line=4>"
+    assert expr.full_repr() == ast_to_string(expr)
+    assert "Identifier: x" in expr.full_repr()
+
+def test_primitive_types_are_shared():
+    """Test that primitive type nodes are hash-consed by name"""
+    assert primitive_type("int") is primitive_type("int")
+    assert primitive_type("int") is not primitive_type("float")
+    assert primitive_type("char").type_name == "char"
+
+def test_canonical_form():
+    """Test that the canonical form ignores positions but not structure"""
+    def build(line, operator):
+        return CallExprNode(IdentifierExprNode("f", line=line),
+                            [BinaryExprNode(IdentifierExprNode("x", line=line), operator,
+                                            LiteralExprNode(2, "int", line), line)], line=line)
+
+    assert ast_canonical(build(1, "+")) == "f((x+2),)"
+    assert ast_canonical(build(1, "+")) == ast_canonical(build(9, "+"))
+    assert ast_canonical(build(1, "+")) != ast_canonical(build(1, "-"))
+
+def test_nodes_have_no_instance_dict():
+    """Every node class declares __slots__ all the way up, so nodes carry no __dict__"""
+    pending = list(ASTNode.__subclasses__())
+    while pending:
+        cls = pending.pop()
+        pending.extend(cls.__subclasses__())
+        missing = [base.__name__ for base in cls.__mro__
+                   if base is not object and '__slots__' not in vars(base)]
+        assert not missing, f"{cls.__name__}: no __slots__ on {missing}"
+    assert not hasattr(BinaryExprNode(IdentifierExprNode("x"), "+", LiteralExprNode(1, "int")), '__dict__')
+
+def test_visit_methods_exist_on_visitor():
+    """Every name in the dispatch table is a method of ASTVisitor"""
+    missing = {cls.__name__: name for cls, name in VISIT_METHODS.items() if not hasattr(ASTVisitor, name)}
+    assert not missing, missing
+
 if __name__ == "__main__":
     print("Testing New AST Features for RT-Micro-C Compiler")
     print("=" * 50)
@@ -131,5 +187,11 @@ if __name__ == "__main__":
     test_nested_struct()
     test_nested_member_access()
     test_complex_example()
+    test_fast_constructors()
+    test_repr_is_shallow()
+    test_primitive_types_are_shared()
+    test_canonical_form()
+    test_nodes_have_no_instance_dict()
+    test_visit_methods_exist_on_visitor()
     
     print("All tests completed successfully!")
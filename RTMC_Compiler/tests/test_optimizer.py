@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Tests for the RTMC AST optimizer
+"""
+
+import sys
+import os
+import io
+import contextlib
+
+# Add the parent directory to the path so we can import the compiler modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+try:
+    from src.parser.ply_parser import RTMCParser
+    from src.optimizer.optimizer import Optimizer
+    from src.semantic.struct_layout import StructLayoutTable
+    from src.semantic.analyzer import SemanticAnalyzer
+    from src.bytecode.generator import BytecodeGenerator
+except ImportError:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from RTMC_Compiler.src.parser.ply_parser import RTMCParser
+    from RTMC_Compiler.src.optimizer.optimizer import Optimizer
+    from RTMC_Compiler.src.semantic.struct_layout import StructLayoutTable
+    from RTMC_Compiler.src.semantic.analyzer import SemanticAnalyzer
+    from RTMC_Compiler.src.bytecode.generator import BytecodeGenerator
+
+# The compiler modules import each other as RTMC_Compiler.src, so the repo
+# root is importable here and the VM sees the same AST and opcode classes
+from RTMC_Interpreter.vm.virtual_machine import VirtualMachine
+
+def _optimize(code):
+    return Optimizer().optimize(RTMCParser().parse(code))
+
+def _main_body(program):
+    return program.declarations[-1].body.statements
+
+def _kinds(statements):
+    # Compare by class name; the tests may import the AST module under a different path
+    return [type(stmt).__name__ for stmt in statements]
+
+def test_statements_after_return_are_dropped():
+    """Code following a return in the same block is removed"""
+    program = _optimize("""
+int main() {
+    int x = 1;
+    return x;
+    x = 2;
+    x = 3;
+}
+""")
+    body = _main_body(program)
+    assert _kinds(body) == ['VariableDeclNode', 'ReturnStmtNode']
+
+def test_return_inside_branch_keeps_following_code():
+    """A return in one branch does not make the code after the if unreachable"""
+    program = _optimize("""
+int main() {
+    int x = 1;
+    if (x) {
+        return 1;
+        x = 5;
+    }
+    x = 2;
+    return x;
+}
+""")
+    body = _main_body(program)
+    assert _kinds(body[1:]) == ['IfStmtNode', 'ExpressionStmtNode', 'ReturnStmtNode']
+
+    # The statement after the return inside the branch is still dead
+    assert len(body[1].then_stmt.statements) == 1
+
+def test_repeated_passes_keep_struct_fields():
+    """Re-running the folder to a fixed point lays out inherited structs only once"""
+    program = _optimize("""
+struct Base { int a; };
+struct Derived : Base { int b; };
+
+int main() {
+    int x = 2 * 3;
+    return x;
+}
+""")
+    derived = program.declarations[1]
+    assert [field.name for field in derived.fields] == ['a', 'b']
+
+def test_folding_reaches_fixed_point():
+    """A folded tree reports no further changes on the next pass"""
+    optimizer = Optimizer()
+    program = optimizer.optimize(RTMCParser().parse("""
+int main() {
+    int x = (1 + 2) * 4 + 0;
+    return x;
+}
+"""))
+    folder = optimizer.passes[0]
+    initializer = _main_body(program)[0].initializer
+    assert (type(initializer).__name__, initializer.value) == ('LiteralExprNode', 12)
+
+    folder.changed = False
+    program.accept(folder)
+    assert not folder.changed
+
+def test_power_of_two_multiply_and_divide_become_shifts():
+    """Integer multiply/divide by 2^k is strength-reduced; floats are left alone"""
+    program = _optimize("""
+void main() {
+    int x = 3;
+    float f = 1.5;
+    int a = x * 8;
+    int b = x / 4;
+    float g = f * 2;
+}
+""")
+    a, b, g = [stmt.initializer for stmt in _main_body(program)[2:]]
+    assert (a.operator, a.right.value) == ('<<', 3)
+    assert (b.operator, b.right.value) == ('>>', 2)
+    assert g.operator == '*'
+
+def test_shifted_int_variable_may_hold_a_float():
+    """Assignments do not convert, so a shifted int variable can hold a float at run time"""
+    program = RTMCParser().parse("""
+void main() {
+    float f = 7.0;
+    int x = f / 2;
+    int y = x * 4;
+    int z = y / 8;
+    printf("{0} {1}", y, z);
+}
+""")
+    SemanticAnalyzer().analyze(program)
+    program = Optimizer().optimize(program)
+    assert [stmt.initializer.operator for stmt in _main_body(program)[2:4]] == ['<<', '>>']
+
+    vm = VirtualMachine(debug=False, trace=False)
+    vm.load_program(BytecodeGenerator().generate(program))
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        vm.run()
+    assert "DEBUG: 12.0 1.0" in output.getvalue()
+
+def test_constant_left_side_short_circuits_logic():
+    """A constant left operand decides && / || unless the right side has effects"""
+    program = _optimize("""
+int tick() { return 1; }
+
+void main() {
+    int x = 3;
+    int a = 0 && x;
+    int b = 2 || x;
+    int c = 0 && tick();
+    int d = 1 && x;
+}
+""")
+    a, b, c, d = [stmt.initializer for stmt in _main_body(program)[1:]]
+    assert (type(a).__name__, a.value) == ('LiteralExprNode', 0)
+    assert (type(b).__name__, b.value) == ('LiteralExprNode', 1)
+    assert type(c.right).__name__ == 'CallExprNode'
+    assert d.operator == '&&'
+
+def test_identities_respect_operand_types():
+    """Float identities and effectful operands are kept; same-variable ops fold"""
+    program = _optimize("""
+int tick() { return 1; }
+
+void main() {
+    int x = 3;
+    int a = x + 0.0;
+    int b = tick() * 0;
+    int c = x - x;
+    int d = x | x;
+}
+""")
+    a, b, c, d = [stmt.initializer for stmt in _main_body(program)[1:]]
+    assert a.operator == '+'
+    assert b.operator == '*'
+    assert (type(c).__name__, c.value) == ('LiteralExprNode', 0)
+    assert (type(d).__name__, d.name) == ('IdentifierExprNode', 'x')
+
+def test_sizeof_uses_injected_layout_table():
+    """Layouts known before optimization are forwarded to the folder"""
+    layouts = StructLayoutTable()
+    layouts.register_struct(RTMCParser().parse("struct Pair { int a; int b; };").declarations[0])
+
+    program = Optimizer(struct_layout_table=layouts).optimize(RTMCParser().parse("""
+void main() {
+    int n = sizeof(struct Pair);
+}
+"""))
+    assert _main_body(program)[0].initializer.value == 8
+
+if __name__ == "__main__":
+    test_statements_after_return_are_dropped()
+    test_return_inside_branch_keeps_following_code()
+    test_repeated_passes_keep_struct_fields()
+    test_folding_reaches_fixed_point()
+    test_power_of_two_multiply_and_divide_become_shifts()
+    test_shifted_int_variable_may_hold_a_float()
+    test_constant_left_side_short_circuits_logic()
+    test_identities_respect_operand_types()
+    test_sizeof_uses_injected_layout_table()
+    print("✓ Optimizer tests passed!")
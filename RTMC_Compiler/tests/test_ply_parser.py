@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for RTMCParser construction and reuse
+"""
+
+import sys
+import os
+
+# Add the parent directory to the path so we can import the compiler modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+try:
+    from src.parser.ply_parser import RTMCParser
+    from src.semantic.analyzer import SemanticAnalyzer, SemanticError
+except ImportError:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from RTMC_Compiler.src.parser.ply_parser import RTMCParser
+    from RTMC_Compiler.src.semantic.analyzer import SemanticAnalyzer, SemanticError
+
+SOURCE = """int x;
+int y;
+void main() { int z = x; }
+"""
+
+def test_parsers_share_tables():
+    """Instances reuse one lexer and one PLY parser"""
+    first, second = RTMCParser(), RTMCParser()
+    assert first.parser is second.parser
+    assert first.lexer is second.lexer
+
+def test_reparse_restarts_positions():
+    """Every parse starts at line 1 and tags nodes with its own filename"""
+    first, second = RTMCParser(), RTMCParser()
+    for parser, filename in ((first, "a.rtmc"), (second, "b.rtmc"), (first, "c.rtmc")):
+        ast = parser.parse(SOURCE, filename)
+        assert [decl.line for decl in ast.declarations] == [1, 2, 3]
+        assert ast.declarations[2].filename == filename
+
+def test_primitive_type_nodes_are_shared():
+    """Primitive types resolve to one shared node; struct types keep their own line"""
+    ast = RTMCParser().parse("struct P { int x; };\nstruct P* a;\nstruct P* b;\nint c;\nint d;\nint* e;\nint* f;\n")
+    _, a, b, c, d, e, f = ast.declarations
+    assert c.type is d.type
+    assert e.type is f.type
+    assert a.type.base_type.struct_name == "P"
+    assert (a.type.base_type.line, b.type.base_type.line) == (2, 3)
+
+def _semantic_errors(source):
+    analyzer = SemanticAnalyzer()
+    try:
+        analyzer.analyze(RTMCParser().parse(source))
+    except SemanticError:
+        pass
+    return analyzer.errors
+
+def test_undefined_struct_reports_its_line():
+    """Undefined struct errors point at the line that names the struct"""
+    main = "\nvoid main() {\n}\n"
+    assert _semantic_errors("int a = 1;\n\nmessage<struct Missing> ch;\n" + main) == \
+        ["Line 3: Undefined struct 'Missing'"]
+    assert _semantic_errors("int a = 1;\n\nstruct Gone arr[3];\n" + main) == \
+        ["Line 3: Undefined struct 'Gone'"]
+
+def test_pointer_type_strings():
+    """Trailing stars in a type spelling become one pointer node of that level"""
+    parser = RTMCParser()
+    for spelling in ("int***", "int * * *"):
+        node = parser._create_type_node(spelling, 0)
+        assert node.pointer_level == 3
+        assert node.base_type is parser._create_type_node("int", 0)
+
+def test_anonymous_aggregates_get_distinct_names():
+    """Anonymous structs and unions parse and are numbered uniquely"""
+    ast = RTMCParser().parse("struct { int a; };\nstruct { int b; };\nunion { int c; float d; };\n"
+                             "struct struct_1 { int e; };\nunion union_1 { int f; };\n")
+    names = [decl.name for decl in ast.declarations]
+    assert len(names) == 5
+    assert len(set(names)) == 5
+    # Generated names can never be spelled by a user declaration
+    assert not any(name.isidentifier() for name in names[:3])
+    assert [field.name for field in ast.declarations[0].fields] == ["a"]
+    assert {field.union_group for field in ast.declarations[2].fields} == {names[2]}
+
+def test_anonymous_members_are_flattened():
+    """Anonymous struct and union members are inlined into the enclosing struct"""
+    ast = RTMCParser().parse("struct S { int a; union { int b; float c; }; struct { int d; int e; }; };\n")
+    fields = ast.declarations[0].fields
+    assert [field.name for field in fields] == ["a", "b", "c", "d", "e"]
+    assert fields[0].union_group is None
+    assert fields[1].union_group is not None
+    assert fields[1].union_group == fields[2].union_group
+    assert fields[3].union_group is None and fields[4].union_group is None
+
+if __name__ == "__main__":
+    test_parsers_share_tables()
+    test_reparse_restarts_positions()
+    test_primitive_type_nodes_are_shared()
+    test_undefined_struct_reports_its_line()
+    test_pointer_type_strings()
+    test_anonymous_aggregates_get_distinct_names()
+    test_anonymous_members_are_flattened()
+    print("✓ Parser reuse tests passed!")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for pointer member access code generation in RTMC compiler
+"""
+
+from compile_helpers import Opcode, compile_source
+
+POINT_SOURCE = """
+struct Point { int x; int y; int z; };
+struct Point gp;
+
+void main() {
+    struct Point* p = &gp;
+    int a = p->x;
+    int b = p->z;
+}
+"""
+
+def test_pointer_member_load_uses_fused_offset():
+    """ptr->field with a non-zero offset loads through LOAD_DEREF_OFFSET"""
+    program = compile_source(POINT_SOURCE)
+    opcodes = [instr.opcode for instr in program.instructions]
+
+    # p->x sits at offset 0 and keeps the plain dereference
+    assert Opcode.LOAD_DEREF in opcodes
+
+    fused = [instr for instr in program.instructions if instr.opcode == Opcode.LOAD_DEREF_OFFSET]
+    assert [instr.operands for instr in fused] == [[8]]
+
+    # No separate offset addition is emitted for the fused load
+    assert Opcode.ADD not in opcodes
+
+def test_pointer_member_store_uses_fused_offset():
+    """ptr->field = value stores through STORE_DEREF_OFFSET without a temporary"""
+    program = compile_source("""
+struct Point { int x; int y; int z; };
+struct Point gp;
+
+void main() {
+    struct Point* p = &gp;
+    p->x = 3;
+    p->z = 11;
+}
+""")
+    stores = [instr for instr in program.instructions if instr.opcode == Opcode.STORE_DEREF_OFFSET]
+    assert [instr.operands for instr in stores] == [[0], [8]]
+
+    # Only the pointer local itself is allocated in main's frame
+    opcodes = [instr.opcode for instr in program.instructions]
+    assert Opcode.STORE_DEREF not in opcodes
+    assert opcodes.count(Opcode.STORE_VAR) == 1
+
+def test_member_stores_do_not_grow_the_frame():
+    """Stores through pointers reuse the stack and allocate no temporaries"""
+    program = compile_source("""
+struct Point { int x; int y; int z; };
+struct Point gp;
+
+void main() {
+    struct Point* p = &gp;
+    p->x = 1;
+    p->y = 2;
+    p->z = 3;
+    (*p).x = 4;
+}
+""")
+    # Only the pointer local occupies main's frame
+    frees = [instr.operands for instr in program.instructions if instr.opcode == Opcode.FREE_FRAME]
+    assert frees == [[1]]
+
+def test_bit_field_member_access():
+    """Bit-fields load and store through their byte offset, bit offset and width"""
+    program = compile_source("""
+struct Flags { int mode; int ready : 1; int level : 3; };
+struct Flags gf;
+
+void main() {
+    gf.level = 5;
+    int a = gf.level;
+    int b = gf.mode;
+}
+""")
+    by_opcode = {instr.opcode: instr.operands for instr in program.instructions}
+
+    assert by_opcode[Opcode.STORE_STRUCT_MEMBER_BIT][1:] == [4, 1, 3]
+    assert by_opcode[Opcode.LOAD_STRUCT_MEMBER_BIT][1:] == [4, 1, 3]
+    assert by_opcode[Opcode.LOAD_STRUCT_MEMBER][1:] == [0]
+
+if __name__ == "__main__":
+    test_pointer_member_load_uses_fused_offset()
+    test_pointer_member_store_uses_fused_offset()
+    test_member_stores_do_not_grow_the_frame()
+    test_bit_field_member_access()
+    print("✓ Pointer member access tests passed!")
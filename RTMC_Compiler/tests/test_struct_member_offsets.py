@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for nested struct member offsets in RTMC code generation
+"""
+
+from compile_helpers import RTMCParser, BytecodeGenerator, Opcode, compile_source
+
+RECT_SOURCE = """
+struct Point { int x; int y; };
+struct Rect { struct Point tl; struct Point br; };
+struct Rect r;
+
+void main() {
+    r.br.y = 5;
+    int a = r.br.y;
+    int b = r.tl.x;
+}
+"""
+
+def test_nested_member_offsets_are_additive():
+    """a.b.c uses the sum of the field byte offsets along the path"""
+    program = compile_source(RECT_SOURCE)
+
+    stores = [instr.operands for instr in program.instructions if instr.opcode == Opcode.STORE_STRUCT_MEMBER]
+    loads = [instr.operands for instr in program.instructions if instr.opcode == Opcode.LOAD_STRUCT_MEMBER]
+
+    # r.br.y sits at offset(br) + offset(y) = 8 + 4
+    assert stores == [[0, 12]]
+    assert loads == [[0, 12], [0, 0]]
+
+def test_nested_paths_are_flattened_per_struct():
+    """Embedded struct fields are reachable by dotted path from the outer struct"""
+    generator = BytecodeGenerator()
+    generator.generate(RTMCParser().parse(RECT_SOURCE))
+
+    accessors = generator._field_accessors['Rect']
+    assert accessors['br'].offset == 8
+    assert accessors['br.y'].offset == 12
+    assert accessors['tl.x'].offset == 0
+
+def test_array_element_member_store_folds_offset():
+    """arr[i].field = value stores at the element address with the field offset folded in"""
+    program = compile_source("""
+struct Point { int x; int y; };
+
+void main() {
+    struct Point pts[3];
+    int i = 1;
+    pts[i].y = 5;
+}
+""")
+    opcodes = [instr.opcode for instr in program.instructions]
+
+    # base + i * sizeof(Point), then a single store at +offset(y)
+    tail = opcodes[opcodes.index(Opcode.MUL) - 3:opcodes.index(Opcode.MUL) + 3]
+    assert tail == [Opcode.LOAD_VAR, Opcode.LOAD_VAR, Opcode.LOAD_CONST,
+                    Opcode.MUL, Opcode.ADD, Opcode.STORE_DEREF_OFFSET]
+    store = program.instructions[opcodes.index(Opcode.STORE_DEREF_OFFSET)]
+    assert store.operands == [4]
+    assert Opcode.STORE_DEREF not in opcodes
+
+def test_deep_and_wide_member_offsets_do_not_collide():
+    """Fields past the tenth and three-level chains keep distinct byte offsets"""
+    program = compile_source("""
+struct Wide { int f0; int f1; int f2; int f3; int f4; int f5; int f6; int f7; int f8; int f9; int f10; };
+struct Mid { int tag; struct Wide w; };
+struct Outer { int id; struct Mid m; };
+struct Outer o;
+
+void main() {
+    int a = o.m.w.f10;
+    int b = o.m.w.f1;
+    int c = o.m.tag;
+}
+""")
+    loads = [instr.operands for instr in program.instructions if instr.opcode == Opcode.LOAD_STRUCT_MEMBER]
+
+    # 4 (m) + 4 (w) + 40 (f10), 4 + 4 + 4 (f1), 4 (m) + 0 (tag)
+    assert loads == [[0, 48], [0, 12], [0, 4]]
+
+def test_layout_records_offsets_on_declaration():
+    """Layout stores field offsets on the struct declaration for offset_of"""
+    ast = RTMCParser().parse(RECT_SOURCE)
+    BytecodeGenerator().generate(ast)
+    rect = [decl for decl in ast.declarations if getattr(decl, 'name', None) == 'Rect'][0]
+
+    assert rect.offset_of('tl') == 0
+    assert rect.offset_of('br') == 8
+    assert rect.field_offsets == {'tl': 0, 'br': 8}
+
+if __name__ == "__main__":
+    test_nested_member_offsets_are_additive()
+    test_nested_paths_are_flattened_per_struct()
+    test_array_element_member_store_folds_offset()
+    test_deep_and_wide_member_offsets_do_not_collide()
+    test_layout_records_offsets_on_declaration()
+    print("✓ Struct member offset tests passed!")
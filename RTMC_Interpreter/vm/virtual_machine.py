@@ -312,6 +312,8 @@ class TaskVMContext:
             Opcode.LOAD_ADDR: self._handle_load_addr,
             Opcode.LOAD_DEREF: self._handle_load_deref,
             Opcode.STORE_DEREF: self._handle_store_deref,
+            Opcode.LOAD_DEREF_OFFSET: self._handle_load_deref_offset,
+            Opcode.STORE_DEREF_OFFSET: self._handle_store_deref_offset,
             
             Opcode.ADD: self._handle_add,
             Opcode.SUB: self._handle_sub,
@@ -322,6 +324,8 @@ class TaskVMContext:
             Opcode.OR: self._handle_or,
             Opcode.NOT: self._handle_not,
             Opcode.XOR: self._handle_xor,
+            Opcode.SHL: self._handle_shl,
+            Opcode.SHR: self._handle_shr,
             
             Opcode.EQ: self._handle_eq,
             Opcode.NEQ: self._handle_neq,
@@ -340,6 +344,10 @@ class TaskVMContext:
             Opcode.ALLOC_ARRAY: self._handle_alloc_array,
             Opcode.LOAD_ARRAY_ELEM: self._handle_load_array_elem,
             Opcode.STORE_ARRAY_ELEM: self._handle_store_array_elem,
+            Opcode.INIT_ARRAY_CONST: self._handle_init_array_const,
+            Opcode.STORE_ARRAY_ELEM_I: self._handle_store_array_elem_i,
+            Opcode.LOAD_BLOB: self._handle_load_blob,
+            Opcode.BUILD_ARRAY: self._handle_build_array,
             
             # RTOS instructions
             Opcode.RTOS_CREATE_TASK: self._handle_rtos_create_task,
@@ -601,24 +609,23 @@ class TaskVMContext:
     
     def _handle_load_var(self, instruction: Instruction):
         """Handle LOAD_VAR instruction"""
-        address = instruction.operands[0]
-        
+        self._push(self._load_variable(instruction.operands[0]))
+    
+    def _load_variable(self, address: int) -> Any:
+        """Read a variable slot, resolving parameters and call-depth locals"""
         # Check if this is a parameter load (addresses 0-9 are typically parameters)
         # and we're in a function call context
         if hasattr(self, 'saved_params') and self.saved_params and address < 10:
             param_base = 10000
             param_addr = param_base + address
             if param_addr in self.task_context_shared.memory:
-                value = self.task_context_shared.memory[param_addr]
-                self._push(value)
-                return
+                return self.task_context_shared.memory[param_addr]
         
         # Map to runtime address considering call depth
         runtime_address = self._map_variable_address(address)
         
         # Normal variable load
-        value = self.task_context_shared.memory.get(runtime_address, 0)
-        self._push(value)
+        return self.task_context_shared.memory.get(runtime_address, 0)
     
     def _handle_store_var(self, instruction: Instruction):
         """Handle STORE_VAR instruction"""
@@ -743,6 +750,21 @@ class TaskVMContext:
         a = self._pop()
         self._push(a ^ b)
     
+    def _handle_shl(self, instruction: Instruction):
+        """Handle SHL instruction"""
+        b = self._pop()
+        a = self._pop()
+        # Assignments do not convert values, so an int variable may hold a
+        # float; shift it the way MUL by a power of two would
+        self._push(a << b if type(a) is int else a * (1 << b))
+    
+    def _handle_shr(self, instruction: Instruction):
+        """Handle SHR instruction"""
+        b = self._pop()
+        a = self._pop()
+        # Non-int operands floor like DIV by a power of two does
+        self._push(a >> b if type(a) is int else a // (1 << b))
+    
     def _handle_eq(self, instruction: Instruction):
         """Handle EQ instruction"""
         b = self._pop()
@@ -840,11 +862,15 @@ class TaskVMContext:
         """Handle ALLOC_ARRAY instruction"""
         element_size = instruction.operands[0]
         count = instruction.operands[1]
+        self._push(self._allocate_array(element_size, count))
+    
+    def _allocate_array(self, element_size: int, count: int) -> int:
+        """Reserve zeroed memory for an array and return its base address"""
         total_size = element_size * count
         address = len(self.task_context_shared.memory)
         for i in range(total_size):
             self.task_context_shared.memory[address + i] = 0
-        self._push(address)
+        return address
     
     def _handle_load_array_elem(self, instruction: Instruction):
         """Handle LOAD_ARRAY_ELEM instruction"""
@@ -884,7 +910,43 @@ class TaskVMContext:
         index = self._pop()
         base_addr = self._pop()
         element_size = instruction.operands[0] if len(instruction.operands) > 0 else 4
-        
+        self._store_array_element(base_addr, index, value, element_size)
+    
+    def _handle_init_array_const(self, instruction: Instruction):
+        """Handle INIT_ARRAY_CONST instruction - fills array elements from a constant run"""
+        base_addr = self._pop()
+        first_const, count, element_size = instruction.operands
+        constants = self.task_context_shared.program.constants
+        for index in range(count):
+            self._store_array_element(base_addr, index, constants[first_const + index], element_size)
+    
+    def _handle_store_array_elem_i(self, instruction: Instruction):
+        """Handle STORE_ARRAY_ELEM_I instruction - array variable and index are immediates"""
+        value = self._pop()
+        array_address, index, element_size = instruction.operands
+        self._store_array_element(self._load_variable(array_address), index, value, element_size)
+    
+    def _handle_load_blob(self, instruction: Instruction):
+        """Handle LOAD_BLOB instruction - pushes a new array filled from a constant run"""
+        first_const, count, element_size = instruction.operands
+        constants = self.task_context_shared.program.constants
+        base_addr = self._allocate_array(element_size, count)
+        for index in range(count):
+            self._store_array_element(base_addr, index, constants[first_const + index], element_size)
+        self._push(base_addr)
+    
+    def _handle_build_array(self, instruction: Instruction):
+        """Handle BUILD_ARRAY instruction - pushes a new array filled from stack values"""
+        count, element_size = instruction.operands
+        values = [self._pop() for _ in range(count)]
+        values.reverse()
+        base_addr = self._allocate_array(element_size, count)
+        for index, value in enumerate(values):
+            self._store_array_element(base_addr, index, value, element_size)
+        self._push(base_addr)
+    
+    def _store_array_element(self, base_addr: int, index: int, value: Any, element_size: int):
+        """Store one array element, packing sub-word elements into 32-bit blocks"""
         # Calculate element address considering 32-bit memory blocks
         # If element_size is less than 4 bytes, multiple elements can fit in one 32-bit block
         if element_size < 4:
@@ -1106,17 +1168,22 @@ class TaskVMContext:
     
     def _handle_msg_recv(self, instruction: Instruction):
         """Handle MSG_RECV instruction with timeout support"""
-        message_id = instruction.operands[0]
-        
-        # Pop timeout value from stack (999999 means blocking, 0 means non-blocking, >0 means timeout in ms)
-        timeout_ms = self._pop()
+        operands = instruction.operands
+        message_id = operands[0]
         
-        if message_id in self.task_context_shared.message_queues:
-            msg_queue = self.task_context_shared.message_queues[message_id]
+        # The has-timeout flag selects between popping a timeout in ms and
+        # blocking forever; single-operand bytecode always carries a timeout
+        if len(operands) < 2 or operands[1]:
+            timeout_ms = self._pop()
             if timeout_ms > 9999:
                 msg_wait_end_time = time.time() + timeout_ms
             else:
                 msg_wait_end_time = time.time() + (timeout_ms / 1000.0)
+        else:
+            msg_wait_end_time = float('inf')
+        
+        if message_id in self.task_context_shared.message_queues:
+            msg_queue = self.task_context_shared.message_queues[message_id]
 
             # Wait for message
             while(1):
@@ -1347,6 +1414,24 @@ class TaskVMContext:
         if pointer_value is None:
             raise VMError("Cannot dereference null pointer")
         self.task_context_shared.memory[pointer_value] = value
+    
+    def _handle_load_deref_offset(self, instruction: Instruction):
+        """Handle LOAD_DEREF_OFFSET instruction - dereferences pointer on stack plus offset"""
+        pointer_value = self._pop()
+        if pointer_value is None:
+            raise VMError("Cannot dereference null pointer")
+        address = pointer_value + instruction.operands[0]
+        if address not in self.task_context_shared.memory:
+            raise VMError(f"Dereferencing null or invalid pointer: {address}")
+        self._push(self.task_context_shared.memory[address])
+    
+    def _handle_store_deref_offset(self, instruction: Instruction):
+        """Handle STORE_DEREF_OFFSET instruction - stores value beneath the pointer at pointer plus offset"""
+        pointer_value = self._pop()  # Address to store at
+        value = self._pop()  # Value to store
+        if pointer_value is None:
+            raise VMError("Cannot dereference null pointer")
+        self.task_context_shared.memory[pointer_value + instruction.operands[0]] = value
 
     def _trace_instruction(self, instruction: Instruction):
         """Trace instruction execution"""
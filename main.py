@@ -4,8 +4,10 @@ RT-Micro-C Compiler Main Entry Point
 Compiles RT-Micro-C source code to bytecode for the RT-Micro-C virtual machine.
 """
 
+import gc
 import sys
 import argparse
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Set, Dict
 
@@ -19,6 +21,24 @@ from RTMC_Compiler.src.preprocessor.preprocessor import RTMCPreprocessor
 
 imported_filepaths = set()
 
+@contextmanager
+def paused_gc():
+    """Disable the cyclic garbage collector for the duration of the block.
+    
+    Objects alive on entry (the imported compiler modules) are moved to the
+    permanent generation so the single collection on exit skips them.
+    """
+    was_enabled = gc.isenabled()
+    gc.freeze()
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.collect()
+        gc.unfreeze()
+        if was_enabled:
+            gc.enable()
+
 def parse_with_imports(file_path: Path, imported_files: Set[Path] = None) -> ProgramNode:
     """Parse a file and recursively parse any imported files"""
     if imported_files is None:
@@ -102,68 +122,71 @@ def main():
         output_file = input_path.with_suffix('.vmb')
     
     try:
-        # Compilation pipeline with import support
-        if args.verbose:
-            print("Stage 1: Lexical Analysis and Parsing (with imports)...")
-        
-        # Parse with recursive import handling
-        ast = parse_with_imports(input_path)
-        
-        # Extract tokens for debugging if requested
-        if args.tokens:
-            print("=== TOKENS (main file only) ===")
-            with open(input_path, 'r') as f:
-                source_code = f.read()
-            # Use PLY lexer for token display
-            from RTMC_Compiler.src.lexer.ply_lexer import RTMCLexer
-            lexer = RTMCLexer()
-            tokens = lexer.tokenize(source_code, str(input_path))
-            for token in tokens:
-                print(f"{token.type}: '{token.value}' at {token.filename}:{token.lineno}")
-            print()
-        
-        if args.ast:
-            print("=== AST ===")
-            print(ast)
-            print()
-        
-        if not args.no_semantic:
+        # Compilation allocates tens of thousands of AST nodes that all live
+        # until the end; collect once afterwards instead of repeatedly during it
+        with paused_gc():
+            # Compilation pipeline with import support
             if args.verbose:
-                print("Stage 3: Semantic Analysis...")
+                print("Stage 1: Lexical Analysis and Parsing (with imports)...")
+            
+            # Parse with recursive import handling
+            ast = parse_with_imports(input_path)
+            
+            # Extract tokens for debugging if requested
+            if args.tokens:
+                print("=== TOKENS (main file only) ===")
+                with open(input_path, 'r') as f:
+                    source_code = f.read()
+                # Use PLY lexer for token display
+                from RTMC_Compiler.src.lexer.ply_lexer import RTMCLexer
+                lexer = RTMCLexer()
+                tokens = lexer.tokenize(source_code, str(input_path))
+                for token in tokens:
+                    print(f"{token.type}: '{token.value}' at {token.filename}:{token.lineno}")
+                print()
+            
+            if args.ast:
+                print("=== AST ===")
+                print(ast.full_repr())
+                print()
+            
+            if not args.no_semantic:
+                if args.verbose:
+                    print("Stage 3: Semantic Analysis...")
+                
+                semantic_analyzer = SemanticAnalyzer()
+                semantic_analyzer.analyze(ast)
+            elif args.verbose:
+                print("Stage 3: Semantic Analysis... SKIPPED")
+            
+            if not args.no_optimize:
+                if args.verbose:
+                    print("Stage 4: Optimization...")
+                
+                optimizer = Optimizer()
+                ast = optimizer.optimize(ast)
             
-            semantic_analyzer = SemanticAnalyzer()
-            semantic_analyzer.analyze(ast)
-        elif args.verbose:
-            print("Stage 3: Semantic Analysis... SKIPPED")
-        
-        if not args.no_optimize:
             if args.verbose:
-                print("Stage 4: Optimization...")
+                print("Stage 5: Bytecode Generation...")
             
-            optimizer = Optimizer()
-            ast = optimizer.optimize(ast)
-        
-        if args.verbose:
-            print("Stage 5: Bytecode Generation...")
-        
-        bytecode_generator = BytecodeGenerator(compile_mode)
-        bytecode_program = bytecode_generator.generate(ast)
-        
-        if args.verbose:
-            print(f"Generated {len(bytecode_program.instructions)} instructions")
-            print(f"Compilation mode: {compile_mode.name}")
-            if compile_mode == CompileMode.DEBUG:
-                print(f"Debug info: {len(bytecode_program.debug_info)} entries")
-        
-        if args.verbose:
-            print("Stage 6: Writing Output...")
-        
-        writer = BytecodeWriter()
-        writer.write(bytecode_program, output_file)
-        
-        if args.verbose:
-            print(f"Compilation successful! Output: {output_file}")
-            print(f"Mode: {compile_mode.name}")
+            bytecode_generator = BytecodeGenerator(compile_mode)
+            bytecode_program = bytecode_generator.generate(ast)
+            
+            if args.verbose:
+                print(f"Generated {len(bytecode_program.instructions)} instructions")
+                print(f"Compilation mode: {compile_mode.name}")
+                if compile_mode == CompileMode.DEBUG:
+                    print(f"Debug info: {len(bytecode_program.debug_info)} entries")
+            
+            if args.verbose:
+                print("Stage 6: Writing Output...")
+            
+            writer = BytecodeWriter()
+            writer.write(bytecode_program, output_file)
+            
+            if args.verbose:
+                print(f"Compilation successful! Output: {output_file}")
+                print(f"Mode: {compile_mode.name}")
 
         if args.run:
             from RTMC_Interpreter.vm.virtual_machine import VirtualMachine